@@ -1,60 +1,30 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from groq import Groq
+from registry import DOMAINS
 
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL = "llama-3.3-70b-versatile"
 CHUNK_SIZE = 6  # articles per LLM chunk
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))  # chunk calls in flight, all domains together
 
-# ── Agent prompts (strict, domain-specific) ──────────────────────────────────
+# shared by every domain agent, so the bound holds across the whole pipeline
+_summary_pool = ThreadPoolExecutor(max_workers=SUMMARY_CONCURRENCY, thread_name_prefix="summarize")
 
-AGENT_PROMPTS = {
-    "tech": """You are a Tech News Analyst specializing in AI, startups, software, and big tech.
+# ── Agent prompts (strict, domain-specific; domains.yaml) ────────────────────
 
-Your tasks:
-1. Filter: Only process technology-related articles. Ignore anything unrelated.
-2. Summarize: Extract key insights, trends, and impact signals (e.g. "AI regulation increasing").
-3. Deduplicate: If multiple articles cover the same story, merge into one bullet.
-4. Output: Return ONLY 3–5 bullet points starting with "-". No headers, no extra text.
-
-Focus on: AI breakthroughs, startup funding, product launches, big tech moves, software updates.""",
-
-    "finance": """You are a Finance News Analyst specializing in markets, stocks, crypto, and macroeconomics.
-
-Your tasks:
-1. Filter: Only process finance/economy-related articles. Ignore unrelated content.
-2. Summarize: Capture market movements, key financial events, earnings reports.
-3. Detect signals: Flag inflation indicators, interest rate changes, recession signals.
-4. Deduplicate: Merge duplicate stories into one bullet.
-5. Output: Return ONLY 3–5 bullet points starting with "-". No headers, no extra text.
-
-Focus on: Stock market moves, crypto prices, central bank decisions, major earnings, economic data.""",
-
-    "sports": """You are a Sports News Analyst covering matches, players, and tournaments.
-
-Your tasks:
-1. Filter: Only process sports-related articles. Ignore unrelated content.
-2. Summarize: Extract match results, scores, player highlights, and upcoming fixtures.
-3. Deduplicate: Merge duplicate stories into one bullet.
-4. Output: Return ONLY 3–5 bullet points starting with "-". No headers, no extra text.
-
-Focus on: Match results with scores, standout player performances, tournament standings, upcoming fixtures.""",
-}
+AGENT_PROMPTS = {key: d["prompt"] for key, d in DOMAINS.items()}
 
 
 # ── Module 1: Filter ──────────────────────────────────────────────────────────
 
-DOMAIN_KEYWORDS = {
-    "tech":    ["tech", "ai", "software", "startup", "app", "cyber", "robot", "chip", "google", "apple", "microsoft", "meta", "openai", "data", "cloud", "code", "digital", "algorithm", "machine learning", "neural"],
-    "finance": ["market", "stock", "crypto", "bitcoin", "economy", "inflation", "rate", "bank", "invest", "fund", "gdp", "trade", "finance", "earnings", "revenue", "nasdaq", "dow", "s&p", "fed", "currency", "bond"],
-    "sports":  ["sport", "game", "match", "player", "team", "score", "league", "tournament", "championship", "goal", "win", "loss", "coach", "athlete", "nfl", "nba", "fifa", "tennis", "cricket", "football", "basketball"],
-}
-
 def _filter(articles: list[dict], domain: str) -> list[dict]:
-    keywords = DOMAIN_KEYWORDS[domain]
+    matcher = DOMAINS[domain]["matcher"]
     filtered = []
     for a in articles:
         text = (a["title"] + " " + a["content"]).lower()
-        if any(kw in text for kw in keywords):
+        if matcher.search(text):
             filtered.append(a)
     # fallback: if nothing passes filter, use all (category_hint already correct)
     return filtered if filtered else articles
@@ -83,6 +53,12 @@ def _summarize_chunk(chunk: list[dict], domain: str) -> str:
     return resp.choices[0].message.content.strip()
 
 
+def _timed_summary(chunk: list[dict], domain: str) -> tuple[str, float]:
+    started = time.perf_counter()
+    summary = _summarize_chunk(chunk, domain)
+    return summary, time.perf_counter() - started
+
+
 # ── Module 4: Deduplicator ────────────────────────────────────────────────────
 
 def _deduplicate(bullets: list[str]) -> list[str]:
@@ -97,13 +73,16 @@ def _deduplicate(bullets: list[str]) -> list[str]:
 
 # ── Module 5: Structured output builder ──────────────────────────────────────
 
-def _build_output(domain: str, bullets: list[str]) -> dict:
-    return {
+def _build_output(domain: str, bullets: list[str], stats: dict | None = None) -> dict:
+    output = {
         "domain":   domain,
         "bullets":  bullets,
         "summary":  "\n".join(f"- {b}" for b in bullets),
         "count":    len(bullets),
     }
+    if stats is not None:
+        output["stats"] = stats
+    return output
 
 
 # ── Main agent runner ─────────────────────────────────────────────────────────
@@ -118,8 +97,15 @@ def run_agent(domain: str, articles: list[dict]) -> dict:
     # 2. Chunk
     chunks = _chunk(filtered)
 
-    # 3. Summarize each chunk
-    raw_summaries = [_summarize_chunk(chunk, domain) for chunk in chunks]
+    # 3. Summarize chunks concurrently (map keeps chunk order)
+    started = time.perf_counter()
+    timed   = list(_summary_pool.map(lambda chunk: _timed_summary(chunk, domain), chunks))
+    raw_summaries = [summary for summary, _ in timed]
+    stats = {
+        "chunks":       len(chunks),
+        "llm_seconds":  round(sum(seconds for _, seconds in timed), 2),  # serial cost
+        "wall_seconds": round(time.perf_counter() - started, 2),
+    }
 
     # 4. Extract bullets from all chunk summaries
     all_bullets = []
@@ -145,4 +131,4 @@ def run_agent(domain: str, articles: list[dict]) -> dict:
     bullets = _deduplicate(all_bullets)[:5]
 
     # 5. Structured output
-    return _build_output(domain, bullets)
+    return _build_output(domain, bullets, stats)
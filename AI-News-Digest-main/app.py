@@ -2,15 +2,49 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import re
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from orchestrator import run_pipeline
-from summary_agent import build_digest
+from summary_agent import build_digest, TOP_HEADLINES, DOMAIN_LABELS
 from ingestion import fetch_articles
+from scheduler import DigestScheduler
+from registry import DOMAINS
 
-app = FastAPI()
+
+def _build_digest_payload() -> tuple[dict, dict]:
+    timings, savings = {}, {}
+    outputs = run_pipeline(timings, savings)
+    started = time.perf_counter()
+    digest  = build_digest(outputs)
+    timings["editor_seconds"] = round(time.perf_counter() - started, 2)
+    payload = {
+        "sections": _parse_digest(digest),
+        "raw":      digest,
+        "agents":   [
+            {"domain": o["domain"], "count": o["count"], "bullets": o["bullets"]}
+            for o in outputs
+        ],
+        "savings":  savings,
+    }
+    return payload, timings
+
+
+scheduler = DigestScheduler(_build_digest_payload)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # first digest is built at start-up, then every DIGEST_REFRESH_SECONDS
+    scheduler.start()
+    yield
+    scheduler.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,27 +62,21 @@ def index():
 
 
 @app.get("/api/digest")
-def get_digest():
+def get_digest(refresh: bool = False):
+    # refresh=true waits for a rebuild (joining one already running);
+    # otherwise the last good digest is returned immediately
     try:
-        outputs = run_pipeline()
-        digest  = build_digest(outputs)
-        return {
-            "status":   "ok",
-            "sections": _parse_digest(digest),
-            "raw":      digest,
-            "agents":   [
-                {"domain": o["domain"], "count": o["count"], "bullets": o["bullets"]}
-                for o in outputs
-            ],
-        }
+        if refresh:
+            scheduler.refresh(wait=True)
+        return {"status": "ok", **scheduler.get()}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
 
 @app.get("/api/articles/{domain}")
 def get_articles(domain: str):
-    if domain not in ("tech", "finance", "sports"):
-        return {"status": "error", "message": "Invalid domain. Use: tech, finance, sports"}
+    if domain not in DOMAINS:
+        return {"status": "error", "message": "Invalid domain. Use: " + ", ".join(DOMAINS)}
     try:
         articles = fetch_articles(domain)
         return {"status": "ok", "domain": domain, "count": len(articles), "articles": articles}
@@ -56,9 +84,15 @@ def get_articles(domain: str):
         return {"status": "error", "message": str(e)}
 
 
+# longest first so "📰 World" cannot match inside "📰 World Business"
+SECTION_PATTERN = re.compile(
+    "(" + "|".join(re.escape(h) for h in sorted([TOP_HEADLINES, *DOMAIN_LABELS.values()], key=len, reverse=True)) + ")"
+)
+
+
 def _parse_digest(text: str) -> dict:
     result  = {}
-    pattern = re.split(r"(🔥 Top Headlines|🧠 Tech|💰 Finance|⚽ Sports)", text)
+    pattern = SECTION_PATTERN.split(text)
     for i in range(1, len(pattern), 2):
         key     = pattern[i].strip()
         content = pattern[i + 1].strip() if i + 1 < len(pattern) else ""
@@ -0,0 +1,195 @@
+import os
+import re
+import sys
+import json
+import random
+import hashlib
+
+# Near-duplicate story detection (MinHash + LSH), run across all domains
+# before chunking so each real story is sent to the LLM once.
+
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.35"))  # Jaccard of normalized words to merge
+NUM_PERM        = 128
+BANDS           = 64                                            # 64 bands x 2 rows: J=0.35 pairs collide 99.9% of the time
+CHARS_PER_TOKEN = 4
+FIXTURE_FILE    = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "dedup_cases.json")
+
+_MASK   = (1 << 64) - 1
+_SEEDS  = [random.Random(i).getrandbits(64) for i in range(NUM_PERM)]
+_WORD   = re.compile(r"[a-z0-9]+")
+_STOP   = frozenset(
+    "a an and are as at be but by for from has have had in into is it its of on or "
+    "over says said than that the their this to was were will with".split()
+)
+_TOKEN  = re.compile(r"[A-Za-z0-9]+")
+_NEGATE = frozenset("no not without".split())
+_UP     = frozenset("rise rises rose up gain gains jump jumps surge surges soar soars climb climbs higher".split())
+_DOWN   = frozenset("fall falls fell down drop drops slide slides slump slumps plunge plunges sink sinks lower".split())
+
+
+def _hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+
+
+def _mix(x: int) -> int:
+    # splitmix64 finalizer: seed-xor + mix gives independent-looking permutations
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def _stem(word: str) -> str:
+    # crude suffix strip: "launches"/"launched"/"launching" -> "launch"
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def _words(text: str) -> set[str]:
+    return {_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOP}
+
+
+def _shingles(article: dict) -> set[int]:
+    # Normalized unigrams, not bigrams: outlets paraphrase the same story
+    # ("unveils ... with new AI features" / "launches ... featuring AI tools"),
+    # so word order rarely survives. Title words are added a second time,
+    # tagged, because the headline says more about the story than the teaser.
+    title = _words(article["title"])
+    words = title | _words(article["content"])
+    return {_hash(w) for w in words} | {_hash(f"title:{w}") for w in title} or {_hash("")}
+
+
+def _names(article: dict) -> set[str]:
+    # Names in the headline: "iPhone", "AI", "17", and capitalized words that
+    # are not just the first word of a sentence-case title (or that the teaser
+    # capitalizes too, which also covers Title Case headlines).
+    title   = _TOKEN.findall(article["title"])
+    content = {w.lower() for w in _TOKEN.findall(article["content"]) if w[0].isupper()}
+    long    = [w for w in title if len(w) > 3]
+    titled  = len(long) > 1 and sum(w[0].isupper() for w in long) > 0.7 * len(long)
+    names   = set()
+    for n, w in enumerate(title):
+        low = w.lower()
+        if low in _STOP:
+            continue
+        if w.isdigit() or any(c.isupper() for c in w[1:]) or (
+            w[0].isupper() and (low in content or (n and not titled))
+        ):
+            names.add(low)
+    return names
+
+
+def _guard(article: dict) -> tuple[set[str], set[str], frozenset]:
+    """(headline names, every word of the article, headline direction/negation)"""
+    words = {w.lower() for w in _TOKEN.findall(f"{article['title']} {article['content']}")}
+    title = {w.lower() for w in _TOKEN.findall(article["title"])}
+    stance = frozenset(
+        ({"up"} if title & _UP else set()) | ({"down"} if title & _DOWN else set())
+        | ({"not"} if title & _NEGATE else set())
+    )
+    return _names(article), words, stance
+
+
+def _same_story(x: tuple, y: tuple) -> bool:
+    # Short teasers on one template ("Man Utd / Spurs sack manager after
+    # defeat", "Stocks rise / fall as Fed signals (no) rate cut") share most
+    # of their words, so word overlap alone merges different stories. Every
+    # headline name must appear in the other article, and the headlines must
+    # not point in opposite directions or negate one another.
+    return x[0] <= y[1] and y[0] <= x[1] and x[2] == y[2]
+
+
+def _signature(shingles: set[int]) -> tuple[int, ...]:
+    return tuple(min(_mix(s ^ seed) for s in shingles) for seed in _SEEDS)
+
+
+def _jaccard(x: set[int], y: set[int]) -> float:
+    return len(x & y) / len(x | y)
+
+
+def cluster(articles: list[dict], threshold: float = DEDUP_THRESHOLD) -> list[list[int]]:
+    """Groups of indexes into `articles` that report the same story."""
+    shingles = [_shingles(a) for a in articles]
+    guards   = [_guard(a) for a in articles]
+    sigs     = [_signature(s) for s in shingles]
+    parent   = list(range(len(articles)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # LSH: only articles sharing a whole band are compared (exact Jaccard + headline guard)
+    rows    = NUM_PERM // BANDS
+    buckets = {}
+    for i, sig in enumerate(sigs):
+        for band in range(BANDS):
+            key = (band, sig[band * rows:(band + 1) * rows])
+            for j in buckets.setdefault(key, []):
+                if (find(i) != find(j) and _jaccard(shingles[i], shingles[j]) >= threshold
+                        and _same_story(guards[i], guards[j])):
+                    parent[find(i)] = find(j)
+            buckets[key].append(i)
+
+    groups = {}
+    for i in range(len(articles)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _tokens(article: dict) -> int:
+    return len(f"- [{article['source']}] {article['title']}: {article['content']}") // CHARS_PER_TOKEN
+
+
+def dedupe_across_domains(articles_by_domain: dict[str, list[dict]]) -> tuple[dict[str, list[dict]], dict]:
+    """Keep one article per story across all domains.
+
+    The article with the most content represents the story in its own domain
+    and lists the other outlets under "also_reported_by". Returns
+    (articles per domain, stats).
+    """
+    flat = [a for articles in articles_by_domain.values() for a in articles]
+    keep = set()
+    for group in cluster(flat):
+        best = max(group, key=lambda i: len(flat[i]["content"]))
+        keep.add(best)
+        others = sorted({flat[i]["source"] for i in group if i != best} - {flat[best]["source"]})
+        if others:
+            flat[best] = {**flat[best], "also_reported_by": others}
+
+    result, i = {}, 0
+    for domain, articles in articles_by_domain.items():
+        result[domain] = [flat[i + n] for n in range(len(articles)) if i + n in keep]
+        i += len(articles)
+
+    removed = [flat[n] for n in range(len(flat)) if n not in keep]
+    return result, {
+        "articles_in":        len(flat),
+        "articles_out":       len(keep),
+        "duplicates_removed": len(removed),
+        "input_tokens_saved": sum(_tokens(a) for a in removed),
+    }
+
+
+def _check_fixture(path: str = FIXTURE_FILE) -> bool:
+    """Cluster the labelled fixture and compare with its expected groups."""
+    with open(path, encoding="utf-8") as f:
+        cases = json.load(f)
+    articles = cases["articles"]
+    found    = {
+        frozenset(articles[i]["id"] for i in group)
+        for group in cluster(articles) if len(group) > 1
+    }
+    expected = {frozenset(group) for group in cases["expected_groups"]}
+    for group in sorted(found | expected, key=sorted):
+        status = "ok" if group in found and group in expected else "MISSED" if group in expected else "WRONG MERGE"
+        print(f"{status:12} {', '.join(sorted(group))}")
+    for group in cases.get("known_misses", []):
+        print(f"{'known miss':12} {', '.join(sorted(group))}")
+    return found == expected
+
+
+if __name__ == "__main__":
+    sys.exit(0 if _check_fixture() else 1)
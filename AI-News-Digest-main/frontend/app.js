@@ -36,11 +36,13 @@ function renderSkeletons() {
   `).join("");
 }
 
-function renderDigest(sections) {
+function renderDigest(data) {
+  const sections = data.sections;
   const grid = document.getElementById("digest-grid");
   grid.innerHTML = "";
 
-  const order = ["🔥 Top Headlines", "🧠 Tech", "💰 Finance", "⚽ Sports"];
+  // Top Headlines first, then the domain sections in the order the digest lists them
+  const order = ["🔥 Top Headlines", ...Object.keys(sections).filter(k => k !== "🔥 Top Headlines")];
 
   order.forEach(key => {
     const bullets = sections[key];
@@ -62,8 +64,11 @@ function renderDigest(sections) {
     grid.appendChild(card);
   });
 
-  document.getElementById("last-updated").textContent =
-    "Last updated: " + new Date().toLocaleTimeString();
+  const built = data.generated_at ? new Date(data.generated_at) : new Date();
+  let note = "Last updated: " + built.toLocaleTimeString();
+  if (data.timings) note += ` · built in ${data.timings.total_seconds}s`;
+  if (data.refreshing) note += " · refreshing in background";
+  document.getElementById("last-updated").textContent = note;
 }
 
 async function loadDigest() {
@@ -81,7 +86,7 @@ async function loadDigest() {
       return;
     }
 
-    renderDigest(data.sections);
+    renderDigest(data);
   } catch (e) {
     showError("Could not reach the server. Make sure the backend is running.");
     document.getElementById("digest-grid").innerHTML = "";
@@ -1,38 +1,65 @@
 import os
-import requests
+import time
+import asyncio
+import threading
+import httpx
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
+from registry import DOMAINS
 
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
 NEWS_API_URL = "https://newsapi.org/v2/top-headlines"
 
-# RSS feed sources per domain (BBC, Reuters)
-RSS_FEEDS = {
-    "tech": [
-        "http://feeds.bbci.co.uk/news/technology/rss.xml",
-        "https://feeds.reuters.com/reuters/technologyNews",
-    ],
-    "finance": [
-        "http://feeds.bbci.co.uk/news/business/rss.xml",
-        "https://feeds.reuters.com/reuters/businessNews",
-    ],
-    "sports": [
-        "http://feeds.bbci.co.uk/sport/rss.xml",
-        "https://feeds.reuters.com/reuters/sportsNews",
-    ],
-}
-
-NEWSAPI_CATEGORIES = {
-    "tech":    "technology",
-    "finance": "business",
-    "sports":  "sports",
-}
+FEED_TTL_SECONDS     = float(os.getenv("FEED_TTL_SECONDS", "300"))   # serve parsed feeds without a request
+FEED_TIMEOUT_SECONDS = float(os.getenv("FEED_TIMEOUT_SECONDS", "10"))
+FEED_MAX_CONNECTIONS = int(os.getenv("FEED_MAX_CONNECTIONS", "20"))
+USER_AGENT           = "Mozilla/5.0"
+
+# RSS feed sources and NewsAPI categories per domain (domains.yaml)
+RSS_FEEDS          = {key: d["feeds"] for key, d in DOMAINS.items()}
+NEWSAPI_CATEGORIES = {key: d["newsapi_category"] for key, d in DOMAINS.items()}
+
+
+# Parsed articles per feed URL (and per NewsAPI query), with the validators
+# needed to revalidate them: {key: {"articles", "etag", "last_modified", "fetched_at"}}
+_feed_cache: dict[str, dict] = {}
+_cache_lock = threading.Lock()
 
 
 def fetch_articles(domain: str, page_size: int = 8) -> list[dict]:
-    articles = []
-    articles.extend(_fetch_rss(domain))
-    articles.extend(_fetch_newsapi(domain, page_size))
+    return fetch_all([domain], page_size)[domain]
+
+
+def fetch_all(domains: list[str], page_size: int = 8) -> dict[str, list[dict]]:
+    """Fetch every feed of every domain concurrently; {domain: deduplicated articles}."""
+    return asyncio.run(_fetch_all(domains, page_size))
+
+
+async def _fetch_all(domains: list[str], page_size: int) -> dict[str, list[dict]]:
+    limits = httpx.Limits(max_connections=FEED_MAX_CONNECTIONS)
+    async with httpx.AsyncClient(
+        timeout=FEED_TIMEOUT_SECONDS,
+        limits=limits,
+        follow_redirects=True,
+        headers={"User-Agent": USER_AGENT},
+    ) as client:
+        jobs = [
+            (domain, _fetch_rss(client, url, domain))
+            for domain in domains
+            for url in RSS_FEEDS[domain]
+        ] + [
+            (domain, _fetch_newsapi(client, domain, page_size))
+            for domain in domains
+        ]
+        results = await asyncio.gather(*(job for _, job in jobs))
+
+    articles = {domain: [] for domain in domains}
+    for (domain, _), found in zip(jobs, results):
+        articles[domain].extend(found)
+    return {domain: _dedupe_titles(found) for domain, found in articles.items()}
+
+
+def _dedupe_titles(articles: list[dict]) -> list[dict]:
     # deduplicate by title at ingestion level
     seen, unique = set(), []
     for a in articles:
@@ -43,9 +70,32 @@ def fetch_articles(domain: str, page_size: int = 8) -> list[dict]:
     return unique
 
 
-def _fetch_newsapi(domain: str, page_size: int) -> list[dict]:
-    if not NEWS_API_KEY:
+def _cached(key: str) -> dict | None:
+    with _cache_lock:
+        return _feed_cache.get(key)
+
+
+def _store(key: str, articles: list[dict], etag: str | None = None, last_modified: str | None = None):
+    with _cache_lock:
+        _feed_cache[key] = {
+            "articles":      articles,
+            "etag":          etag,
+            "last_modified": last_modified,
+            "fetched_at":    time.monotonic(),
+        }
+
+
+def _fresh(entry: dict | None) -> bool:
+    return entry is not None and time.monotonic() - entry["fetched_at"] < FEED_TTL_SECONDS
+
+
+async def _fetch_newsapi(client: httpx.AsyncClient, domain: str, page_size: int) -> list[dict]:
+    if not NEWS_API_KEY or not NEWSAPI_CATEGORIES[domain]:
         return []
+    key   = f"newsapi:{domain}:{page_size}"
+    entry = _cached(key)
+    if _fresh(entry):
+        return list(entry["articles"])
     try:
         params = {
             "apiKey":   NEWS_API_KEY,
@@ -53,10 +103,10 @@ def _fetch_newsapi(domain: str, page_size: int) -> list[dict]:
             "pageSize": page_size,
             "category": NEWSAPI_CATEGORIES[domain],
         }
-        resp = requests.get(NEWS_API_URL, params=params, timeout=10)
+        resp = await client.get(NEWS_API_URL, params=params)
         resp.raise_for_status()
         raw_list = resp.json().get("articles", [])
-        return [
+        articles = [
             _normalize(
                 title=a["title"],
                 content=a.get("description") or a.get("content", ""),
@@ -67,26 +117,45 @@ def _fetch_newsapi(domain: str, page_size: int) -> list[dict]:
             for a in raw_list
             if a.get("title") and a.get("description")
         ]
+        _store(key, articles)
+        return list(articles)
     except Exception:
-        return []
+        # an outage keeps serving the last good response
+        return list(entry["articles"]) if entry else []
+
+
+async def _fetch_rss(client: httpx.AsyncClient, url: str, domain: str) -> list[dict]:
+    entry = _cached(url)
+    if _fresh(entry):
+        return list(entry["articles"])
+    headers = {}
+    if entry and entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    try:
+        resp = await client.get(url, headers=headers)
+        if resp.status_code == 304 and entry:
+            _store(url, entry["articles"], entry["etag"], entry["last_modified"])
+            return list(entry["articles"])
+        resp.raise_for_status()
+        articles = _parse_rss(resp.content, url, domain)
+        _store(url, articles, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return list(articles)
+    except Exception:
+        return list(entry["articles"]) if entry else []
 
 
-def _fetch_rss(domain: str) -> list[dict]:
+def _parse_rss(content: bytes, url: str, domain: str) -> list[dict]:
     articles = []
-    for url in RSS_FEEDS[domain]:
-        try:
-            resp = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-            resp.raise_for_status()
-            root = ET.fromstring(resp.content)
-            for item in root.findall(".//item")[:8]:
-                title   = item.findtext("title", "").strip()
-                content = item.findtext("description", "").strip()
-                source  = item.findtext("source", url.split("/")[2])
-                pub     = item.findtext("pubDate", _now())
-                if title and content:
-                    articles.append(_normalize(title, content, source, pub, domain))
-        except Exception:
-            continue
+    root = ET.fromstring(content)
+    for item in root.findall(".//item")[:8]:
+        title   = item.findtext("title", "").strip()
+        body    = item.findtext("description", "").strip()
+        source  = item.findtext("source", url.split("/")[2])
+        pub     = item.findtext("pubDate", _now())
+        if title and body:
+            articles.append(_normalize(title, body, source, pub, domain))
     return articles
 
 
@@ -1,43 +1,93 @@
+import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from ingestion import fetch_articles
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from ingestion import fetch_articles, fetch_all
 from agents import run_agent
+from dedup import dedupe_across_domains
+from registry import DOMAINS as REGISTRY
 
-DOMAINS  = ["tech", "finance", "sports"]
+DOMAINS  = list(REGISTRY)
 MAX_RETRIES = 2
+AGENT_WORKERS          = int(os.getenv("AGENT_WORKERS", "8"))
+DOMAIN_TIMEOUT_SECONDS = float(os.getenv("DOMAIN_TIMEOUT_SECONDS", "120"))  # per domain, from when its agent starts
 
+# Module-level so a timed-out agent never holds up the digest: it keeps its
+# worker until the call returns, but run_pipeline does not wait for it.
+_agent_pool = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="agent")
 
-def run_pipeline() -> list[dict]:
-    with ThreadPoolExecutor(max_workers=len(DOMAINS)) as executor:
-        futures = {
-            executor.submit(_fetch_and_run_with_retry, domain): domain
-            for domain in DOMAINS
-        }
-        results = {}
-        for future in as_completed(futures):
+
+def run_pipeline(timings: dict | None = None, savings: dict | None = None) -> list[dict]:
+    started = time.perf_counter()
+    # all feeds of all domains in one concurrent pass (served from cache when fresh)
+    articles = fetch_all(DOMAINS)
+    # one article per real story, across domains, before any LLM call
+    articles, dedup_stats = dedupe_across_domains(articles)
+    ingested = time.perf_counter()
+    started_at = {}
+
+    def run(domain: str) -> dict:
+        started_at[domain] = time.monotonic()
+        return _fetch_and_run_with_retry(domain, articles[domain])
+
+    futures = {_agent_pool.submit(run, domain): domain for domain in DOMAINS}
+    pending = set(futures)
+    results = {}
+    while pending:
+        now       = time.monotonic()
+        deadlines = [started_at[futures[f]] + DOMAIN_TIMEOUT_SECONDS - now for f in pending if futures[f] in started_at]
+        done, pending = wait(pending, timeout=max(min(deadlines + [1.0]), 0), return_when=FIRST_COMPLETED)
+        for future in done:
             domain = futures[future]
             try:
                 results[domain] = future.result()
             except Exception as e:
-                results[domain] = {
-                    "domain":  domain,
-                    "bullets": [f"Pipeline error: {e}"],
-                    "summary": f"- Pipeline error: {e}",
-                    "count":   0,
-                }
+                results[domain] = _error_output(domain, f"Pipeline error: {e}")
+        now = time.monotonic()
+        for future in list(pending):
+            domain = futures[future]
+            if domain in started_at and now - started_at[domain] > DOMAIN_TIMEOUT_SECONDS:
+                pending.discard(future)
+                results[domain] = _error_output(domain, f"Timed out after {DOMAIN_TIMEOUT_SECONDS:.0f}s")
+
+    if timings is not None:
+        timings["ingestion_seconds"] = round(ingested - started, 2)
+        timings["agents_seconds"]    = round(time.perf_counter() - ingested, 2)
+    if savings is not None:
+        savings.update(_savings(dedup_stats, results.values()))
 
     # return in consistent order
     return [results[d] for d in DOMAINS]
 
 
-def _fetch_and_run_with_retry(domain: str) -> dict:
+def _error_output(domain: str, message: str) -> dict:
+    return {
+        "domain":  domain,
+        "bullets": [message],
+        "summary": f"- {message}",
+        "count":   0,
+    }
+
+
+def _fetch_and_run_with_retry(domain: str, articles: list[dict]) -> dict:
     last_error = None
     for attempt in range(1, MAX_RETRIES + 1):
         try:
-            articles = fetch_articles(domain)
+            if attempt > 1:
+                articles = dedupe_across_domains({domain: fetch_articles(domain)})[0][domain]
             return run_agent(domain, articles)
         except Exception as e:
             last_error = e
             if attempt < MAX_RETRIES:
                 time.sleep(2 ** attempt)  # exponential backoff
     raise last_error
+
+
+def _savings(dedup_stats: dict, outputs) -> dict:
+    llm_seconds  = sum(o.get("stats", {}).get("llm_seconds", 0) for o in outputs)
+    wall_seconds = sum(o.get("stats", {}).get("wall_seconds", 0) for o in outputs)
+    return {
+        **dedup_stats,
+        "chunk_llm_seconds":      round(llm_seconds, 2),
+        "chunk_wall_seconds":     round(wall_seconds, 2),
+        "parallel_seconds_saved": round(max(llm_seconds - wall_seconds, 0), 2),
+    }
@@ -0,0 +1,58 @@
+import os
+import re
+import yaml
+
+# Domain registry: feeds, keywords and prompts per domain, loaded from YAML.
+
+DOMAINS_FILE = os.getenv("DOMAINS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "domains.yaml"))
+
+DEFAULT_PROMPT = """You are a {name} News Analyst.
+
+Your tasks:
+1. Filter: Only process {name_lower}-related articles. Ignore unrelated content.
+2. Summarize: Extract the key developments and why they matter.
+3. Deduplicate: Merge duplicate stories into one bullet.
+4. Output: Return ONLY 3–5 bullet points starting with "-". No headers, no extra text.
+
+Focus on: {focus}."""
+
+
+def _compile_keywords(keywords: list[str]) -> re.Pattern:
+    # one alternation per domain: a single scan of the text instead of one `in` per keyword
+    # (longest first, same substring semantics)
+    ordered = sorted({str(k).lower() for k in keywords}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered))
+
+
+def load_domains(path: str = DOMAINS_FILE) -> dict[str, dict]:
+    with open(path, encoding="utf-8") as f:
+        raw = (yaml.safe_load(f) or {}).get("domains") or {}
+    if not raw:
+        raise ValueError(f"{path}: no domains defined")
+
+    domains = {}
+    for key, spec in raw.items():
+        spec = spec or {}
+        if not spec.get("feeds") and not spec.get("newsapi_category"):
+            raise ValueError(f"{path}: domain '{key}' needs feeds or a newsapi_category")
+        if not spec.get("keywords"):
+            raise ValueError(f"{path}: domain '{key}' needs keywords")
+        name = spec.get("name") or key.title()
+        domains[key] = {
+            "key":              key,
+            "name":             name,
+            "label":            spec.get("label") or name,
+            "feeds":            list(spec.get("feeds") or []),
+            "newsapi_category": spec.get("newsapi_category"),
+            "keywords":         list(spec["keywords"]),
+            "matcher":          _compile_keywords(spec["keywords"]),
+            "prompt":           (spec.get("prompt") or DEFAULT_PROMPT.format(
+                name=name,
+                name_lower=name.lower(),
+                focus=spec.get("focus") or f"the most important {name.lower()} news",
+            )).strip(),
+        }
+    return domains
+
+
+DOMAINS = load_domains()
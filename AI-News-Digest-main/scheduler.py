@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+from datetime import datetime, timezone
+from typing import Callable
+
+DIGEST_REFRESH_SECONDS = float(os.getenv("DIGEST_REFRESH_SECONDS", "900"))
+
+
+class DigestScheduler:
+    """Keeps the last good digest and rebuilds it in the background.
+
+    build() returns (payload, timings). Readers get the last good payload
+    immediately (stale-while-revalidate); only the very first request waits
+    for a build. At most one build runs at a time: refresh requests made
+    while one is running join it instead of starting another pipeline.
+    """
+
+    def __init__(self, build: Callable[[], tuple[dict, dict]], interval: float = DIGEST_REFRESH_SECONDS):
+        self._build     = build
+        self.interval   = interval
+        self._cond      = threading.Condition()
+        self._building  = False
+        self._builds    = 0        # finished builds (ok or failed)
+        self._last      = None     # {"payload", "built_at", "generated_at", "timings"}
+        self._error     = None
+        self._stop      = threading.Event()
+        self._thread    = None
+
+    # ── Background loop ───────────────────────────────────────────────────────
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="digest-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.refresh(wait=True)
+            self._stop.wait(self.interval)
+
+    # ── Coalesced refresh ─────────────────────────────────────────────────────
+
+    def refresh(self, wait: bool = False) -> bool:
+        """Start a build unless one is running. Returns True if this call started it."""
+        with self._cond:
+            target  = self._builds + 1
+            started = not self._building
+            if started:
+                self._building = True
+                threading.Thread(target=self._run, name="digest-build", daemon=True).start()
+            if wait:
+                while self._builds < target:
+                    self._cond.wait()
+        return started
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            payload, timings = self._build()
+            timings = {**timings, "total_seconds": round(time.perf_counter() - started, 2)}
+            last    = {
+                "payload":      payload,
+                "built_at":     time.time(),
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "timings":      timings,
+            }
+            error   = None
+        except Exception as e:
+            last, error = None, str(e)
+        with self._cond:
+            if last is not None:
+                self._last = last
+            self._error    = error
+            self._building = False
+            self._builds  += 1
+            self._cond.notify_all()
+
+    # ── Read ──────────────────────────────────────────────────────────────────
+
+    def get(self) -> dict:
+        """Last good digest plus its age; kicks off a background build when it is stale."""
+        with self._cond:
+            last = self._last
+        if last is None:
+            self.refresh(wait=True)
+            with self._cond:
+                last = self._last
+            if last is None:
+                raise RuntimeError(self._error or "Digest build failed")
+
+        age   = time.time() - last["built_at"]
+        stale = age > self.interval
+        if stale:
+            self.refresh()
+        with self._cond:
+            refreshing, error = self._building, self._error
+        return {
+            **last["payload"],
+            "generated_at": last["generated_at"],
+            "age_seconds":  round(age, 1),
+            "stale":        stale,
+            "refreshing":   refreshing,
+            "timings":      last["timings"],
+            "last_error":   error,
+        }
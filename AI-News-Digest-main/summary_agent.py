@@ -1,12 +1,13 @@
 import os
 from groq import Groq
+from registry import DOMAINS
 
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 MODEL = "llama-3.3-70b-versatile"
 
 SYSTEM_PROMPT = """You are a Chief News Editor producing a daily briefing.
 
-You receive bullet-point summaries from three specialist analysts: Tech, Finance, and Sports.
+You receive bullet-point summaries from {count} specialist analysts: {names}.
 
 Your tasks:
 1. Top Headlines: Pick the 3 most globally important stories across ALL domains. Rank by real-world impact.
@@ -21,23 +22,19 @@ Output STRICTLY in this format (use these exact emoji headers):
 - <second most important>
 - <third most important>
 
-🧠 Tech
-- <bullet>
-- <bullet>
+{sections}"""
 
-💰 Finance
-- <bullet>
-- <bullet>
+TOP_HEADLINES = "🔥 Top Headlines"
+DOMAIN_LABELS = {key: d["label"] for key, d in DOMAINS.items()}
 
-⚽ Sports
-- <bullet>
-- <bullet>"""
 
-DOMAIN_LABELS = {
-    "tech":    "🧠 Tech",
-    "finance": "💰 Finance",
-    "sports":  "⚽ Sports",
-}
+def _system_prompt(domains: list[str]) -> str:
+    names = [DOMAINS[d]["name"] for d in domains]
+    return SYSTEM_PROMPT.format(
+        count=len(names),
+        names=names[0] if len(names) == 1 else ", ".join(names[:-1]) + ", and " + names[-1],
+        sections="\n\n".join(f"{DOMAIN_LABELS[d]}\n- <bullet>\n- <bullet>" for d in domains),
+    )
 
 
 def build_digest(agent_outputs: list[dict]) -> str:
@@ -49,7 +46,7 @@ def build_digest(agent_outputs: list[dict]) -> str:
     response = client.chat.completions.create(
         model=MODEL,
         messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "system", "content": _system_prompt([o["domain"] for o in agent_outputs])},
             {"role": "user",   "content": combined},
         ],
         temperature=0.2,
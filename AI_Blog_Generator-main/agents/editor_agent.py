@@ -1,4 +1,9 @@
 import re
+
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
+
 from langchain_core.messages import (
     SystemMessage,
     HumanMessage,
@@ -10,8 +15,65 @@ from prompts.editor_prompt import (
 
 from utils.config import (
     llm,
+    EDITOR_CHUNK_TOKENS,
+    EDITOR_CONCURRENCY,
+)
+
+from utils.llm_client import (
+    NodeLLM,
 )
 
+
+# ---------------------------------------------------
+# Rough token estimate (characters / 4)
+# ---------------------------------------------------
+CHARS_PER_TOKEN = 4
+
+
+EDIT_INSTRUCTIONS = """
+IMPORTANT:
+
+This is one excerpt of an already completed blog.
+The other excerpts are edited separately.
+
+Your task is ONLY to:
+- normalize markdown formatting
+- improve markdown hierarchy
+- improve spacing
+- improve paragraph readability
+- reduce repetitive sentence openings
+- preserve article structure
+- preserve article meaning
+
+DO NOT:
+- explain edits
+- mention improvements
+- summarize changes
+- output commentary
+- output editor notes
+- rewrite the article
+- shorten the article heavily
+- describe formatting changes
+
+Preserve:
+- ALL headings
+- ALL markdown
+- ALL sections
+- ALL explanations
+- ALL article flow
+
+CRITICAL OUTPUT RULES:
+- Output ONLY final markdown
+- Each section should have 1-2 paragraphs max
+- Do not use bullet points in blogs
+- NEVER say "Changes made"
+- NEVER explain improvements
+- NEVER output bullet summaries
+- NEVER output editor commentary
+- NEVER describe modifications
+- NEVER behave like an editor
+"""
+
 # ---------------------------------------------------
 # FINAL SANITIZER
 # ---------------------------------------------------
@@ -88,62 +150,150 @@ def sanitize_output(
 
     return cleaned
 
-def editor_node(state) -> dict:
+
+# ---------------------------------------------------
+# Section Splitting
+# ---------------------------------------------------
+def split_sections(
+    markdown_text: str
+) -> tuple[str, list[str]]:
     """
-    Intelligent blog editor.
+    (text before the first ## heading, one block per ## section).
 
-    Responsibilities:
-    - improve human feel
-    - smooth transitions
-    - improve readability
-    - preserve article depth
-    - prevent truncation
-    - maintain markdown structure
+    Runs on sanitized text: code fences are already
+    stripped, so every "## " line is a real heading.
+    """
+
+    preamble = []
+
+    sections = []
+
+    for line in markdown_text.split("\n"):
+
+        if line.startswith("## "):
+
+            sections.append([line])
 
-    IMPORTANT:
-    Never aggressively rewrite long blogs.
+        elif sections:
+
+            sections[-1].append(line)
+
+        else:
+
+            preamble.append(line)
+
+    return (
+        "\n".join(preamble).strip(),
+        [
+            "\n".join(section).strip()
+            for section in sections
+        ],
+    )
+
+
+def pack_chunks(
+    sections: list[str],
+    max_tokens: int = EDITOR_CHUNK_TOKENS
+) -> list[list[str]]:
     """
+    Consecutive sections grouped up to max_tokens.
 
-    merged_markdown = state.get(
-        "merged_md",
-        ""
+    A section larger than the budget gets a chunk of its own.
+    """
+
+    chunks = []
+
+    size = 0
+
+    for section in sections:
+
+        cost = len(section) // CHARS_PER_TOKEN + 1
+
+        if chunks and size + cost <= max_tokens:
+
+            chunks[-1].append(section)
+
+            size += cost
+
+        else:
+
+            chunks.append([section])
+
+            size = cost
+
+    return chunks
+
+
+# ---------------------------------------------------
+# Shared Style Summary
+# ---------------------------------------------------
+def build_style_summary(
+    state,
+    sections: list[str]
+) -> str:
+    """
+    Same context for every chunk, so edits stay consistent.
+    """
+
+    plan = state.get("plan")
+
+    headings = [
+        section.split("\n", 1)[0]
+        for section in sections
+    ]
+
+    lines = [
+        f"Topic: {state.get('topic', '')}",
+        f"Tone: {state.get('tone', '')}",
+    ]
+
+    if plan is not None:
+
+        lines += [
+            f"Blog Title: {plan.blog_title}",
+            f"Audience: {plan.audience}",
+            f"Blog Type: {plan.blog_kind}",
+            f"Narrative Style: {plan.narrative_style}",
+            f"Pacing: {plan.pacing_style}",
+            f"Storytelling Level: {plan.storytelling_level}",
+        ]
+
+    lines.append(
+        "Full Outline:\n"
+        + "\n".join(headings)
     )
 
-    # ---------------------------------------------------
-    # Empty Fallback
-    # ---------------------------------------------------
-    if not merged_markdown.strip():
+    return "\n".join(lines)
 
-        return {
-            "final":
-                "Blog generation failed."
-        }
 
-    # ---------------------------------------------------
-    # IMPORTANT:
-    # Skip editing for extremely large blogs
-    # to prevent truncation.
-    # ---------------------------------------------------
-    if len(merged_markdown) > 18000:
+# ---------------------------------------------------
+# Edit One Chunk
+# ---------------------------------------------------
+def edit_chunk(
+    editor: NodeLLM,
+    chunk: list[str],
+    style_summary: str
+) -> str:
+    """
+    Edited markdown for one chunk, or the original
+    text if the edit failed or looks truncated.
+    """
 
-        return {
-            "final":
-                merged_markdown
-        }
+    original = "\n\n".join(chunk)
 
-    # ---------------------------------------------------
-    # Medium Blog Handling
-    # ---------------------------------------------------
     try:
 
         # ---------------------------------------------------
-        # Safer editor token budget
+        # Output budget follows the chunk size
         # ---------------------------------------------------
-        editor_llm = llm.bind(
-            max_tokens=2500,
+        editor_llm = editor.bind(
+            max_tokens=min(
+                int(len(original) / CHARS_PER_TOKEN * 1.3) + 200,
+                4000,
+            ),
             temperature=0.4,
         )
-        merged_markdown = sanitize_output(merged_markdown)
+
         response = editor_llm.invoke(
             [
                 SystemMessage(
@@ -152,117 +302,160 @@ def editor_node(state) -> dict:
 
                 HumanMessage(
                     content=(
-                        f"TOPIC:\n"
-                        f"{state['topic']}\n\n"
+                        f"SHARED STYLE SUMMARY:\n"
+                        f"{style_summary}\n\n"
 
-                        f"TONE:\n"
-                        f"{state['tone']}\n\n"
+                        f"{EDIT_INSTRUCTIONS}\n\n"
 
-                        f"""
-IMPORTANT:
+                        f"BLOG EXCERPT:\n\n"
+                        f"{original}\n"
+                    )
+                ),
+            ]
+        )
 
-This is already a completed blog.
+        edited = sanitize_output(
+            response.content
+        )
 
-Your task is ONLY to:
-- normalize markdown formatting
-- improve markdown hierarchy
-- improve spacing
-- improve paragraph readability
-- reduce repetitive sentence openings
-- preserve article structure
-- preserve article meaning
+    except Exception as e:
 
-DO NOT:
-- explain edits
-- mention improvements
-- summarize changes
-- output commentary
-- output editor notes
-- rewrite the article
-- shorten the article heavily
-- describe formatting changes
+        print(
+            f"[Editor Error] {e}"
+        )
 
-Preserve:
-- ALL headings
-- ALL markdown
-- ALL sections
-- ALL explanations
-- ALL article flow
+        return original
 
-CRITICAL OUTPUT RULES:
-- Output ONLY final markdown
-- Each section should have 1-2 paragraphs max
-- Do not use bullet points in blogs
-- NEVER say "Changes made"
-- NEVER explain improvements
-- NEVER output bullet summaries
-- NEVER output editor commentary
-- NEVER describe modifications
-- NEVER behave like an editor
+    # ---------------------------------------------------
+    # Truncation Protection
+    # If the editor shrinks the excerpt too much or
+    # drops a heading, it likely truncated output.
+    # ---------------------------------------------------
+    headings_kept = all(
+        section.split("\n", 1)[0].strip() in edited
+        for section in chunk
+    )
 
-BLOG MARKDOWN:
+    if (
+        not edited.strip()
+        or len(edited) < len(original) * 0.75
+        or not headings_kept
+    ):
 
-{merged_markdown}
-"""
-                    )
-                ),
-            ]
-        )
+        return original
 
-        final_markdown = sanitize_output(response.content)
+    return edited
 
-        # ---------------------------------------------------
-        # Truncation Protection
-        # ---------------------------------------------------
-        original_length = len(
-            merged_markdown
-        )
 
-        edited_length = len(
-            final_markdown
-        )
+def editor_node(state) -> dict:
+    """
+    Intelligent blog editor.
 
-        # If editor shrinks content too much,
-        # editor likely truncated output.
-        if (
-            edited_length
-            < original_length * 0.75
-        ):
+    Responsibilities:
+    - improve human feel
+    - smooth transitions
+    - improve readability
+    - preserve article depth
+    - prevent truncation
+    - maintain markdown structure
 
-            final_markdown = (
-                merged_markdown
-            )
+    Long blogs are split on ## headings into chunks of
+    at most EDITOR_CHUNK_TOKENS and edited concurrently,
+    so edit latency stays flat as blogs grow.
+    """
 
-        # ---------------------------------------------------
-        # Empty Protection
-        # ---------------------------------------------------
-        if not final_markdown.strip():
+    merged_markdown = state.get(
+        "merged_md",
+        ""
+    )
+
+    # ---------------------------------------------------
+    # Empty Fallback
+    # ---------------------------------------------------
+    if not merged_markdown.strip():
+
+        return {
+            "final":
+                "Blog generation failed."
+        }
+
+    merged_markdown = sanitize_output(
+        merged_markdown
+    )
+
+    preamble, sections = split_sections(
+        merged_markdown
+    )
+
+    # ---------------------------------------------------
+    # No sections to edit
+    # ---------------------------------------------------
+    if not sections:
 
-            final_markdown = (
+        return {
+            "final":
                 merged_markdown
-            )
+        }
 
-    except Exception as e:
+    chunks = pack_chunks(
+        sections
+    )
 
-        print(
-            f"[Editor Error] {e}"
-        )
+    style_summary = build_style_summary(
+        state,
+        sections
+    )
 
-        # ---------------------------------------------------
-        # Safe fallback
-        # ---------------------------------------------------
-        final_markdown = (
-            merged_markdown
+    editor = NodeLLM(
+        "editor",
+        llm
+    )
+
+    # ---------------------------------------------------
+    # Concurrent Edits
+    # map() keeps chunk order, so reassembly is deterministic
+    # ---------------------------------------------------
+    with ThreadPoolExecutor(
+        max_workers=max(
+            min(
+                EDITOR_CONCURRENCY,
+                len(chunks)
+            ),
+            1
+        )
+    ) as pool:
+
+        edited_chunks = list(
+            pool.map(
+                lambda chunk: edit_chunk(
+                    editor,
+                    chunk,
+                    style_summary
+                ),
+                chunks,
+            )
         )
 
+    # ---------------------------------------------------
+    # Reassemble
+    # ---------------------------------------------------
+    final_markdown = "\n\n".join(
+        part
+        for part in [preamble, *edited_chunks]
+        if part.strip()
+    )
+
     # ---------------------------------------------------
     # Final Cleanup
     # ---------------------------------------------------
     final_markdown = sanitize_output(
-    final_markdown
+        final_markdown
     )
 
     return {
         "final":
-            final_markdown
-    }
\ No newline at end of file
+            final_markdown,
+
+        "llm_metrics":
+            editor.metrics(),
+    }
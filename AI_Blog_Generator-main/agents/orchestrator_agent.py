@@ -19,6 +19,10 @@ from utils.config import (
     llm,
 )
 
+from utils.llm_client import (
+    NodeLLM,
+)
+
 
 def orchestrator_node(
     state: State
@@ -60,7 +64,12 @@ def orchestrator_node(
     # ---------------------------------------------------
     # Planner LLM
     # ---------------------------------------------------
-    planner_llm = llm.bind(
+    planner = NodeLLM(
+        "orchestrator",
+        llm
+    )
+
+    planner_llm = planner.bind(
         max_tokens=2200,
         temperature=0.9,
     )
@@ -712,5 +721,8 @@ Every blog MUST have unique section titles.
 
     return {
         "plan":
-            plan
+            plan,
+
+        "llm_metrics":
+            planner.metrics(),
     }
\ No newline at end of file
@@ -3,6 +3,13 @@ from datetime import (
     timedelta,
 )
 
+from urllib.parse import (
+    urlsplit,
+    urlunsplit,
+    parse_qsl,
+    urlencode,
+)
+
 from typing import (
     Optional,
 )
@@ -12,10 +19,24 @@ from models.state import (
 )
 
 from tools.web_search import (
-    tavily_search,
+    tavily_search_many,
 )
 
 
+# ---------------------------------------------------
+# Tracking Parameters
+# Dropped when comparing URLs
+# ---------------------------------------------------
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+}
+
+
 # ---------------------------------------------------
 # Safe ISO Date Parsing
 # ---------------------------------------------------
@@ -55,6 +76,54 @@ def safe_str(value):
         return ""
 
 
+# ---------------------------------------------------
+# Canonical URL
+# ---------------------------------------------------
+def canonical_url(
+    url: str
+) -> str:
+    """
+    Same article, same key: scheme, "www.", fragment,
+    tracking parameters and trailing slash are ignored.
+    """
+
+    try:
+
+        parts = urlsplit(
+            url.strip()
+        )
+
+    except ValueError:
+
+        return url.strip()
+
+    host = parts.netloc.lower()
+
+    if host.startswith("www."):
+        host = host[4:]
+
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query)
+            if not key.lower().startswith("utm_")
+            and key.lower() not in TRACKING_PARAMS
+        )
+    )
+
+    path = parts.path.rstrip("/")
+
+    return urlunsplit(
+        (
+            "",
+            host,
+            path,
+            query,
+            "",
+        )
+    ).lstrip("/")
+
+
 # ---------------------------------------------------
 # Research Node
 # ---------------------------------------------------
@@ -66,8 +135,9 @@ def research_node(
 
     Features:
     - stable Tavily integration
+    - concurrent, disk-cached searches
     - evidence serialization
-    - deduplication
+    - canonical-URL deduplication
     - freshness filtering
     - topic relevance
     - frontend-safe persistence
@@ -121,35 +191,37 @@ def research_node(
 
     # ---------------------------------------------------
     # Tavily Search
+    # All queries at once, through the disk cache
     # ---------------------------------------------------
-    for query in queries:
-
-        if not query:
-            continue
-
-        try:
-
-            results = tavily_search(
-                query=query,
-                max_results=max_results
-            )
+    research_stats = {}
 
-            if (
-                isinstance(results, list)
-                and results
-            ):
+    try:
 
-                raw_results.extend(
-                    results
-                )
+        raw_results, research_stats = tavily_search_many(
+            [
+                query
+                for query in queries
+                if query
+            ],
+            max_results=max_results,
+            # Only open-book research is time-bound;
+            # hybrid mixes evergreen and recent sources
+            recency_days=(
+                state.get("recency_days")
+                if state.get("mode") == "open_book"
+                else None
+            ),
+        )
 
-        except Exception as e:
+        print(
+            f"[Research] {research_stats}"
+        )
 
-            print(
-                f"[Research Error] {e}"
-            )
+    except Exception as e:
 
-            continue
+        print(
+            f"[Research Error] {e}"
+        )
 
     # ---------------------------------------------------
     # Empty Results
@@ -157,7 +229,10 @@ def research_node(
     if not raw_results:
 
         return {
-            "evidence": []
+            "evidence": [],
+
+            "research_stats":
+                research_stats,
         }
 
     # ---------------------------------------------------
@@ -181,7 +256,11 @@ def research_node(
             continue
 
         # Deduplicate
-        if url in dedup:
+        key = canonical_url(
+            url
+        )
+
+        if key in dedup:
             continue
 
         title = safe_str(
@@ -200,7 +279,7 @@ def research_node(
             item.get("source")
         )
 
-        dedup[url] = {
+        dedup[key] = {
             "title":
                 title,
 
@@ -345,5 +424,8 @@ def research_node(
 
     return {
         "evidence":
-            serialized_evidence
+            serialized_evidence,
+
+        "research_stats":
+            research_stats,
     }
\ No newline at end of file
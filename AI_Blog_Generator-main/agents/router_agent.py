@@ -10,6 +10,8 @@ from prompts.router_prompt import ROUTER_SYSTEM
 
 from utils.config import llm
 
+from utils.llm_client import NodeLLM
+
 
 def router_node(state: State) -> dict:
     """
@@ -25,7 +27,12 @@ def router_node(state: State) -> dict:
     - stable query generation
     """
 
-    structured_llm = llm.with_structured_output(
+    router_llm = NodeLLM(
+        "router",
+        llm
+    )
+
+    structured_llm = router_llm.with_structured_output(
         RouterDecision
     )
 
@@ -149,6 +156,9 @@ def router_node(state: State) -> dict:
 
         "max_results_per_query":
             max_results,
+
+        "llm_metrics":
+            router_llm.metrics(),
     }
 
 
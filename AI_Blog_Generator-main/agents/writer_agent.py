@@ -1,19 +1,69 @@
 import re
+import threading
 
 from langchain_core.messages import (
     SystemMessage,
     HumanMessage,
 )
 
+from langgraph.types import Send
+
+from models.state import (
+    State,
+    SectionState,
+)
+
 from prompts.writer_prompt import (
     WRITER_SYSTEM
 )
 
 from utils.config import (
     writer_llm,
+    WRITER_CONCURRENCY,
+)
+
+from utils.llm_client import (
+    NodeLLM,
+)
+
+
+# ---------------------------------------------------
+# Concurrency Limit
+# IMPORTANT:
+# Shared by every graph run in this process,
+# so parallel blogs cannot exceed the Groq limits
+# ---------------------------------------------------
+_writer_slots = threading.BoundedSemaphore(
+    max(WRITER_CONCURRENCY, 1)
 )
 
 
+# ---------------------------------------------------
+# Tone Style Engines
+# ---------------------------------------------------
+TECHNICAL_TONES = [
+    "technical",
+    "professional",
+    "academic",
+]
+
+MARKETING_TONES = [
+    "marketing",
+    "seo",
+    "business",
+]
+
+STORYTELLING_TONES = [
+    "storytelling",
+]
+
+CASUAL_TONES = [
+    "casual",
+    "informal",
+    "conversational",
+]
+
+
 # ---------------------------------------------------
 # FINAL OUTPUT SANITIZER
 # ---------------------------------------------------
@@ -127,123 +177,16 @@ def sanitize_output(
     return text
 
 
-def writer_node(state) -> dict:
-    """
-    Advanced tone-aware blog writer.
-    """
-
-    plan = state["plan"]
-
-    evidence = state.get(
-        "evidence",
-        []
-    )
-
-    sections = []
-
-    # ---------------------------------------------------
-    # Running Context Memory
-    # ---------------------------------------------------
-    running_context = ""
-
-    # ---------------------------------------------------
-    # Opening Diversity Memory
-    # ---------------------------------------------------
-    used_openings = []
-
-    # ---------------------------------------------------
-    # Tone Handling
-    # ---------------------------------------------------
-    tone = (
-        plan.tone.lower()
-        if hasattr(plan, "tone")
-        else "professional"
-    )
-
-    # ---------------------------------------------------
-    # Tone Style Engines
-    # ---------------------------------------------------
-    technical_tones = [
-        "technical",
-        "professional",
-        "academic",
-    ]
-
-    marketing_tones = [
-        "marketing",
-        "seo",
-        "business",
-    ]
-
-    storytelling_tones = [
-        "storytelling",
-    ]
-
-    casual_tones = [
-        "casual",
-        "informal",
-        "conversational",
-    ]
-
-    # ---------------------------------------------------
-    # Sequential Writing
-    # ---------------------------------------------------
-    for index, task in enumerate(plan.tasks):
-
-        # ---------------------------------------------------
-        # Concepts Formatting
-        # ---------------------------------------------------
-        bullets_text = "\n".join(
-            f"- {bullet}"
-            for bullet in task.bullets
-        )
-
-        # ---------------------------------------------------
-        # Compact Evidence
-        # ---------------------------------------------------
-        compact_evidence = []
-
-        for item in evidence[:3]:
-
-            if not isinstance(item, dict):
-                continue
-
-            compact_evidence.append(
-                (
-                    f"- {item.get('title', '')}\n"
-                    f"  {item.get('snippet', '')[:140]}"
-                )
-            )
-
-        evidence_text = "\n".join(
-            compact_evidence
-        )
-
-        # ---------------------------------------------------
-        # Opening Diversity
-        # ---------------------------------------------------
-        recent_openings = "\n".join(
-            used_openings[-8:]
-        )
-
-        # ---------------------------------------------------
-        # Previous Context
-        # ---------------------------------------------------
-        previous_context = ""
-
-        if running_context.strip():
-
-            previous_context = (
-                "Previously Written Content:\n\n"
-                + running_context[-5000:]
-            )
+# ---------------------------------------------------
+# Dynamic Style Rules
+# ---------------------------------------------------
+def style_rules_for(
+    tone: str
+) -> str:
 
-        # ---------------------------------------------------
-        # Dynamic Style Rules
-        # ---------------------------------------------------
-        if tone in technical_tones:
+    if tone in TECHNICAL_TONES:
 
-            style_rules = """
+        return """
 STYLE REFERENCE:
 Write like DataCamp or professional Medium technical blogs.
 
@@ -312,9 +255,9 @@ EXAMPLES:
 - Use observations and implications to enrich sections
 """
 
-        elif tone in marketing_tones:
+    elif tone in MARKETING_TONES:
 
-            style_rules = """
+        return """
 STYLE REFERENCE:
 Write like Hostinger marketing blogs.
 
@@ -338,9 +281,9 @@ FORMATTING:
 - Optimize readability
 """
 
-        elif tone in storytelling_tones:
+    elif tone in STORYTELLING_TONES:
 
-            style_rules = """
+        return """
 STYLE REFERENCE:
 Write like Acumen storytelling blogs.
 
@@ -361,9 +304,9 @@ PARAGRAPHS:
 - Human storytelling flow
 """
 
-        elif tone in casual_tones:
+    elif tone in CASUAL_TONES:
 
-            style_rules = """
+        return """
 STYLE REFERENCE:
 Write like Pepper Content casual blogs.
 
@@ -384,58 +327,15 @@ PARAGRAPHS:
 - Fast readable pacing
 """
 
-        else:
+    else:
 
-            style_rules = """
+        return """
 WRITING STYLE:
 Write like a modern professional blog.
 """
 
-        # ---------------------------------------------------
-        # Generate Section
-        # ---------------------------------------------------
-        try:
-
-            response = writer_llm.invoke(
-                [
-                    SystemMessage(
-                        content=WRITER_SYSTEM
-                    ),
 
-                    HumanMessage(
-                        content=(
-                            f"Blog Title:\n"
-                            f"{plan.blog_title}\n\n"
-
-                            f"Audience:\n"
-                            f"{plan.audience}\n\n"
-
-                            f"Tone:\n"
-                            f"{plan.tone}\n\n"
-
-                            f"Blog Type:\n"
-                            f"{plan.blog_kind}\n\n"
-
-                            f"{previous_context}\n\n"
-
-                            f"Section Heading:\n"
-                            f"## {task.title}\n\n"
-
-                            f"Current Section Goal:\n"
-                            f"{task.goal}\n\n"
-
-                            f"Target Words:\n"
-                            f"{task.target_words}\n\n"
-
-                            f"Concepts To Naturally Cover:\n"
-                            f"{bullets_text}\n\n"
-
-                            f"Available Evidence:\n"
-                            f"{evidence_text}\n\n"
-
-                            f"{style_rules}\n\n"
-
-                            f"""
+WRITING_RULES = """
 IMPORTANT WRITING RULES:
 - Avoid repetitive transitions
 - Avoid repetitive paragraph openings
@@ -446,10 +346,9 @@ IMPORTANT WRITING RULES:
 - Avoid textbook-style transitions
 
 OPENING VARIETY:
-Recent openings already used:
-{recent_openings}
-
-DO NOT repeat similar openings.
+The other sections in the outline are being written at the same time.
+Open this section in a way that fits its place in the outline,
+and DO NOT open it the way a first or last section would unless it is one.
 
 FORBIDDEN AI OPENINGS:
 NEVER repeatedly begin paragraphs with:
@@ -558,106 +457,239 @@ FORBIDDEN PHRASES:
 
 ONLY output actual blog content.
 """
-                        )
-                    ),
-                ]
-            )
 
-            # ---------------------------------------------------
-            # SANITIZE OUTPUT
-            # ---------------------------------------------------
-            section_markdown = sanitize_output(
-                response.content
-            )
 
-            # ---------------------------------------------------
-            # Empty Recovery
-            # ---------------------------------------------------
-            if not section_markdown.strip():
+# ---------------------------------------------------
+# Compact Outline
+# ---------------------------------------------------
+def build_outline(
+    plan,
+    index: int
+) -> str:
+    """
+    One line per section, marking the one being written.
+
+    Replaces the previously written text as continuity
+    context, so sections can be written in parallel.
+    """
+
+    lines = []
+
+    for position, task in enumerate(plan.tasks):
+
+        marker = (
+            "  <-- YOU ARE WRITING THIS SECTION"
+            if position == index
+            else ""
+        )
+
+        lines.append(
+            f"{position + 1}. {task.title} — {task.goal}{marker}"
+        )
 
-                section_markdown = (
-                    f"## {task.title}\n\n"
-                    f"Content unavailable."
-                )
+    return "\n".join(
+        lines
+    )
 
-            # ---------------------------------------------------
-            # Track Openings
-            # ---------------------------------------------------
-            try:
 
-                first_lines = (
-                    section_markdown
-                    .split("\n")
-                )
+# ---------------------------------------------------
+# Fan-Out
+# ---------------------------------------------------
+def fan_out_writers(
+    state: State
+):
+    """
+    One writer per planned section, run concurrently.
+    """
 
-                opening = ""
+    plan = state["plan"]
 
-                for line in first_lines:
+    if not plan or not plan.tasks:
+        return "merge_sections"
 
-                    clean = line.strip()
+    evidence = state.get(
+        "evidence",
+        []
+    )
 
-                    if (
-                        clean
-                        and not clean.startswith("#")
-                    ):
+    return [
+        Send(
+            "writer",
+            {
+                "plan": plan,
+                "task": task,
+                "index": index,
+                "outline": build_outline(
+                    plan,
+                    index
+                ),
+                "evidence": evidence,
+            }
+        )
+        for index, task in enumerate(plan.tasks)
+    ]
 
-                        opening = clean[:120]
-                        break
 
-                if opening:
+def writer_node(state: SectionState) -> dict:
+    """
+    Advanced tone-aware blog writer.
 
-                    used_openings.append(
-                        opening
-                    )
+    Writes ONE section; fan_out_writers runs one
+    of these per task, at most WRITER_CONCURRENCY
+    at a time.
+    """
 
-            except Exception:
+    plan = state["plan"]
 
-                pass
+    task = state["task"]
 
-        except Exception as e:
+    index = state["index"]
 
-            print(
-                f"[Writer Error] {e}"
+    evidence = state.get(
+        "evidence",
+        []
+    )
+
+    # ---------------------------------------------------
+    # Tone Handling
+    # ---------------------------------------------------
+    tone = (
+        plan.tone.lower()
+        if hasattr(plan, "tone")
+        else "professional"
+    )
+
+    # ---------------------------------------------------
+    # Concepts Formatting
+    # ---------------------------------------------------
+    bullets_text = "\n".join(
+        f"- {bullet}"
+        for bullet in task.bullets
+    )
+
+    # ---------------------------------------------------
+    # Compact Evidence
+    # ---------------------------------------------------
+    compact_evidence = []
+
+    for item in evidence[:3]:
+
+        if not isinstance(item, dict):
+            continue
+
+        compact_evidence.append(
+            (
+                f"- {item.get('title', '')}\n"
+                f"  {item.get('snippet', '')[:140]}"
             )
+        )
 
-            section_markdown = (
-                f"## {task.title}\n\n"
-                f"{task.goal}\n\n"
-                f"{bullets_text}"
+    evidence_text = "\n".join(
+        compact_evidence
+    )
+
+    # ---------------------------------------------------
+    # Generate Section
+    # ---------------------------------------------------
+    section_llm = NodeLLM(
+        "writer",
+        writer_llm
+    )
+
+    try:
+
+        with _writer_slots:
+
+            response = section_llm.invoke(
+                [
+                    SystemMessage(
+                        content=WRITER_SYSTEM
+                    ),
+
+                    HumanMessage(
+                        content=(
+                            f"Blog Title:\n"
+                            f"{plan.blog_title}\n\n"
+
+                            f"Audience:\n"
+                            f"{plan.audience}\n\n"
+
+                            f"Tone:\n"
+                            f"{plan.tone}\n\n"
+
+                            f"Blog Type:\n"
+                            f"{plan.blog_kind}\n\n"
+
+                            f"Blog Outline:\n"
+                            f"{state['outline']}\n\n"
+
+                            f"Section Heading:\n"
+                            f"## {task.title}\n\n"
+
+                            f"Current Section Goal:\n"
+                            f"{task.goal}\n\n"
+
+                            f"Target Words:\n"
+                            f"{task.target_words}\n\n"
+
+                            f"Concepts To Naturally Cover:\n"
+                            f"{bullets_text}\n\n"
+
+                            f"Available Evidence:\n"
+                            f"{evidence_text}\n\n"
+
+                            f"{style_rules_for(tone)}\n\n"
+
+                            f"{WRITING_RULES}"
+                        )
+                    ),
+                ]
             )
 
         # ---------------------------------------------------
-        # SANITIZE BEFORE SAVING
+        # SANITIZE OUTPUT
         # ---------------------------------------------------
-        clean_section = sanitize_output(
-            section_markdown
+        section_markdown = sanitize_output(
+            response.content
         )
 
         # ---------------------------------------------------
-        # Store Section
+        # Empty Recovery
         # ---------------------------------------------------
-        sections.append(
-            (
-                task.id,
-                clean_section
+        if not section_markdown.strip():
+
+            section_markdown = (
+                f"## {task.title}\n\n"
+                f"Content unavailable."
             )
-        )
 
-        # ---------------------------------------------------
-        # SANITIZE BEFORE CONTEXT MEMORY
-        # ---------------------------------------------------
-        safe_context = sanitize_output(
-            section_markdown
+    except Exception as e:
+
+        print(
+            f"[Writer Error] {e}"
         )
 
-        # ---------------------------------------------------
-        # Update Context Memory
-        # ---------------------------------------------------
-        running_context += (
-            "\n\n"
-            + safe_context[:3000]
+        section_markdown = (
+            f"## {task.title}\n\n"
+            f"{task.goal}\n\n"
+            f"{bullets_text}"
         )
 
+    # ---------------------------------------------------
+    # SANITIZE BEFORE SAVING
+    # ---------------------------------------------------
+    clean_section = sanitize_output(
+        section_markdown
+    )
+
     return {
-        "sections": sections
-    }
\ No newline at end of file
+        "sections": [
+            (
+                index,
+                clean_section
+            )
+        ],
+
+        "llm_metrics":
+            section_llm.metrics(),
+    }
@@ -0,0 +1,359 @@
+# =========================================================
+# BATCH.PY
+# Generate many blogs from a topics file
+# =========================================================
+"""
+Batch blog generation.
+
+Topics file: one topic per line, optionally "topic | tone".
+Blank lines and lines starting with # are ignored.
+
+    python batch.py topics.txt --tone technical --workers 3 --rpm 30
+
+Several graphs run at once (--workers) but share one LLM
+request budget (--rpm, LLM_REQUESTS_PER_MINUTE). Every topic
+is checkpointed in a SQLite LangGraph checkpointer, so after
+a crash the same command resumes each unfinished blog at the
+node that failed instead of redoing research and planning.
+Finished topics are skipped unless --force is given.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed,
+)
+
+from datetime import date
+
+from utils.storage import (
+    save_blog,
+    blog_metadata,
+)
+
+
+# ---------------------------------------------------
+# Topics File
+# ---------------------------------------------------
+def read_topics(
+    path: str,
+    default_tone: str
+) -> list[tuple[str, str]]:
+
+    topics = []
+
+    with open(
+        path,
+        "r",
+        encoding="utf-8"
+    ) as f:
+
+        for line in f:
+
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            topic, _, tone = line.partition("|")
+
+            topics.append(
+                (
+                    topic.strip(),
+                    tone.strip() or default_tone,
+                )
+            )
+
+    return topics
+
+
+def thread_id_for(
+    topic: str,
+    tone: str,
+    as_of: str
+) -> str:
+    """
+    Stable checkpoint key: same topic, tone and date resume the same run.
+    """
+
+    slug = re.sub(
+        r"[^a-z0-9]+",
+        "-",
+        f"{topic} {tone}".lower()
+    ).strip("-")
+
+    return f"{slug}-{as_of}"
+
+
+# ---------------------------------------------------
+# One Topic
+# ---------------------------------------------------
+def run_topic(
+    app,
+    topic: str,
+    tone: str,
+    as_of: str,
+    force: bool = False
+) -> dict:
+
+    config = {
+        "configurable": {
+            "thread_id": thread_id_for(
+                topic,
+                tone,
+                as_of
+            )
+        }
+    }
+
+    started = time.perf_counter()
+
+    # Reducers would append to the old run's sections
+    if force:
+
+        app.checkpointer.delete_thread(
+            config["configurable"]["thread_id"]
+        )
+
+    snapshot = app.get_state(config)
+
+    # ---------------------------------------------------
+    # Resume / Skip / Fresh Start
+    # ---------------------------------------------------
+    if snapshot.values and snapshot.next:
+
+        status = "resumed"
+
+        print(
+            f"[Batch] Resuming '{topic}' at {', '.join(snapshot.next)}"
+        )
+
+        result = app.invoke(
+            None,
+            config
+        )
+
+    elif snapshot.values and snapshot.values.get("final"):
+
+        return {
+            "topic": topic,
+            "status": "skipped",
+            "seconds": 0.0,
+            "path": None,
+        }
+
+    else:
+
+        status = "generated"
+
+        result = app.invoke(
+            {
+                "topic": topic,
+                "tone": tone,
+                "as_of": as_of,
+            },
+            config
+        )
+
+    plan = result.get(
+        "plan"
+    )
+
+    title = (
+        plan.blog_title
+        if plan
+        else topic
+    )
+
+    blog_path = save_blog(
+        title,
+        result.get(
+            "final",
+            ""
+        ),
+        blog_metadata(
+            result,
+            title
+        )
+    )
+
+    return {
+        "topic": topic,
+        "status": status,
+        "seconds": round(
+            time.perf_counter() - started,
+            1
+        ),
+        "path": blog_path,
+    }
+
+
+# ---------------------------------------------------
+# CLI
+# ---------------------------------------------------
+def main():
+
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    parser.add_argument("topics_file")
+
+    parser.add_argument(
+        "--tone",
+        default="professional",
+        help="Tone for topics that do not set one.",
+    )
+
+    parser.add_argument(
+        "--as-of",
+        default=str(date.today()),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=3,
+        help="Blogs generated at the same time.",
+    )
+
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        default=None,
+        help="LLM requests per minute shared by all blogs "
+             "(default: LLM_REQUESTS_PER_MINUTE, 0 = unlimited).",
+    )
+
+    parser.add_argument(
+        "--checkpoint-db",
+        default=os.path.join(".langgraph", "checkpoints.sqlite"),
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate topics that already finished.",
+    )
+
+    args = parser.parse_args()
+
+    # Read by the shared rate limiter on the first LLM call
+    if args.rpm is not None:
+
+        os.environ["LLM_REQUESTS_PER_MINUTE"] = str(args.rpm)
+
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    from workflow.blog_workflow import build_app
+
+    topics = read_topics(
+        args.topics_file,
+        args.tone
+    )
+
+    os.makedirs(
+        os.path.dirname(args.checkpoint_db) or ".",
+        exist_ok=True
+    )
+
+    conn = sqlite3.connect(
+        args.checkpoint_db,
+        check_same_thread=False
+    )
+
+    # The plan is stored as a pydantic model
+    serde = JsonPlusSerializer(
+        allowed_msgpack_modules=[
+            ("models.schemas", "Plan"),
+            ("models.schemas", "Task"),
+        ]
+    )
+
+    app = build_app(
+        checkpointer=SqliteSaver(
+            conn,
+            serde=serde
+        )
+    )
+
+    print(
+        f"[Batch] {len(topics)} topic(s), "
+        f"{args.workers} at a time"
+    )
+
+    results = []
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(
+        max_workers=max(args.workers, 1)
+    ) as pool:
+
+        futures = {
+            pool.submit(
+                run_topic,
+                app,
+                topic,
+                tone,
+                args.as_of,
+                args.force
+            ): topic
+            for topic, tone in topics
+        }
+
+        for future in as_completed(futures):
+
+            topic = futures[future]
+
+            try:
+
+                outcome = future.result()
+
+            except Exception as e:
+
+                outcome = {
+                    "topic": topic,
+                    "status": f"failed: {e}",
+                    "seconds": None,
+                    "path": None,
+                }
+
+            results.append(outcome)
+
+            print(
+                f"[Batch] {outcome['status']:<10} "
+                f"{topic} -> {outcome['path']}"
+            )
+
+    conn.close()
+
+    failed = [
+        outcome
+        for outcome in results
+        if outcome["status"].startswith("failed")
+    ]
+
+    print(
+        f"\n[Batch] Done in {time.perf_counter() - started:.1f}s: "
+        f"{len(results) - len(failed)} ok, {len(failed)} failed"
+    )
+
+    if failed:
+
+        print(
+            "[Batch] Re-run the same command to resume failed topics."
+        )
+
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,6 @@
 
 from __future__ import annotations
 
-import os
 import re
 
 from datetime import (
@@ -20,6 +19,15 @@ import streamlit.components.v1 as components
 
 from workflow.blog_workflow import app
 
+from utils.storage import (
+    save_blog,
+    blog_metadata,
+)
+
+from utils.llm_client import (
+    summarize_llm_metrics,
+)
+
 
 # =========================================================
 # PAGE CONFIG
@@ -328,30 +336,15 @@ if generate_btn:
         # =====================================================
         # SAVE BLOG TO generated_blogs/
         # =====================================================
-        os.makedirs(
-            "generated_blogs",
-            exist_ok=True
-        )
-
-        safe_filename = re.sub(
-            r"[^a-zA-Z0-9_-]",
-            "_",
-            title
-        )
-
-        blog_path = (
-            f"generated_blogs/"
-            f"{safe_filename}.md"
+        blog_path = save_blog(
+            title,
+            final_blog,
+            blog_metadata(
+                result,
+                title
+            )
         )
 
-        with open(
-            blog_path,
-            "w",
-            encoding="utf-8"
-        ) as f:
-
-            f.write(final_blog)
-
         print(
             f"[Saved Blog] {blog_path}"
         )
@@ -812,5 +805,23 @@ with st.expander(
 
             "estimated_read_time":
                 read_time,
+
+            "research":
+                current_blog["raw_result"].get(
+                    "research_stats",
+                    {}
+                ),
         }
+    )
+
+with st.expander(
+    "LLM Usage By Agent"
+):
+
+    st.json(
+        summarize_llm_metrics(
+            current_blog["raw_result"].get(
+                "llm_metrics"
+            ) or {}
+        )
     )
\ No newline at end of file
@@ -7,8 +7,13 @@ from typing import (
     Annotated,
 )
 
+from utils.llm_client import (
+    merge_llm_metrics,
+)
+
 from models.schemas import (
     Plan,
+    Task,
     EvidenceItem,
 )
 
@@ -47,6 +52,10 @@ class State(TypedDict):
         operator.add
     ]
 
+    # Query count, cache hits, wall time and
+    # time saved versus serial live searches
+    research_stats: dict
+
     # ---------------------------------------------------
     # Planning
     # ---------------------------------------------------
@@ -67,4 +76,32 @@ class State(TypedDict):
     # ---------------------------------------------------
     merged_md: str
 
-    final: str
\ No newline at end of file
+    final: str
+
+    # ---------------------------------------------------
+    # Telemetry
+    # Per-node LLM calls, cache hits, retries,
+    # latency and tokens, summed across nodes
+    # ---------------------------------------------------
+    llm_metrics: Annotated[
+        dict,
+        merge_llm_metrics
+    ]
+
+
+class SectionState(TypedDict):
+    """
+    Payload sent to each parallel writer.
+    """
+
+    plan: Plan
+
+    task: Task
+
+    # Position of the section in plan.tasks
+    index: int
+
+    # Compact outline of the whole blog
+    outline: str
+
+    evidence: List[EvidenceItem]
@@ -1,45 +1,198 @@
-from typing import List, Dict
+import asyncio
+import hashlib
+import json
+import os
+import time
 
-from tavily import TavilyClient
+from typing import List, Dict, Optional
 
-from utils.config import TAVILY_API_KEY
+from tavily import AsyncTavilyClient
 
+from utils.config import (
+    TAVILY_API_KEY,
+    SEARCH_CACHE_DIR,
+    SEARCH_CACHE_TTL_HOURS,
+)
 
-client = TavilyClient(api_key=TAVILY_API_KEY)
 
+def _clean_results(response: Dict) -> List[Dict]:
+    cleaned_results = []
 
-def tavily_search(
+    for r in response.get("results", []):
+        cleaned_results.append(
+            {
+                "title": r.get("title", ""),
+                "url": r.get("url", ""),
+                "snippet": r.get("content", ""),
+                "published_at": r.get("published_date"),
+                "source": r.get("source"),
+            }
+        )
+
+    return cleaned_results
+
+
+# ---------------------------------------------------
+# Recency Window
+# recency_days rounded up to Tavily's time_range
+# buckets (open-book research filters exact dates).
+# None sends no time filter.
+# ---------------------------------------------------
+TIME_RANGES = [
+    (1, "day"),
+    (7, "week"),
+    (31, "month"),
+    (365, "year"),
+]
+
+
+def _time_range(
+    recency_days: Optional[int]
+) -> Optional[str]:
+    if recency_days is None:
+        return None
+
+    for days, time_range in TIME_RANGES:
+        if recency_days <= days:
+            return time_range
+
+    return None
+
+
+# ---------------------------------------------------
+# Disk Cache
+# One JSON file per (query, max_results, time range)
+# ---------------------------------------------------
+def _cache_path(
     query: str,
-    max_results: int = 5
-) -> List[Dict]:
+    max_results: int,
+    time_range: Optional[str]
+) -> str:
+    key = json.dumps(
+        [" ".join(query.lower().split()), max_results, time_range]
+    )
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(SEARCH_CACHE_DIR, f"{digest}.json")
+
+
+def _cache_get(path: str) -> Optional[Dict]:
+    try:
+        if time.time() - os.path.getmtime(path) > SEARCH_CACHE_TTL_HOURS * 3600:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_put(path: str, entry: Dict):
+    try:
+        os.makedirs(SEARCH_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[Search Cache Error] {e}")
+
+
+async def tavily_search_async(
+    async_client: AsyncTavilyClient,
+    query: str,
+    max_results: int = 5,
+    recency_days: Optional[int] = None,
+) -> Dict:
     """
-    Search web using Tavily.
-    Returns cleaned search results.
+    Cached async Tavily search.
+
+    Returns {"results", "cached", "seconds"}, where
+    "seconds" is what the live search took (for a
+    cache hit: what it took when it was cached).
     """
 
+    time_range = _time_range(recency_days)
+
+    path = _cache_path(query, max_results, time_range)
+
+    entry = _cache_get(path)
+
+    if entry is not None:
+        return {**entry, "cached": True}
+
+    started = time.perf_counter()
+
     try:
-        response = client.search(
+        response = await async_client.search(
             query=query,
             max_results=max_results,
+            time_range=time_range,
         )
 
-        results = response.get("results", [])
+    except Exception as e:
+        print(f"[Tavily Error] {e}")
+        return {"results": [], "cached": False, "seconds": time.perf_counter() - started}
 
-        cleaned_results = []
+    entry = {
+        "results": _clean_results(response),
+        "seconds": time.perf_counter() - started,
+    }
 
-        for r in results:
-            cleaned_results.append(
-                {
-                    "title": r.get("title", ""),
-                    "url": r.get("url", ""),
-                    "snippet": r.get("content", ""),
-                    "published_at": r.get("published_date"),
-                    "source": r.get("source"),
-                }
-            )
+    # Failed or empty searches are not cached, so they are retried next time
+    if entry["results"]:
+        _cache_put(path, entry)
 
-        return cleaned_results
+    return {**entry, "cached": False}
 
-    except Exception as e:
-        print(f"[Tavily Error] {e}")
-        return []
\ No newline at end of file
+
+async def _search_all(
+    queries: List[str],
+    max_results: int,
+    recency_days: Optional[int],
+) -> List[Dict]:
+    async_client = AsyncTavilyClient(api_key=TAVILY_API_KEY)
+
+    return await asyncio.gather(
+        *(
+            tavily_search_async(async_client, query, max_results, recency_days)
+            for query in queries
+        )
+    )
+
+
+def tavily_search_many(
+    queries: List[str],
+    max_results: int = 5,
+    recency_days: Optional[int] = None,
+) -> tuple[List[Dict], Dict]:
+    """
+    Run all queries concurrently through the cache.
+
+    Returns (results of every query, in query order, and
+    stats). time_saved_seconds compares the wall time with
+    running every query live, one after another.
+    """
+
+    started = time.perf_counter()
+
+    outcomes = asyncio.run(
+        _search_all(queries, max_results, recency_days)
+    )
+
+    elapsed = time.perf_counter() - started
+
+    serial_seconds = sum(outcome["seconds"] for outcome in outcomes)
+
+    results = []
+
+    for outcome in outcomes:
+        results.extend(outcome["results"])
+
+    stats = {
+        "queries": len(queries),
+        "cache_hits": sum(1 for outcome in outcomes if outcome["cached"]),
+        "elapsed_seconds": round(elapsed, 2),
+        "serial_uncached_seconds": round(serial_seconds, 2),
+        "time_saved_seconds": round(max(serial_seconds - elapsed, 0.0), 2),
+    }
+
+    return results, stats
@@ -1,6 +1,11 @@
 import os
+import threading
 
 from dotenv import load_dotenv
+from langchain_core.rate_limiters import (
+    BaseRateLimiter,
+    InMemoryRateLimiter,
+)
 from langchain_groq import ChatGroq
 
 
@@ -22,6 +27,124 @@ TAVILY_API_KEY = os.getenv(
 )
 
 
+# ---------------------------------------------------
+# Research Cache
+# Tavily results are reused for SEARCH_CACHE_TTL_HOURS
+# ---------------------------------------------------
+SEARCH_CACHE_DIR = os.getenv(
+    "SEARCH_CACHE_DIR",
+    os.path.join(".cache", "tavily")
+)
+
+SEARCH_CACHE_TTL_HOURS = float(
+    os.getenv(
+        "SEARCH_CACHE_TTL_HOURS",
+        "24"
+    )
+)
+
+
+# ---------------------------------------------------
+# Global LLM Rate Budget
+# Shared by every model and every graph run in this
+# process (e.g. batch.py running several blogs at once).
+# LLM_REQUESTS_PER_MINUTE, 0 = unlimited.
+# ---------------------------------------------------
+class SharedRateLimiter(BaseRateLimiter):
+    """
+    Reads LLM_REQUESTS_PER_MINUTE on the first LLM call,
+    not at import, so a value set later (batch.py --rpm)
+    still applies.
+    """
+
+    def __init__(self):
+
+        self._lock = threading.Lock()
+
+        self._limiter = None
+
+        self.requests_per_minute = None
+
+    def _get(self):
+
+        with self._lock:
+
+            if self.requests_per_minute is None:
+
+                self.requests_per_minute = float(
+                    os.getenv(
+                        "LLM_REQUESTS_PER_MINUTE",
+                        "0"
+                    )
+                )
+
+                if self.requests_per_minute > 0:
+
+                    self._limiter = InMemoryRateLimiter(
+                        requests_per_second=self.requests_per_minute / 60,
+                        check_every_n_seconds=0.1,
+                        max_bucket_size=1,
+                    )
+
+        return self._limiter
+
+    def acquire(
+        self,
+        *,
+        blocking: bool = True
+    ) -> bool:
+
+        limiter = self._get()
+
+        if limiter is None:
+            return True
+
+        return limiter.acquire(blocking=blocking)
+
+    async def aacquire(
+        self,
+        *,
+        blocking: bool = True
+    ) -> bool:
+
+        limiter = self._get()
+
+        if limiter is None:
+            return True
+
+        return await limiter.aacquire(blocking=blocking)
+
+
+llm_rate_limiter = SharedRateLimiter()
+
+
+# ---------------------------------------------------
+# LLM Response Cache (opt-in per node)
+# e.g. LLM_CACHE_NODES=router,orchestrator
+# ---------------------------------------------------
+LLM_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(".cache", "llm", "responses.sqlite")
+)
+
+LLM_CACHE_NODES = {
+    node.strip()
+    for node in os.getenv(
+        "LLM_CACHE_NODES",
+        ""
+    ).split(",")
+    if node.strip()
+}
+
+# Retries are done (and counted) by utils/llm_client.py
+LLM_MAX_RETRIES = int(
+    os.getenv(
+        "LLM_MAX_RETRIES",
+        "3"
+    )
+)
+
+
 # ---------------------------------------------------
 # Main LLM
 # Optimized for Groq Free Tier
@@ -33,7 +156,9 @@ llm = ChatGroq(
 
     max_tokens=800,
 
-    max_retries=3,
+    max_retries=0,
+
+    rate_limiter=llm_rate_limiter,
 )
 writer_llm = ChatGroq(
     model="llama-3.3-70b-versatile",
@@ -42,7 +167,40 @@ writer_llm = ChatGroq(
 
     max_tokens=2200,
 
-    max_retries=3,
+    max_retries=0,
+
+    rate_limiter=llm_rate_limiter,
+)
+
+
+# ---------------------------------------------------
+# Parallel Section Writing
+# Max writer_llm calls in flight at once
+# ---------------------------------------------------
+WRITER_CONCURRENCY = int(
+    os.getenv(
+        "WRITER_CONCURRENCY",
+        "3"
+    )
+)
+
+
+# ---------------------------------------------------
+# Chunked Editing
+# Long blogs are edited in ## section chunks
+# ---------------------------------------------------
+EDITOR_CHUNK_TOKENS = int(
+    os.getenv(
+        "EDITOR_CHUNK_TOKENS",
+        "1800"
+    )
+)
+
+EDITOR_CONCURRENCY = int(
+    os.getenv(
+        "EDITOR_CONCURRENCY",
+        "3"
+    )
 )
 
 
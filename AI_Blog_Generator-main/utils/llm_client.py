@@ -0,0 +1,471 @@
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from langchain_core.messages import (
+    AIMessage,
+    messages_to_dict,
+)
+
+from utils.config import (
+    LLM_CACHE_PATH,
+    LLM_CACHE_NODES,
+    LLM_MAX_RETRIES,
+)
+
+
+# ---------------------------------------------------
+# Errors that will not succeed on retry
+# ---------------------------------------------------
+NON_RETRYABLE_STATUS = {
+    400,
+    401,
+    403,
+    404,
+    413,
+    422,
+}
+
+
+# ---------------------------------------------------
+# Persistent Response Cache
+# ---------------------------------------------------
+class ResponseCache:
+    """
+    SQLite table of LLM responses keyed by prompt hash.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH
+    ):
+
+        self.path = path
+
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+
+        conn = getattr(
+            self._local,
+            "conn",
+            None
+        )
+
+        if conn is None:
+
+            os.makedirs(
+                os.path.dirname(self.path) or ".",
+                exist_ok=True
+            )
+
+            conn = sqlite3.connect(
+                self.path,
+                timeout=30
+            )
+
+            conn.execute("PRAGMA journal_mode=WAL")
+
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, node TEXT NOT NULL,"
+                " value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+            self._local.conn = conn
+
+        return conn
+
+    def get(
+        self,
+        key: str
+    ):
+
+        row = self._conn().execute(
+            "SELECT value FROM responses WHERE key = ?",
+            (key,)
+        ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def put(
+        self,
+        key: str,
+        node: str,
+        value: dict
+    ):
+
+        with self._conn() as conn:
+
+            conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, node, value, created_at) VALUES (?, ?, ?, ?)",
+                (key, node, json.dumps(value), time.time())
+            )
+
+
+response_cache = ResponseCache()
+
+
+# ---------------------------------------------------
+# Per-Node Counters
+# ---------------------------------------------------
+def empty_counters() -> dict:
+
+    return {
+        "calls": 0,
+        "cache_hits": 0,
+        "retries": 0,
+        "errors": 0,
+        "latency_seconds": 0.0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+    }
+
+
+def model_identity(
+    model
+) -> dict:
+    """
+    Process-independent description of a chat model
+    for cache keys: class, model name and sampling.
+    """
+
+    return {
+        "class": type(model).__name__,
+        "model_name": (
+            getattr(model, "model_name", None)
+            or getattr(model, "model", None)
+        ),
+        "temperature": getattr(model, "temperature", None),
+        "max_tokens": getattr(model, "max_tokens", None),
+    }
+
+
+class NodeLLM:
+    """
+    One agent's handle on a shared model.
+
+    Every call goes through here, so the agent gets:
+    - retries with backoff (counted)
+    - latency and token counters
+    - an opt-in persistent prompt-hash cache
+      (LLM_CACHE_NODES, or cache=True)
+
+    bind() and with_structured_output() return handles
+    that share the same counters. metrics() is what the
+    node returns as "llm_metrics".
+    """
+
+    def __init__(
+        self,
+        node: str,
+        model,
+        cache: bool | None = None,
+        _schema=None,
+        _bound: dict | None = None,
+        _counters: dict | None = None,
+        _lock=None,
+        _model_id: dict | None = None,
+    ):
+
+        self.node = node
+
+        self.model = model
+
+        # Taken from the base model: bind() and
+        # with_structured_output() wrap it in runnables
+        # without these fields, and their repr() holds
+        # memory addresses that change every process.
+        self._model_id = _model_id or model_identity(
+            model
+        )
+
+        self.cache = (
+            node in LLM_CACHE_NODES
+            if cache is None
+            else cache
+        )
+
+        self._schema = _schema
+
+        self._bound = _bound or {}
+
+        self._counters = (
+            _counters
+            if _counters is not None
+            else empty_counters()
+        )
+
+        self._lock = _lock or threading.Lock()
+
+    def _derive(
+        self,
+        model,
+        schema=None,
+        bound: dict | None = None
+    ) -> "NodeLLM":
+
+        return NodeLLM(
+            self.node,
+            model,
+            cache=self.cache,
+            _schema=schema or self._schema,
+            _bound={**self._bound, **(bound or {})},
+            _counters=self._counters,
+            _lock=self._lock,
+            _model_id=self._model_id,
+        )
+
+    def bind(
+        self,
+        **kwargs
+    ) -> "NodeLLM":
+
+        return self._derive(
+            self.model.bind(**kwargs),
+            bound=kwargs
+        )
+
+    def with_structured_output(
+        self,
+        schema
+    ) -> "NodeLLM":
+
+        return self._derive(
+            self.model.with_structured_output(
+                schema,
+                include_raw=True
+            ),
+            schema=schema
+        )
+
+    # ---------------------------------------------------
+    # Cache Key
+    # ---------------------------------------------------
+    def _cache_key(
+        self,
+        messages
+    ) -> str:
+
+        payload = json.dumps(
+            {
+                "model": self._model_id,
+                "bound": self._bound,
+                "schema": self._schema.__name__ if self._schema else None,
+                "messages": messages_to_dict(messages),
+            },
+            sort_keys=True,
+            default=str,
+        )
+
+        return hashlib.sha256(
+            payload.encode("utf-8")
+        ).hexdigest()
+
+    def _count(
+        self,
+        **deltas
+    ):
+
+        with self._lock:
+
+            for name, value in deltas.items():
+
+                self._counters[name] += value
+
+    # ---------------------------------------------------
+    # Invoke
+    # ---------------------------------------------------
+    def invoke(
+        self,
+        messages
+    ):
+
+        key = self._cache_key(messages) if self.cache else None
+
+        if key:
+
+            cached = response_cache.get(key)
+
+            if cached is not None:
+
+                self._count(cache_hits=1)
+
+                if self._schema is not None:
+                    return self._schema.model_validate(cached["parsed"])
+
+                return AIMessage(content=cached["content"])
+
+        started = time.perf_counter()
+
+        attempt = 0
+
+        while True:
+
+            try:
+
+                result = self.model.invoke(messages)
+
+                break
+
+            except Exception as e:
+
+                status = getattr(e, "status_code", None)
+
+                if (
+                    attempt >= LLM_MAX_RETRIES
+                    or status in NON_RETRYABLE_STATUS
+                ):
+
+                    self._count(
+                        calls=1,
+                        errors=1,
+                        latency_seconds=time.perf_counter() - started,
+                    )
+
+                    raise
+
+                attempt += 1
+
+                self._count(retries=1)
+
+                time.sleep(
+                    min(2 ** attempt, 30) + random.uniform(0, 0.5)
+                )
+
+        # ---------------------------------------------------
+        # Structured output comes back with the raw message
+        # ---------------------------------------------------
+        raw = result["raw"] if self._schema is not None else result
+
+        usage = getattr(
+            raw,
+            "usage_metadata",
+            None
+        ) or {}
+
+        self._count(
+            calls=1,
+            latency_seconds=time.perf_counter() - started,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+        )
+
+        if self._schema is not None:
+
+            if result.get("parsing_error") or result.get("parsed") is None:
+
+                raise ValueError(
+                    f"{self.node}: could not parse {self._schema.__name__}: "
+                    f"{result.get('parsing_error')}"
+                )
+
+            parsed = result["parsed"]
+
+            if key:
+                response_cache.put(key, self.node, {"parsed": parsed.model_dump(mode="json")})
+
+            return parsed
+
+        if key:
+            response_cache.put(key, self.node, {"content": result.content})
+
+        return result
+
+    def metrics(self) -> dict:
+
+        with self._lock:
+
+            counters = dict(self._counters)
+
+        counters["latency_seconds"] = round(
+            counters["latency_seconds"],
+            3
+        )
+
+        return {
+            self.node: counters
+        }
+
+
+# ---------------------------------------------------
+# Graph State Reducer
+# ---------------------------------------------------
+def merge_llm_metrics(
+    left: dict | None,
+    right: dict | None
+) -> dict:
+    """
+    Sum counters per node (parallel writers each
+    report their own).
+    """
+
+    merged = {
+        node: dict(counters)
+        for node, counters in (left or {}).items()
+    }
+
+    for node, counters in (right or {}).items():
+
+        target = merged.setdefault(
+            node,
+            empty_counters()
+        )
+
+        for name, value in counters.items():
+
+            target[name] = round(
+                target.get(name, 0) + value,
+                3
+            )
+
+    return merged
+
+
+def summarize_llm_metrics(
+    metrics: dict
+) -> dict:
+    """
+    Per-node counters plus a "total" row and each
+    node's share of time and tokens.
+    """
+
+    total = empty_counters()
+
+    for counters in metrics.values():
+
+        for name, value in counters.items():
+
+            total[name] = round(
+                total[name] + value,
+                3
+            )
+
+    summary = {}
+
+    for node, counters in metrics.items():
+
+        tokens = counters["input_tokens"] + counters["output_tokens"]
+
+        all_tokens = total["input_tokens"] + total["output_tokens"]
+
+        summary[node] = {
+            **counters,
+            "share_of_latency": round(
+                counters["latency_seconds"] / total["latency_seconds"],
+                3
+            ) if total["latency_seconds"] else 0.0,
+            "share_of_tokens": round(
+                tokens / all_tokens,
+                3
+            ) if all_tokens else 0.0,
+        }
+
+    summary["total"] = total
+
+    return summary
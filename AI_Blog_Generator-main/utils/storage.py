@@ -0,0 +1,94 @@
+import json
+import os
+import re
+
+from datetime import datetime
+
+from utils.llm_client import (
+    summarize_llm_metrics,
+)
+
+
+# ---------------------------------------------------
+# Output Folder
+# ---------------------------------------------------
+BLOGS_DIR = "generated_blogs"
+
+
+def blog_filename(
+    title: str
+) -> str:
+
+    return re.sub(
+        r"[^a-zA-Z0-9_-]",
+        "_",
+        title
+    )
+
+
+def blog_metadata(
+    result: dict,
+    title: str
+) -> dict:
+    """
+    Run details saved next to the blog: inputs,
+    research stats and per-agent LLM cost and time.
+    """
+
+    return {
+        "title": title,
+        "topic": result.get("topic"),
+        "tone": result.get("tone"),
+        "as_of": result.get("as_of"),
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "research": result.get("research_stats", {}),
+        "llm_metrics": summarize_llm_metrics(
+            result.get("llm_metrics") or {}
+        ),
+    }
+
+
+def save_blog(
+    title: str,
+    final_blog: str,
+    metadata: dict | None = None
+) -> str:
+    """
+    Save markdown to generated_blogs/<title>.md
+    (and metadata to <title>.meta.json)
+    and return the path.
+    """
+
+    os.makedirs(
+        BLOGS_DIR,
+        exist_ok=True
+    )
+
+    blog_path = (
+        f"{BLOGS_DIR}/"
+        f"{blog_filename(title)}.md"
+    )
+
+    with open(
+        blog_path,
+        "w",
+        encoding="utf-8"
+    ) as f:
+
+        f.write(final_blog)
+
+    if metadata is not None:
+
+        with open(
+            f"{BLOGS_DIR}/{blog_filename(title)}.meta.json",
+            "w",
+            encoding="utf-8"
+        ) as f:
+
+            json.dump(
+                metadata,
+                f,
+                indent=2
+            )
+
+    return blog_path
@@ -21,6 +21,7 @@ from agents.orchestrator_agent import (
 
 from agents.writer_agent import (
     writer_node,
+    fan_out_writers,
 )
 
 from agents.editor_agent import (
@@ -36,17 +37,31 @@ def merge_sections_node(
 ):
     """
     Merge all generated sections.
+
+    Writers finish in any order; sections are
+    placed by their position in the plan.
     """
 
-    plan = state["plan"]
+    plan = state.get("plan")
+
+    # Last write wins if a section was written twice
+    by_position = {}
+
+    for position, markdown in state.get("sections", []):
+
+        by_position[position] = markdown
 
     ordered_sections = sorted(
-        state["sections"],
+        by_position.items(),
         key=lambda item: item[0]
     )
 
+    # No plan: hand the editor an empty draft
+    # instead of failing on the title
     merged_markdown = (
         f"# {plan.blog_title}\n\n"
+        if plan
+        else ""
     )
 
     for _, markdown in ordered_sections:
@@ -130,11 +145,18 @@ graph.add_edge(
 )
 
 # ---------------------------------------------------
-# Sequential Writing
+# Parallel Writing
+# One writer per section via Send
 # ---------------------------------------------------
-graph.add_edge(
+graph.add_conditional_edges(
     "orchestrator",
-    "writer"
+
+    fan_out_writers,
+
+    [
+        "writer",
+        "merge_sections",
+    ]
 )
 
 graph.add_edge(
@@ -159,4 +181,17 @@ graph.add_edge(
 # ---------------------------------------------------
 # Compile
 # ---------------------------------------------------
-app = graph.compile()
\ No newline at end of file
+def build_app(
+    checkpointer=None
+):
+    """
+    Compiled graph; pass a LangGraph checkpointer
+    to make runs resumable (see batch.py).
+    """
+
+    return graph.compile(
+        checkpointer=checkpointer
+    )
+
+
+app = build_app()
\ No newline at end of file
@@ -1,27 +1,27 @@
 import json
 from typing import Any
 
-from app.llm import ai_available, get_client, get_model
-from app.models import UserProfile, WorkoutPlan
-from app.plan_generator import generate_plan
+from app.llm import get_model
+from app.models import WorkoutPlan
+from app.plan_generator import ProfileKey
 
+SYSTEM_PROMPT = "You are an expert strength coach. Output strict JSON only."
 
-def generate_plan_with_ai(profile: UserProfile) -> WorkoutPlan:
-    fallback = generate_plan(profile)
-    if not ai_available():
-        return fallback
 
-    equipment = ", ".join(e.value.replace("_", " ") for e in profile.equipment)
-    injuries = ", ".join(i.value for i in profile.injuries) or "none"
-    prompt = f"""Create a {profile.days}-day {profile.goal.value.replace('_', ' ')} workout plan for a {profile.level.value}.
-Equipment available: {equipment}.
-Avoid exercises that aggravate these injuries: {injuries}.
+def build_prompt(key: ProfileKey) -> str:
+    """Prompt for a canonical profile key, so equal keys always send equal prompts."""
+    goal, level, days, equipment, injuries = key
+    equipment_text = ", ".join(sorted(e.value.replace("_", " ") for e in equipment))
+    injuries_text = ", ".join(sorted(i.value for i in injuries)) or "none"
+    return f"""Create a {days}-day {goal.value.replace('_', ' ')} workout plan for a {level.value}.
+Equipment available: {equipment_text}.
+Avoid exercises that aggravate these injuries: {injuries_text}.
 
 Return ONLY valid JSON matching this schema:
 {{
   "goal": "string",
-  "days_per_week": {profile.days},
-  "level": "{profile.level.value}",
+  "days_per_week": {days},
+  "level": "{level.value}",
   "split_type": "string",
   "weekly_plan": [
     {{
@@ -36,24 +36,21 @@ Return ONLY valid JSON matching this schema:
   ]
 }}
 
-Use realistic exercises for the equipment. Include {profile.days} days."""
-
-    try:
-        response = get_client().chat.completions.create(
-            model=get_model(),
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert strength coach. Output strict JSON only.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.4,
-            response_format={"type": "json_object"},
-        )
-        raw = response.choices[0].message.content or "{}"
-        data: dict[str, Any] = json.loads(raw)
-        plan = WorkoutPlan.model_validate({**data, "source": "ai"})
-        return plan
-    except Exception:
-        return fallback
+Use realistic exercises for the equipment. Include {days} days."""
+
+
+def completion_kwargs(key: ProfileKey) -> dict[str, Any]:
+    return {
+        "model": get_model(),
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": build_prompt(key)},
+        ],
+        "temperature": 0.4,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def parse_plan(raw: str | None) -> WorkoutPlan:
+    data: dict[str, Any] = json.loads(raw or "{}")
+    return WorkoutPlan.model_validate({**data, "source": "ai"})
@@ -0,0 +1,131 @@
+"""AI plan generation with a shared client, response cache and single-flight.
+
+Requests are keyed by the canonical profile (`plan_generator.profile_key`).
+A cached AI plan is returned straight away. Concurrent requests for the same
+key share one in-flight model call. A caller that waits longer than the
+timeout budget gets the rules plan instead. The model call keeps running in
+the background and fills the cache for the next request.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict, deque
+
+from app.ai_generator import completion_kwargs, parse_plan
+from app.llm import get_async_client
+from app.models import AIGenerationStats, UserProfile, WorkoutPlan
+from app.plan_generator import ProfileKey, generate_plan, profile_key
+
+AI_PLAN_TIMEOUT_SECONDS = float(os.getenv("AI_PLAN_TIMEOUT_SECONDS", "8"))
+AI_PLAN_CACHE_TTL_SECONDS = float(os.getenv("AI_PLAN_CACHE_TTL_SECONDS", "86400"))
+AI_PLAN_CACHE_SIZE = int(os.getenv("AI_PLAN_CACHE_SIZE", "512"))
+
+
+class AIPlanService:
+    def __init__(
+        self,
+        timeout: float = AI_PLAN_TIMEOUT_SECONDS,
+        ttl: float = AI_PLAN_CACHE_TTL_SECONDS,
+        max_entries: int = AI_PLAN_CACHE_SIZE,
+    ):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._cache: OrderedDict[ProfileKey, tuple[float, WorkoutPlan]] = OrderedDict()
+        self._inflight: dict[ProfileKey, asyncio.Task] = {}
+        self._latencies: deque[float] = deque(maxlen=500)
+        self.requests = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.model_calls = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    async def generate(self, profile: UserProfile) -> WorkoutPlan:
+        started = time.perf_counter()
+        self.requests += 1
+        key = profile_key(profile)
+        try:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._call_model(key))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done: self._finish(key, done))
+            else:
+                self.coalesced += 1
+
+            try:
+                plan = await asyncio.wait_for(asyncio.shield(task), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                return generate_plan(profile)
+            except Exception:
+                return generate_plan(profile)
+            return plan
+        finally:
+            self._latencies.append((time.perf_counter() - started) * 1000)
+
+    async def _call_model(self, key: ProfileKey) -> WorkoutPlan:
+        self.model_calls += 1
+        try:
+            response = await get_async_client().chat.completions.create(**completion_kwargs(key))
+            plan = parse_plan(response.choices[0].message.content)
+        except Exception:
+            self.errors += 1
+            raise
+        self._cache_put(key, plan)
+        return plan
+
+    def _finish(self, key: ProfileKey, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # Mark the exception as retrieved: after a timeout nobody awaits the task.
+        if not task.cancelled():
+            task.exception()
+
+    def _cache_get(self, key: ProfileKey) -> WorkoutPlan | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, plan = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return plan
+
+    def _cache_put(self, key: ProfileKey, plan: WorkoutPlan) -> None:
+        self._cache[key] = (time.monotonic() + self.ttl, plan)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> AIGenerationStats:
+        latencies = sorted(self._latencies)
+
+        def percentile(pct: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * pct))], 1)
+
+        return AIGenerationStats(
+            requests=self.requests,
+            cache_hits=self.cache_hits,
+            cache_hit_rate=round(self.cache_hits / self.requests, 3) if self.requests else 0.0,
+            coalesced=self.coalesced,
+            model_calls=self.model_calls,
+            timeouts=self.timeouts,
+            errors=self.errors,
+            cached_plans=len(self._cache),
+            in_flight=len(self._inflight),
+            latency_p50_ms=percentile(0.5),
+            latency_p95_ms=percentile(0.95),
+        )
+
+
+ai_plan_service = AIPlanService()
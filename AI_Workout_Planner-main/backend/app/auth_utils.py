@@ -1,11 +1,14 @@
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.database import get_db
 from app.db_models import UserRow
@@ -17,6 +20,13 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "dev-change-me-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_DAYS = 7
 
+# token -> (expires_at monotonic, detached UserRow). Skips JWT decode + user lookup
+# for repeat requests; short TTL so a removed user stops authenticating quickly.
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_SIZE = 1024
+_user_cache: OrderedDict[str, tuple[float, UserRow]] = OrderedDict()
+_user_cache_lock = threading.Lock()
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -32,6 +42,44 @@ def create_access_token(user_id: str) -> str:
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
+def _cached_user(token: str) -> UserRow | None:
+    with _user_cache_lock:
+        entry = _user_cache.get(token)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _user_cache[token]
+            return None
+        _user_cache.move_to_end(token)
+        return entry[1]
+
+
+def _remember_user(token: str, user: UserRow, token_exp: float | None) -> None:
+    ttl = USER_CACHE_TTL_SECONDS
+    if token_exp is not None:
+        ttl = min(ttl, token_exp - time.time())
+    if ttl <= 0:
+        return
+    # Cache a detached snapshot: the request's own instance is expired on commit.
+    snapshot = UserRow(
+        id=user.id,
+        email=user.email,
+        hashed_password=user.hashed_password,
+        created_at=user.created_at,
+    )
+    make_transient_to_detached(snapshot)
+    with _user_cache_lock:
+        _user_cache[token] = (time.monotonic() + ttl, snapshot)
+        _user_cache.move_to_end(token)
+        while len(_user_cache) > USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
+
+
+def clear_user_cache() -> None:
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     db: Session = Depends(get_db),
@@ -41,8 +89,15 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
+
+    token = credentials.credentials
+    cached = _cached_user(token)
+    if cached is not None:
+        # Attach to this request's session without issuing a SELECT.
+        return db.merge(cached, load=False)
+
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str | None = payload.get("sub")
     except JWTError as exc:
         raise HTTPException(
@@ -56,4 +111,5 @@ def get_current_user(
     user = db.get(UserRow, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    _remember_user(token, user, payload.get("exp"))
     return user
@@ -0,0 +1,243 @@
+"""Column-oriented exercise catalog with bitset filtering.
+
+Each exercise is a row. Per-row attributes live in compact columns (`array`
+of small bitmask ints for equipment, goals and contraindications), and every
+ordering we filter over (alphabetical, and one per muscle pool) keeps one
+Python big-int bitset per attribute value. A filter is then a handful of
+whole-catalog AND/OR operations instead of a loop over exercises, and
+iterating the lowest set bits yields matches already in the right order.
+"""
+
+import csv
+import json
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.models import Equipment, Goal, Injury
+
+EQUIPMENT_BITS: dict[Equipment, int] = {e: 1 << i for i, e in enumerate(Equipment)}
+GOAL_BITS: dict[Goal, int] = {g: 1 << i for i, g in enumerate(Goal)}
+INJURY_BITS: dict[Injury, int] = {inj: 1 << i for i, inj in enumerate(Injury)}
+
+
+@dataclass(frozen=True)
+class ExerciseTemplate:
+    name: str
+    muscles: tuple[str, ...]
+    equipment: frozenset[Equipment]
+    goals: frozenset[Goal]
+
+
+def _mask(values: Iterable, bits: dict) -> int:
+    mask = 0
+    for value in values:
+        mask |= bits[value]
+    return mask
+
+
+def equipment_mask(equipment: Iterable[Equipment]) -> int:
+    return _mask(equipment, EQUIPMENT_BITS)
+
+
+def injury_mask(injuries: Iterable[Injury]) -> int:
+    return _mask(injuries, INJURY_BITS)
+
+
+def _unpack(mask: int, bits: dict) -> frozenset:
+    return frozenset(value for value, bit in bits.items() if mask & bit)
+
+
+def _bitset(positions: Iterable[int], size: int) -> int:
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def pool_key(muscle: str) -> str:
+    return muscle.strip().lower().replace(" ", "_")
+
+
+class BitsetIndex:
+    """Bitsets over one fixed ordering of catalog rows (bit i = rows[i])."""
+
+    def __init__(self, catalog: "ExerciseCatalog", rows: Sequence[int]):
+        self.rows = array("I", rows)
+        equipment: dict[int, list[int]] = {bit: [] for bit in EQUIPMENT_BITS.values()}
+        goals: dict[int, list[int]] = {bit: [] for bit in GOAL_BITS.values()}
+        injuries: dict[int, list[int]] = {bit: [] for bit in INJURY_BITS.values()}
+        muscles: dict[str, list[int]] = {}
+
+        for position, row in enumerate(self.rows):
+            for bit, members in equipment.items():
+                if catalog.equipment_masks[row] & bit:
+                    members.append(position)
+            for bit, members in goals.items():
+                if catalog.goal_masks[row] & bit:
+                    members.append(position)
+            for bit, members in injuries.items():
+                if catalog.contraindication_masks[row] & bit:
+                    members.append(position)
+            for muscle in catalog.muscles[row]:
+                muscles.setdefault(pool_key(muscle), []).append(position)
+
+        size = len(self.rows)
+        self.equipment = {bit: _bitset(members, size) for bit, members in equipment.items()}
+        self.goals = {bit: _bitset(members, size) for bit, members in goals.items()}
+        self.injuries = {bit: _bitset(members, size) for bit, members in injuries.items()}
+        self.muscles = {key: _bitset(members, size) for key, members in muscles.items()}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def select(self, equipment: int, goal: Goal, injuries: int = 0, muscle: str | None = None) -> int:
+        """Bitset of positions usable with any of `equipment`, suited to `goal`,
+        not contraindicated by `injuries` and (optionally) training `muscle`."""
+        matches = 0
+        for bit, members in self.equipment.items():
+            if equipment & bit:
+                matches |= members
+        matches &= self.goals[GOAL_BITS[goal]]
+        if muscle is not None:
+            matches &= self.muscles.get(pool_key(muscle), 0)
+        for bit, members in self.injuries.items():
+            if injuries & bit:
+                matches &= ~members
+        return matches
+
+    def iter_rows(self, matches: int, skip: int = 0) -> Iterator[int]:
+        """Row ids for the set bits of `matches`, in this index's order."""
+        while matches:
+            low = matches & -matches
+            matches ^= low
+            if skip:
+                skip -= 1
+                continue
+            yield self.rows[low.bit_length() - 1]
+
+
+class ExerciseCatalog:
+    def __init__(
+        self,
+        names: list[str],
+        muscles: list[tuple[str, ...]],
+        equipment_masks: Iterable[int],
+        goal_masks: Iterable[int],
+        contraindication_masks: Iterable[int],
+        pools: dict[str, list[str]] | None = None,
+    ):
+        self.names = names
+        self.muscles = muscles
+        self.equipment_masks = array("B", equipment_masks)
+        self.goal_masks = array("B", goal_masks)
+        self.contraindication_masks = array("B", contraindication_masks)
+        self.row_by_name: dict[str, int] = {name: row for row, name in enumerate(names)}
+        if len(self.row_by_name) != len(names):
+            raise ValueError("Exercise catalog contains duplicate names")
+
+        self.by_name_index = BitsetIndex(self, sorted(range(len(names)), key=names.__getitem__))
+        if pools is None:
+            derived: dict[str, list[int]] = {}
+            for row, row_muscles in enumerate(muscles):
+                for muscle in row_muscles:
+                    derived.setdefault(pool_key(muscle), []).append(row)
+            self.pools = {key: BitsetIndex(self, rows) for key, rows in derived.items()}
+        else:
+            self.pools = {
+                key: BitsetIndex(self, [self.row_by_name[n] for n in pool if n in self.row_by_name])
+                for key, pool in pools.items()
+            }
+        self._templates: list[ExerciseTemplate | None] = [None] * len(names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @classmethod
+    def from_templates(
+        cls,
+        templates: Sequence[ExerciseTemplate],
+        pools: dict[str, list[str]] | None = None,
+        blocked: dict[Injury, frozenset[str]] | None = None,
+    ) -> "ExerciseCatalog":
+        blocked = blocked or {}
+        return cls(
+            names=[t.name for t in templates],
+            muscles=[t.muscles for t in templates],
+            equipment_masks=[equipment_mask(t.equipment) for t in templates],
+            goal_masks=[_mask(t.goals, GOAL_BITS) for t in templates],
+            contraindication_masks=[
+                injury_mask(inj for inj, names in blocked.items() if t.name in names)
+                for t in templates
+            ],
+            pools=pools,
+        )
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[dict], pools: dict[str, list[str]] | None = None
+    ) -> "ExerciseCatalog":
+        """Build from dicts with `name`, `muscles`, `equipment` and optional `goals`
+        (default: all) and `contraindications` (injury values)."""
+        names, muscles, equipment, goals, contraindications = [], [], [], [], []
+        for line, record in enumerate(records, start=1):
+            try:
+                names.append(str(record["name"]).strip())
+                muscles.append(tuple(m.strip() for m in record["muscles"]))
+                equipment.append(equipment_mask(Equipment(e) for e in record["equipment"]))
+                goals.append(_mask((Goal(g) for g in record.get("goals") or Goal), GOAL_BITS))
+                contraindications.append(
+                    injury_mask(Injury(i) for i in record.get("contraindications") or ())
+                )
+            except (KeyError, ValueError) as exc:
+                raise ValueError(f"Invalid exercise catalog entry #{line}: {exc}") from exc
+        return cls(names, muscles, equipment, goals, contraindications, pools)
+
+    def template(self, row: int) -> ExerciseTemplate:
+        template = self._templates[row]
+        if template is None:
+            template = ExerciseTemplate(
+                name=self.names[row],
+                muscles=self.muscles[row],
+                equipment=_unpack(self.equipment_masks[row], EQUIPMENT_BITS),
+                goals=_unpack(self.goal_masks[row], GOAL_BITS),
+            )
+            self._templates[row] = template
+        return template
+
+    def contraindications(self, row: int) -> frozenset[Injury]:
+        return _unpack(self.contraindication_masks[row], INJURY_BITS)
+
+
+def _split_list(value: str | None) -> list[str]:
+    return [part.strip() for part in (value or "").split("|") if part.strip()]
+
+
+def load_catalog(path: str | Path) -> ExerciseCatalog:
+    """Load a catalog from JSON or CSV.
+
+    JSON: either a list of exercise objects or `{"exercises": [...], "pools": {...}}`
+    where `pools` maps a muscle key to an ordered list of exercise names.
+    CSV: header `name,muscles,equipment,goals,contraindications` with list cells
+    separated by `|`.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as handle:
+            records = [
+                {
+                    "name": row["name"],
+                    "muscles": _split_list(row.get("muscles")),
+                    "equipment": _split_list(row.get("equipment")),
+                    "goals": _split_list(row.get("goals")),
+                    "contraindications": _split_list(row.get("contraindications")),
+                }
+                for row in csv.DictReader(handle)
+            ]
+        return ExerciseCatalog.from_records(records)
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        return ExerciseCatalog.from_records(data.get("exercises", []), data.get("pools"))
+    return ExerciseCatalog.from_records(data)
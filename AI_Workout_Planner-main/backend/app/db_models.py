@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -25,6 +25,7 @@ class UserRow(Base):
 
 class SavedPlanRow(Base):
     __tablename__ = "saved_plans"
+    __table_args__ = (Index("ix_saved_plans_user_saved_at", "user_id", "saved_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
@@ -38,6 +39,7 @@ class SavedPlanRow(Base):
 
 class WorkoutLogRow(Base):
     __tablename__ = "workout_logs"
+    __table_args__ = (Index("ix_workout_logs_user_completed_at", "user_id", "completed_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), index=True)
@@ -1,15 +1,16 @@
-from dataclasses import dataclass
+import os
 
-from app.injuries import blocked_exercise_names
-from app.models import Equipment, Goal, Injury, Level
-
-
-@dataclass(frozen=True)
-class ExerciseTemplate:
-    name: str
-    muscles: tuple[str, ...]
-    equipment: frozenset[Equipment]
-    goals: frozenset[Goal]
+from app.catalog import (
+    EQUIPMENT_BITS,
+    GOAL_BITS,
+    ExerciseCatalog,
+    ExerciseTemplate,
+    equipment_mask,
+    injury_mask,
+    load_catalog,
+)
+from app.injuries import INJURY_BLOCKED_EXERCISES
+from app.models import Equipment, Goal, Injury
 
 
 EXERCISE_DB: list[ExerciseTemplate] = [
@@ -66,11 +67,30 @@ MUSCLE_POOLS: dict[str, list[str]] = {
 }
 
 
+EXERCISE_CATALOG_PATH = os.getenv("EXERCISE_CATALOG_PATH", "")
+
+
+def _default_catalog() -> ExerciseCatalog:
+    if EXERCISE_CATALOG_PATH:
+        return load_catalog(EXERCISE_CATALOG_PATH)
+    return ExerciseCatalog.from_templates(EXERCISE_DB, MUSCLE_POOLS, INJURY_BLOCKED_EXERCISES)
+
+
+# Built once at startup; swap with use_catalog() rather than reassigning.
+CATALOG: ExerciseCatalog = _default_catalog()
+
+
+def use_catalog(catalog: ExerciseCatalog) -> None:
+    global CATALOG
+    CATALOG = catalog
+    from app.plan_generator import clear_plan_cache
+
+    clear_plan_cache()
+
+
 def exercise_by_name(name: str) -> ExerciseTemplate | None:
-    for ex in EXERCISE_DB:
-        if ex.name == name:
-            return ex
-    return None
+    row = CATALOG.row_by_name.get(name)
+    return None if row is None else CATALOG.template(row)
 
 
 def available_for_user(
@@ -79,14 +99,14 @@ def available_for_user(
     goal: Goal,
     injuries: list[Injury] | None = None,
 ) -> bool:
-    if name in blocked_exercise_names(injuries or []):
+    row = CATALOG.row_by_name.get(name)
+    if row is None:
         return False
-    template = exercise_by_name(name)
-    if template is None:
+    if CATALOG.contraindication_masks[row] & injury_mask(injuries or []):
         return False
-    if goal not in template.goals:
+    if not CATALOG.goal_masks[row] & GOAL_BITS[goal]:
         return False
-    return bool(template.equipment & equipment)
+    return bool(CATALOG.equipment_masks[row] & equipment_mask(equipment))
 
 
 def pick_exercises(
@@ -96,13 +116,19 @@ def pick_exercises(
     count: int = 4,
     injuries: list[Injury] | None = None,
 ) -> list[str]:
+    catalog = CATALOG
+    equipment_bits = equipment_mask(equipment)
+    injury_bits = injury_mask(injuries or [])
     chosen: list[str] = []
     for muscle in muscle_keys:
-        for candidate in MUSCLE_POOLS.get(muscle, []):
-            if candidate in chosen:
+        pool = catalog.pools.get(muscle)
+        if pool is None:
+            continue
+        for row in pool.iter_rows(pool.select(equipment_bits, goal, injury_bits)):
+            name = catalog.names[row]
+            if name in chosen:
                 continue
-            if available_for_user(candidate, equipment, goal, injuries):
-                chosen.append(candidate)
+            chosen.append(name)
             if len(chosen) >= count:
                 return chosen
     return chosen
@@ -113,16 +139,30 @@ def list_available_exercises(
     goal: Goal,
     injuries: list[Injury] | None = None,
 ) -> list[ExerciseTemplate]:
-    equipment = set(equipment)
-    equipment.add(Equipment.BODYWEIGHT)
-    blocked = blocked_exercise_names(injuries or [])
-    return sorted(
-        [
-            ex
-            for ex in EXERCISE_DB
-            if ex.name not in blocked
-            and goal in ex.goals
-            and bool(ex.equipment & equipment)
-        ],
-        key=lambda ex: ex.name,
+    return page_available_exercises(equipment, goal, injuries)[1]
+
+
+def page_available_exercises(
+    equipment: set[Equipment],
+    goal: Goal,
+    injuries: list[Injury] | None = None,
+    muscle: str | None = None,
+    offset: int = 0,
+    limit: int | None = None,
+) -> tuple[int, list[ExerciseTemplate]]:
+    """Alphabetical page of matching exercises plus the total match count.
+    Bodyweight moves are always included."""
+    catalog = CATALOG
+    index = catalog.by_name_index
+    matches = index.select(
+        equipment_mask(equipment) | EQUIPMENT_BITS[Equipment.BODYWEIGHT],
+        goal,
+        injury_mask(injuries or []),
+        muscle,
     )
+    page: list[ExerciseTemplate] = []
+    for row in index.iter_rows(matches, skip=offset):
+        if limit is not None and len(page) >= limit:
+            break
+        page.append(catalog.template(row))
+    return matches.bit_count(), page
@@ -38,10 +38,3 @@ INJURY_BLOCKED_EXERCISES: dict[Injury, frozenset[str]] = {
         }
     ),
 }
-
-
-def blocked_exercise_names(injuries: list[Injury]) -> frozenset[str]:
-    blocked: set[str] = set()
-    for injury in injuries:
-        blocked.update(INJURY_BLOCKED_EXERCISES.get(injury, frozenset()))
-    return frozenset(blocked)
@@ -8,7 +8,9 @@ print("ENV FILE CHECK")
 print("GROQ =", os.getenv("GROQ_API_KEY"))
 print("PROVIDER =", os.getenv("AI_PROVIDER"))
 
-from openai import OpenAI
+from functools import lru_cache
+
+from openai import AsyncOpenAI, OpenAI
 
 GROQ_BASE_URL = "https://api.groq.com/openai/v1"
 DEFAULT_GROQ_MODEL = "llama-3.3-70b-versatile"
@@ -43,18 +45,37 @@ def get_model() -> str:
     return os.getenv("OPENAI_MODEL", DEFAULT_OPENAI_MODEL)
 
 
-def get_client() -> OpenAI:
+def _credentials() -> tuple[str, str | None]:
     provider = get_provider()
     if provider == "groq":
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
             raise RuntimeError("GROQ_API_KEY is not set")
-        return OpenAI(api_key=api_key, base_url=GROQ_BASE_URL)
+        return api_key, GROQ_BASE_URL
     if provider == "openai":
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is not set")
-        return OpenAI(api_key=api_key)
+        return api_key, None
     raise RuntimeError(
         "No AI provider configured. Set GROQ_API_KEY (recommended) or OPENAI_API_KEY."
     )
+
+
+# Clients hold a connection pool, so build one per (key, endpoint) and reuse it.
+@lru_cache(maxsize=4)
+def _sync_client(api_key: str, base_url: str | None) -> OpenAI:
+    return OpenAI(api_key=api_key, base_url=base_url)
+
+
+@lru_cache(maxsize=4)
+def _async_client(api_key: str, base_url: str | None) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+
+def get_client() -> OpenAI:
+    return _sync_client(*_credentials())
+
+
+def get_async_client() -> AsyncOpenAI:
+    return _async_client(*_credentials())
@@ -4,18 +4,18 @@ import os
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 
 from app.adaptive import adapt_plan
-from app.ai_generator import generate_plan_with_ai
+from app.ai_service import ai_plan_service
 import app.llm as llm
 from app.auth_utils import get_current_user
 from app.coach import chat_coach
 from app.database import get_db, init_db
 from app.db_models import UserRow
-from app.exercises import list_available_exercises
+from app.exercises import page_available_exercises
 from app.models import (
     AdaptPlanRequest,
     CoachRequest,
@@ -39,12 +39,15 @@ from app.user_data import (
     SavedPlanPayload,
     SavedPlanResponse,
     UserResponse,
+    WorkoutLogBulkPayload,
+    WorkoutLogBulkResponse,
     WorkoutLogPayload,
     WorkoutLogResponse,
     clear_workout_logs,
     create_saved_plan,
     create_workout_log,
     delete_saved_plan,
+    import_workout_logs,
     list_saved_plans,
     list_workout_logs,
     login_user,
@@ -73,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
 
@@ -86,27 +90,36 @@ def health() -> HealthResponse:
         ai_available=available,
         ai_provider=provider,
         ai_model=model,
+        ai_generation=ai_plan_service.stats(),
     )
 
 
 @app.get("/api/exercises", response_model=list[ExerciseOption])
 def get_exercises(
+    response: Response,
     goal: Goal,
     equipment: str,
     injuries: str = "",
+    muscle: str | None = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=1000),
 ) -> list[ExerciseOption]:
     items = equipment.split(",") if equipment else []
     equipment_set = {Equipment(e.strip()) for e in items if e.strip()}
     if not equipment_set:
         raise HTTPException(status_code=400, detail="At least one equipment type is required.")
     injury_list = [Injury(i.strip()) for i in injuries.split(",") if i.strip()]
+    total, page = page_available_exercises(
+        equipment_set, goal, injury_list, muscle=muscle, offset=offset, limit=limit
+    )
+    response.headers["X-Total-Count"] = str(total)
     return [
         ExerciseOption(
             name=ex.name,
             muscles=list(ex.muscles),
             equipment=[e.value for e in ex.equipment],
         )
-        for ex in list_available_exercises(equipment_set, goal, injury_list)
+        for ex in page
     ]
 
 
@@ -151,10 +164,19 @@ def auth_me(user: UserRow = Depends(get_current_user)) -> UserResponse:
 
 @app.get("/api/user/plans", response_model=list[SavedPlanResponse])
 def user_list_plans(
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=200),
+    cursor: str | None = None,
     user: UserRow = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> list[SavedPlanResponse]:
-    return list_saved_plans(db, user)
+    try:
+        plans, next_cursor = list_saved_plans(db, user, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return plans
 
 
 @app.post("/api/user/plans", response_model=SavedPlanResponse)
@@ -180,10 +202,19 @@ def user_delete_plan(
 
 @app.get("/api/user/history", response_model=list[WorkoutLogResponse])
 def user_list_history(
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = None,
     user: UserRow = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> list[WorkoutLogResponse]:
-    return list_workout_logs(db, user)
+    try:
+        logs, next_cursor = list_workout_logs(db, user, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return logs
 
 
 @app.post("/api/user/history", response_model=WorkoutLogResponse)
@@ -195,6 +226,15 @@ def user_log_workout(
     return create_workout_log(db, user, payload)
 
 
+@app.post("/api/user/history/bulk", response_model=WorkoutLogBulkResponse)
+def user_import_history(
+    payload: WorkoutLogBulkPayload,
+    user: UserRow = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> WorkoutLogBulkResponse:
+    return import_workout_logs(db, user, payload)
+
+
 @app.delete("/api/user/history", status_code=204)
 def user_clear_history(
     user: UserRow = Depends(get_current_user),
@@ -204,7 +244,7 @@ def user_clear_history(
 
 
 @app.post("/api/plan/generate", response_model=WorkoutPlan)
-def create_plan(request: GeneratePlanRequest) -> WorkoutPlan:
+async def create_plan(request: GeneratePlanRequest) -> WorkoutPlan:
     try:
         if request.use_ai:
             if not llm.ai_available():
@@ -212,7 +252,7 @@ def create_plan(request: GeneratePlanRequest) -> WorkoutPlan:
                     status_code=400,
                     detail="AI mode requested but no API key is set (GROQ_API_KEY or OPENAI_API_KEY).",
                 )
-            return generate_plan_with_ai(request)
+            return await ai_plan_service.generate(request)
         return generate_plan(request)
     except HTTPException:
         raise
@@ -71,11 +71,26 @@ class GeneratePlanRequest(UserProfile):
     pass
 
 
+class AIGenerationStats(BaseModel):
+    requests: int
+    cache_hits: int
+    cache_hit_rate: float
+    coalesced: int
+    model_calls: int
+    timeouts: int
+    errors: int
+    cached_plans: int
+    in_flight: int
+    latency_p50_ms: float | None = None
+    latency_p95_ms: float | None = None
+
+
 class HealthResponse(BaseModel):
     status: str
     ai_available: bool
     ai_provider: str | None = None
     ai_model: str | None = None
+    ai_generation: AIGenerationStats | None = None
 
 
 class ExerciseOption(BaseModel):
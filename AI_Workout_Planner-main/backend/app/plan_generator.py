@@ -1,5 +1,16 @@
+from functools import lru_cache
+
 from app.exercises import pick_exercises
-from app.models import Equipment, ExerciseDetail, Goal, Level, UserProfile, WorkoutDay, WorkoutPlan
+from app.models import (
+    Equipment,
+    ExerciseDetail,
+    Goal,
+    Injury,
+    Level,
+    UserProfile,
+    WorkoutDay,
+    WorkoutPlan,
+)
 from app.split_engine import get_split
 
 GOAL_LABELS = {
@@ -36,37 +47,72 @@ def _prescription(goal: Goal, level: Level) -> tuple[int, str, int, str]:
     return sets, reps, rest, rest_guidance
 
 
+ProfileKey = tuple[Goal, Level, int, frozenset[Equipment], frozenset[Injury]]
+
+
+def profile_key(profile: UserProfile) -> ProfileKey:
+    """Canonical cache key: the only profile fields a rules plan depends on."""
+    return (
+        profile.goal,
+        profile.level,
+        profile.days,
+        frozenset(profile.equipment) | {Equipment.BODYWEIGHT},
+        frozenset(profile.injuries),
+    )
+
+
 def generate_plan(profile: UserProfile) -> WorkoutPlan:
-    split_name, days = get_split(profile.days)
-    equipment = set(profile.equipment)
-    equipment.add(Equipment.BODYWEIGHT)
+    """Memoized rules plan. The returned plan is shared between callers: derive new
+    plans with `model_copy(update=...)` (as `adapt_plan` does), never mutate it."""
+    return _generate_plan_cached(profile_key(profile))
+
+
+@lru_cache(maxsize=4096)
+def _generate_plan_cached(key: ProfileKey) -> WorkoutPlan:
+    return build_plan(*key)
+
+
+def clear_plan_cache() -> None:
+    _generate_plan_cached.cache_clear()
+
+
+def build_plan(
+    goal: Goal,
+    level: Level,
+    days_per_week: int,
+    equipment: frozenset[Equipment],
+    injuries: frozenset[Injury],
+) -> WorkoutPlan:
+    split_name, days = get_split(days_per_week)
+    equipment_set = set(equipment)
+    injury_list = sorted(injuries)
 
-    sets, reps, rest_seconds, rest_guidance = _prescription(profile.goal, profile.level)
+    sets, reps, rest_seconds, rest_guidance = _prescription(goal, level)
     weekly: list[WorkoutDay] = []
 
     for index, day_split in enumerate(days, start=1):
-        exercise_count = 5 if profile.goal == Goal.FAT_LOSS else 4
+        exercise_count = 5 if goal == Goal.FAT_LOSS else 4
         names = pick_exercises(
             list(day_split.muscles),
-            equipment,
-            profile.goal,
+            equipment_set,
+            goal,
             count=exercise_count,
-            injuries=profile.injuries,
+            injuries=injury_list,
         )
         if len(names) < 3:
             names = pick_exercises(
                 ["full_body", "core", "cardio", "chest", "back"],
-                equipment,
-                profile.goal,
+                equipment_set,
+                goal,
                 count=exercise_count,
-                injuries=profile.injuries,
+                injuries=injury_list,
             )
 
         exercises = [
             ExerciseDetail(
                 name=name,
                 sets=sets,
-                reps="max reps" if name == "Push-ups" and profile.goal == Goal.MUSCLE_GAIN else reps,
+                reps="max reps" if name == "Push-ups" and goal == Goal.MUSCLE_GAIN else reps,
                 rest_seconds=rest_seconds,
             )
             for name in names
@@ -83,9 +129,9 @@ def generate_plan(profile: UserProfile) -> WorkoutPlan:
         )
 
     return WorkoutPlan(
-        goal=GOAL_LABELS[profile.goal],
-        days_per_week=profile.days,
-        level=profile.level.value,
+        goal=GOAL_LABELS[goal],
+        days_per_week=days_per_week,
+        level=level.value,
         split_type=split_name,
         weekly_plan=weekly,
         source="rules",
@@ -1,12 +1,17 @@
+import base64
 import json
-from datetime import datetime
+import uuid
+from datetime import datetime, timezone
 
 from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import insert, tuple_
 from sqlalchemy.orm import Session
 
 from app.auth_utils import create_access_token, hash_password, verify_password
 from app.db_models import SavedPlanRow, UserRow, WorkoutLogRow
 
+MAX_BULK_LOGS = 5000
+
 
 class RegisterRequest(BaseModel):
     email: EmailStr
@@ -49,6 +54,18 @@ class WorkoutLogPayload(BaseModel):
     plan_name: str | None = None
 
 
+class WorkoutLogImportItem(WorkoutLogPayload):
+    completed_at: datetime | None = None
+
+
+class WorkoutLogBulkPayload(BaseModel):
+    logs: list[WorkoutLogImportItem] = Field(min_length=1, max_length=MAX_BULK_LOGS)
+
+
+class WorkoutLogBulkResponse(BaseModel):
+    imported: int
+
+
 class WorkoutLogResponse(BaseModel):
     id: str
     completed_at: str
@@ -80,15 +97,42 @@ def login_user(db: Session, request: LoginRequest) -> AuthResponse:
     return AuthResponse(access_token=create_access_token(user.id), email=user.email)
 
 
-def list_saved_plans(db: Session, user: UserRow) -> list[SavedPlanResponse]:
-    rows = (
-        db.query(SavedPlanRow)
-        .filter(SavedPlanRow.user_id == user.id)
-        .order_by(SavedPlanRow.saved_at.desc())
-        .limit(20)
-        .all()
+def encode_cursor(timestamp: datetime, row_id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _keyset_page(query, timestamp_column, id_column, limit: int, cursor: str | None):
+    """Newest-first page after `cursor`; uses the (user_id, timestamp, id) index."""
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        # Row-value comparison so SQLite/Postgres seek straight into the index.
+        query = query.filter(tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id))
+    rows = query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
+
+
+def list_saved_plans(
+    db: Session, user: UserRow, limit: int = 20, cursor: str | None = None
+) -> tuple[list[SavedPlanResponse], str | None]:
+    rows, has_more = _keyset_page(
+        db.query(SavedPlanRow).filter(SavedPlanRow.user_id == user.id),
+        SavedPlanRow.saved_at,
+        SavedPlanRow.id,
+        limit,
+        cursor,
     )
-    return [_plan_to_response(row) for row in rows]
+    next_cursor = encode_cursor(rows[-1].saved_at, rows[-1].id) if has_more else None
+    return [_plan_to_response(row) for row in rows], next_cursor
 
 
 def create_saved_plan(
@@ -118,15 +162,18 @@ def delete_saved_plan(db: Session, user: UserRow, plan_id: str) -> None:
     db.commit()
 
 
-def list_workout_logs(db: Session, user: UserRow) -> list[WorkoutLogResponse]:
-    rows = (
-        db.query(WorkoutLogRow)
-        .filter(WorkoutLogRow.user_id == user.id)
-        .order_by(WorkoutLogRow.completed_at.desc())
-        .limit(100)
-        .all()
+def list_workout_logs(
+    db: Session, user: UserRow, limit: int = 100, cursor: str | None = None
+) -> tuple[list[WorkoutLogResponse], str | None]:
+    rows, has_more = _keyset_page(
+        db.query(WorkoutLogRow).filter(WorkoutLogRow.user_id == user.id),
+        WorkoutLogRow.completed_at,
+        WorkoutLogRow.id,
+        limit,
+        cursor,
     )
-    return [_log_to_response(row) for row in rows]
+    next_cursor = encode_cursor(rows[-1].completed_at, rows[-1].id) if has_more else None
+    return [_log_to_response(row) for row in rows], next_cursor
 
 
 def create_workout_log(
@@ -144,6 +191,33 @@ def create_workout_log(
     return _log_to_response(row)
 
 
+def import_workout_logs(
+    db: Session, user: UserRow, payload: WorkoutLogBulkPayload
+) -> WorkoutLogBulkResponse:
+    """Insert many logs in one executemany + one commit."""
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user.id,
+            "day": item.day,
+            "day_label": item.day_label,
+            "plan_name": item.plan_name,
+            "completed_at": _as_naive_utc(item.completed_at) if item.completed_at else now,
+        }
+        for item in payload.logs
+    ]
+    db.execute(insert(WorkoutLogRow), rows)
+    db.commit()
+    return WorkoutLogBulkResponse(imported=len(rows))
+
+
+def _as_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 def clear_workout_logs(db: Session, user: UserRow) -> None:
     db.query(WorkoutLogRow).filter(WorkoutLogRow.user_id == user.id).delete()
     db.commit()
@@ -0,0 +1,112 @@
+"""Catalog filtering latency at scale (target: sub-millisecond at 10k exercises).
+
+Generates a synthetic catalog, round-trips it through the JSON loader, swaps it
+in with `use_catalog`, then times the bitset filters behind `/api/exercises`
+and the rules planner.
+
+Run from backend/:
+
+    python -m benchmarks.bench_catalog
+    python -m benchmarks.bench_catalog --size 50000
+"""
+
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from app.catalog import load_catalog
+from app.exercises import MUSCLE_POOLS, page_available_exercises, pick_exercises, use_catalog
+from app.models import Equipment, Goal, Injury
+from app.split_engine import SPLIT_STRATEGIES
+
+MUSCLES = [key.replace("_", " ") for key in MUSCLE_POOLS]
+
+
+def synthetic_records(size: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "name": f"Exercise {i:05d}",
+            "muscles": rng.sample(MUSCLES, rng.randint(1, 3)),
+            "equipment": [e.value for e in rng.sample(list(Equipment), rng.randint(1, 3))],
+            "goals": [g.value for g in rng.sample(list(Goal), rng.randint(1, 4))],
+            "contraindications": [i.value for i in rng.sample(list(Injury), rng.randint(0, 2))],
+        }
+        for i in range(size)
+    ]
+
+
+def _timed(fn, runs: int) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> float:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<34} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms   mean {statistics.mean(samples):7.3f} ms")
+    return p50
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "catalog.json"
+        path.write_text(json.dumps({"exercises": synthetic_records(args.size, args.seed)}))
+        start = time.perf_counter()
+        catalog = load_catalog(path)
+        print(f"loaded {len(catalog):,} exercises in {(time.perf_counter() - start) * 1000:,.0f} ms\n")
+    use_catalog(catalog)
+
+    rng = random.Random(args.seed)
+    profiles = [
+        (
+            set(rng.sample(list(Equipment), rng.randint(1, 3))),
+            rng.choice(list(Goal)),
+            rng.sample(list(Injury), rng.randint(0, 2)),
+        )
+        for _ in range(args.runs)
+    ]
+    cycle = iter(profiles * 2)
+
+    def first_page():
+        equipment, goal, injuries = next(cycle)
+        page_available_exercises(equipment, goal, injuries, limit=50)
+
+    def muscle_page():
+        equipment, goal, injuries = next(cycle)
+        page_available_exercises(equipment, goal, injuries, muscle="back", offset=100, limit=50)
+
+    days = SPLIT_STRATEGIES[6][1]
+
+    def pick_week():
+        equipment, goal, injuries = next(cycle)
+        for day in days:
+            pick_exercises(list(day.muscles), equipment, goal, count=5, injuries=injuries)
+
+    results = [
+        _report("first page (50)", _timed(first_page, args.runs // 2)),
+        _report("muscle=back, offset 100", _timed(muscle_page, args.runs // 2)),
+    ]
+    cycle = iter(profiles)
+    _report("pick_exercises x 6 days", _timed(pick_week, args.runs))
+    verdict = "OK" if max(results) < 1.0 else "SLOWER THAN 1 ms"
+    print(f"\n/api/exercises filtering at {len(catalog):,} exercises: {verdict}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Workout history at scale: bulk import and keyset pagination over 1M logs.
+
+Builds a throwaway SQLite database with the production engine settings (WAL,
+pragmas, composite indexes), then measures:
+
+  * import rate: one commit per log (old POST /api/user/history loop) vs. the
+    bulk endpoint's executemany in batches of MAX_BULK_LOGS
+  * page latency: keyset cursor vs. OFFSET at increasing depth
+
+Run from backend/:
+
+    python -m benchmarks.bench_history
+    python -m benchmarks.bench_history --logs 200000 --users 20
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from app.database import build_engine, init_db
+from app.db_models import UserRow, WorkoutLogRow
+from app.user_data import (
+    MAX_BULK_LOGS,
+    WorkoutLogBulkPayload,
+    WorkoutLogImportItem,
+    WorkoutLogPayload,
+    _log_to_response,
+    create_workout_log,
+    import_workout_logs,
+    list_workout_logs,
+)
+
+
+def _items(count: int, start: datetime, rng: random.Random) -> list[WorkoutLogImportItem]:
+    return [
+        WorkoutLogImportItem(
+            day=rng.randint(1, 6),
+            day_label="Day",
+            plan_name="Benchmark plan",
+            completed_at=start + timedelta(minutes=rng.randint(0, 5_000_000)),
+        )
+        for _ in range(count)
+    ]
+
+
+def _ms(fn, repeat: int = 20) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logs", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    start = datetime(2020, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        init_db(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        with Session() as db:
+            users = [UserRow(email=f"user{i}@bench.local", hashed_password="x") for i in range(args.users)]
+            db.add_all(users)
+            db.commit()
+            user_ids = [u.id for u in users]
+
+        # --- import rate -------------------------------------------------
+        sample = 2_000
+        with Session() as db:
+            user = db.get(UserRow, user_ids[0])
+            t0 = time.perf_counter()
+            for _ in range(sample):
+                create_workout_log(db, user, WorkoutLogPayload(day=1, day_label="Day"))
+            single_rate = sample / (time.perf_counter() - t0)
+
+        per_user = args.logs // args.users
+        t0 = time.perf_counter()
+        inserted = 0
+        with Session() as db:
+            for user_id in user_ids:
+                user = db.get(UserRow, user_id)
+                remaining = per_user
+                while remaining:
+                    batch = min(remaining, MAX_BULK_LOGS)
+                    payload = WorkoutLogBulkPayload(logs=_items(batch, start, rng))
+                    inserted += import_workout_logs(db, user, payload).imported
+                    remaining -= batch
+        bulk_elapsed = time.perf_counter() - t0
+
+        print(f"{inserted + sample:,} workout logs across {args.users} users\n")
+        print("import")
+        print(f"  one commit per log      {single_rate:>12,.0f} logs/s")
+        print(f"  bulk ({MAX_BULK_LOGS}/request)     {inserted / bulk_elapsed:>12,.0f} logs/s  ({bulk_elapsed:,.1f} s total)")
+
+        # --- pagination ----------------------------------------------------
+        with Session() as db:
+            user = db.get(UserRow, user_ids[-1])
+            total = db.query(WorkoutLogRow).filter(WorkoutLogRow.user_id == user.id).count()
+
+            cursors = [None]
+            for _ in range(max(1, total // args.page - 1)):
+                _, next_cursor = list_workout_logs(db, user, limit=args.page, cursor=cursors[-1])
+                if next_cursor is None:
+                    break
+                cursors.append(next_cursor)
+
+            print(f"\npage of {args.page} for a user with {total:,} logs (median ms)")
+            print(f"  {'depth':>8} {'keyset':>10} {'offset':>10}")
+            for depth in sorted({0, len(cursors) // 4, len(cursors) // 2, len(cursors) - 1}):
+                keyset = _ms(lambda: list_workout_logs(db, user, limit=args.page, cursor=cursors[depth]))
+                offset = _ms(
+                    lambda: [
+                        _log_to_response(row)
+                        for row in db.query(WorkoutLogRow)
+                        .filter(WorkoutLogRow.user_id == user.id)
+                        .order_by(WorkoutLogRow.completed_at.desc(), WorkoutLogRow.id.desc())
+                        .offset(depth * args.page)
+                        .limit(args.page)
+                        .all()
+                    ]
+                )
+                print(f"  {depth * args.page:>8,} {keyset:>10.2f} {offset:>10.2f}")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Rules plan generation throughput: linear scan vs. startup index vs. memoized.
+
+Run from backend/:
+
+    python -m benchmarks.bench_plans
+    python -m benchmarks.bench_plans --requests 50000
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from app.exercises import EXERCISE_DB, MUSCLE_POOLS
+from app.injuries import INJURY_BLOCKED_EXERCISES
+from app.models import Equipment, Goal, Injury, Level, UserProfile
+from app import plan_generator
+from app.plan_generator import build_plan, generate_plan, profile_key
+
+
+def _legacy_pick(muscle_keys, equipment, goal, count=4, injuries=None):
+    """The pre-index algorithm: catalog scan + blocked-set rebuild per candidate."""
+    chosen: list[str] = []
+    for muscle in muscle_keys:
+        for candidate in MUSCLE_POOLS.get(muscle, []):
+            if candidate in chosen:
+                continue
+            blocked: set[str] = set()
+            for injury in injuries or []:
+                blocked.update(INJURY_BLOCKED_EXERCISES.get(injury, frozenset()))
+            template = next((ex for ex in EXERCISE_DB if ex.name == candidate), None)
+            if (
+                candidate not in blocked
+                and template is not None
+                and goal in template.goals
+                and template.equipment & equipment
+            ):
+                chosen.append(candidate)
+            if len(chosen) >= count:
+                return chosen
+    return chosen
+
+
+def _legacy_plan(profile: UserProfile) -> None:
+    original = plan_generator.pick_exercises
+    plan_generator.pick_exercises = _legacy_pick
+    try:
+        build_plan(*profile_key(profile))
+    finally:
+        plan_generator.pick_exercises = original
+
+
+def _profiles(n: int, seed: int) -> list[UserProfile]:
+    rng = random.Random(seed)
+    equipment_sets = [
+        list(combo)
+        for r in (1, 2, 3)
+        for combo in itertools.combinations(list(Equipment), r)
+    ]
+    injury_sets = [[], [Injury.KNEE], [Injury.SHOULDER, Injury.WRIST], [Injury.LOWER_BACK]]
+    return [
+        UserProfile(
+            goal=rng.choice(list(Goal)),
+            level=rng.choice(list(Level)),
+            days=rng.randint(3, 6),
+            equipment=rng.choice(equipment_sets),
+            injuries=rng.choice(injury_sets),
+        )
+        for _ in range(n)
+    ]
+
+
+def _rate(label: str, fn, profiles: list[UserProfile]) -> float:
+    start = time.perf_counter()
+    for profile in profiles:
+        fn(profile)
+    elapsed = time.perf_counter() - start
+    rate = len(profiles) / elapsed
+    print(f"{label:<34} {rate:>12,.0f} plans/s  ({elapsed * 1000:,.1f} ms)")
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    profiles = _profiles(args.requests, args.seed)
+    distinct = len({profile_key(p) for p in profiles})
+    print(f"{args.requests:,} requests over {distinct:,} distinct profiles\n")
+
+    before = _rate("before: linear scan, no cache", _legacy_plan, profiles)
+    _rate("indexed, uncached", lambda p: build_plan(*profile_key(p)), profiles)
+    after = _rate("indexed + memoized", generate_plan, profiles)
+    print(f"\nspeed-up vs. before: {after / before:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
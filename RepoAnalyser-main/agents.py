@@ -3,13 +3,25 @@ from crewai import Agent, Task, Crew, Process
 from crewai import LLM
 
 
-def build_crew(formatted_files: str, file_structure: dict, model: str | None = None, temperature: float | None = None) -> Crew:
+def build_crew(
+    formatted_files: str,
+    file_structure: dict,
+    model: str | None = None,
+    temperature: float | None = None,
+    repo_facts: str = "",
+) -> Crew:
     """Build a crew using an optionally overridden model and temperature.
 
     Parameters:
     - model: if provided, use this LLM model string; otherwise use GROQ_MODEL env var.
     - temperature: override GROQ_TEMPERATURE if provided.
+    - formatted_files: map-stage summaries from analysis_planner, most important first.
+    - repo_facts: exact metrics and import graph from static_analysis, shared with the triage and architecture tasks.
     """
+    facts_block = (
+        "Static analysis facts (computed locally; exact unless marked approximate, do not re-estimate):\n"
+        f"{repo_facts}\n\n"
+    ) if repo_facts else ""
     groq_llm = LLM(
         model=model or os.environ.get("GROQ_MODEL", "groq/llama-3.3-70b-versatile"),
         temperature=(temperature if temperature is not None else float(os.environ.get("GROQ_TEMPERATURE", "0.3"))),
@@ -70,21 +82,25 @@ def build_crew(formatted_files: str, file_structure: dict, model: str | None = N
             f"- Which can be ignored (tests, configs, assets)\n"
             f"- What type of project this appears to be\n\n"
             f"File structure:\n{file_structure}\n\n"
+            f"{facts_block}"
             f"Provide a short triage report: project type, core files list, files to skip."
         ),
         expected_output="A triage report: project type, list of core files, list of files to skip.",
         agent=repo_manager,
     )
 
+    code_description = (
+        "You are the Code Analyst. The files below were already summarised in batches, most important first.\n"
+        "Consolidate them into one per-file breakdown of the important files:\n"
+        "- What it does\n"
+        "- Key functions, classes, or exports\n"
+        "- Its role in the project\n"
+        "Only describe files that appear below.\n\n"
+        f"{formatted_files}"
+    )
+
     code_task = Task(
-        description=(
-            "You are the Code Analyst. Analyze the following codebase files.\n"
-            "For each important file:\n"
-            "- What it does\n"
-            "- Key functions, classes, or exports\n"
-            "- Its role in the project\n\n"
-            f"{formatted_files}"
-        ),
+        description=code_description,
         expected_output=(
             "A structured per-file breakdown: purpose, key components, role in project."
         ),
@@ -123,6 +139,9 @@ def build_crew(formatted_files: str, file_structure: dict, model: str | None = N
             "test coverage status (none/partial/good), API surface area (number of endpoints/functions), "
             "and overall code quality score (1-10) with justification.\n\n"
             "Be specific, technical, and thorough. Use bullet points, sub-bullets, and numbered lists."
+            ) + (
+                f"\n\nBase the Key Modules, Dependencies and Technical Metrics sections on these facts.\n{facts_block}"
+                if facts_block else ""
             ) + (
                 "\n\nAt the end of your report, append a machine-readable JSON block between the markers\n"
                 "---METADATA-START--- and ---METADATA-END---. The JSON should include keys: 'file_count', 'metrics',\n"
@@ -0,0 +1,201 @@
+"""Token-budgeted map-reduce planning for large repositories.
+
+Instead of pasting every file into every crew task, files are
+
+1. ranked by importance (import-graph centrality + entry points, using the
+   imports found by static_analysis),
+2. packed in rank order into batches that fit ANALYSIS_BATCH_TOKENS, stopping
+   once ANALYSIS_MAX_TOKENS of source has been planned,
+3. summarised batch by batch, several at a time (map), and
+4. the per-file summaries, not the source, are handed to the crew (reduce).
+
+Files that already have a cached summary (see repo_cache) skip the map stage.
+"""
+import os
+import posixpath
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+
+from static_analysis import import_graph
+
+ANALYSIS_BATCH_TOKENS = int(os.environ.get("ANALYSIS_BATCH_TOKENS", "6000"))
+ANALYSIS_MAX_TOKENS = int(os.environ.get("ANALYSIS_MAX_TOKENS", "60000"))
+ANALYSIS_REDUCE_TOKENS = int(os.environ.get("ANALYSIS_REDUCE_TOKENS", "8000"))
+ANALYSIS_MAP_CONCURRENCY = int(os.environ.get("ANALYSIS_MAP_CONCURRENCY", "4"))
+
+ENTRY_POINT_STEMS = {"main", "app", "__main__", "manage", "server", "index", "cli", "wsgi", "asgi", "run"}
+LOW_SIGNAL_EXTENSIONS = (".json", ".yml", ".yaml", ".md")
+CHARS_PER_TOKEN = 4
+
+MAP_PROMPT = (
+    "You are the Code Analyst. Summarise each file below for a colleague who will not see the source.\n"
+    "For every file, start with a heading line `### File: <path>` and then give, in at most 120 words:\n"
+    "- What it does\n"
+    "- Key functions, classes, or exports (with signatures where useful)\n"
+    "- Its role in the project and which other files it depends on\n\n"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _pagerank(graph: dict[str, set[str]], damping: float = 0.85, iterations: int = 20) -> dict[str, float]:
+    nodes = list(graph)
+    if not nodes:
+        return {}
+    n = len(nodes)
+    rank = dict.fromkeys(nodes, 1.0 / n)
+    for _ in range(iterations):
+        dangling = sum(rank[node] for node in nodes if not graph[node])
+        nxt = dict.fromkeys(nodes, (1 - damping) / n + damping * dangling / n)
+        for node in nodes:
+            targets = graph[node]
+            if targets:
+                share = damping * rank[node] / len(targets)
+                for target in targets:
+                    nxt[target] += share
+        rank = nxt
+    return rank
+
+
+def rank_files(files: list[dict], graph: dict[str, set[str]] | None = None) -> list[dict]:
+    """Files sorted most-important first; each gains a `rank_score`."""
+    graph = import_graph(files) if graph is None else graph
+    centrality = _pagerank(graph)
+    n = max(len(files), 1)
+    ranked = []
+    for f in files:
+        path = f["file"].replace("\\", "/")
+        stem = posixpath.splitext(posixpath.basename(path))[0].lower()
+        score = centrality.get(path, 0.0) * n
+        if stem in ENTRY_POINT_STEMS:
+            score += 1.0
+        if path.lower() == "readme.md":
+            score += 1.5
+        elif path.endswith(LOW_SIGNAL_EXTENSIONS):
+            score *= 0.5
+        if re.search(r"(^|/)(tests?|spec|__tests__)/|(^|/)test_|_test\.|\.spec\.|\.test\.", path):
+            score *= 0.3
+        ranked.append({**f, "rank_score": round(score, 4)})
+    ranked.sort(key=lambda f: (-f["rank_score"], f["file"]))
+    return ranked
+
+
+def format_file(f: dict) -> str:
+    facts = f.get("facts")
+    header = ""
+    if facts and facts.get("functions") is not None and facts["language"] not in ("markdown", "json", "yaml", "other"):
+        header = (
+            f"({facts['language']}, {facts['loc']} LOC, {facts['functions']} functions, "
+            f"cyclomatic complexity {facts['complexity']})\n"
+        )
+    return f"### File: {f['file']}\n{header}```\n{f['content']}\n```"
+
+
+def pack_batches(
+    ranked: list[dict], batch_tokens: int = ANALYSIS_BATCH_TOKENS, max_tokens: int = ANALYSIS_MAX_TOKENS
+) -> tuple[list[list[dict]], list[dict]]:
+    """Greedy first-fit in rank order. Returns (batches, files left out by the total budget)."""
+    batches: list[list[dict]] = []
+    sizes: list[int] = []
+    skipped = []
+    total = 0
+    for f in ranked:
+        cost = estimate_tokens(format_file(f))
+        if total + cost > max_tokens:
+            skipped.append(f)
+            continue
+        total += cost
+        for i, size in enumerate(sizes):
+            if size + cost <= batch_tokens:
+                batches[i].append(f)
+                sizes[i] += cost
+                break
+        else:
+            batches.append([f])
+            sizes.append(cost)
+    return batches, skipped
+
+
+def summarize_batches(
+    batches: list[list[dict]],
+    complete: Callable[[str], tuple[str, dict]],
+    concurrency: int = ANALYSIS_MAP_CONCURRENCY,
+    on_batch: Callable[[int, int], None] | None = None,
+) -> tuple[list[str], dict]:
+    """Map stage: run `complete(prompt) -> (text, usage)` per batch, `concurrency` at a time.
+
+    Returns batch outputs in batch order and summed token usage.
+    """
+    outputs = [""] * len(batches)
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "requests": 0}
+    if not batches:
+        return outputs, usage
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="map") as pool:
+        futures = {
+            pool.submit(complete, MAP_PROMPT + "\n\n".join(format_file(f) for f in batch)): i
+            for i, batch in enumerate(batches)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            text, batch_usage = future.result()
+            outputs[futures[future]] = text
+            usage["prompt_tokens"] += batch_usage.get("prompt_tokens", 0)
+            usage["completion_tokens"] += batch_usage.get("completion_tokens", 0)
+            usage["requests"] += 1
+            if on_batch:
+                on_batch(done, len(batches))
+    return outputs, usage
+
+
+def reduce_input(
+    ranked: list[dict],
+    batches: list[list[dict]],
+    batch_outputs: list[str],
+    skipped: list[dict],
+    budget: int = ANALYSIS_REDUCE_TOKENS,
+) -> str:
+    """Text handed to the crew: cached summaries and batch outputs, most important first, within `budget`."""
+    position = {f["file"]: i for i, f in enumerate(ranked)}
+    parts = [(position[f["file"]], f"### File: {f['file']}\n{f['summary']}") for f in ranked if f.get("summary")]
+    parts += [
+        (min(position[f["file"]] for f in batch), text.strip())
+        for batch, text in zip(batches, batch_outputs) if batch and text.strip()
+    ]
+    parts.sort(key=lambda part: part[0])
+
+    kept, used = [], 0
+    for _, part in parts:
+        cost = estimate_tokens(part)
+        if used + cost > budget:
+            break
+        kept.append(part)
+        used += cost
+    dropped = len(parts) - len(kept)
+    if skipped or dropped:
+        names = ", ".join(f["file"] for f in skipped[:40])
+        kept.append(
+            f"(Not summarised to stay within the token budget: {len(skipped)} lower-ranked file(s)"
+            + (f", e.g. {names}" if names else "")
+            + (f"; {dropped} summary block(s) omitted" if dropped else "")
+            + ".)"
+        )
+    return "\n\n".join(kept)
+
+
+class StageTimer:
+    """Collects wall time and token usage per stage for the report metadata."""
+
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self._started: dict[str, float] = {}
+
+    def start(self, name: str):
+        self._started[name] = time.perf_counter()
+
+    def stop(self, name: str, **details) -> dict:
+        elapsed = time.perf_counter() - self._started.pop(name, time.perf_counter())
+        self.stages[name] = {"seconds": round(elapsed, 2), **details}
+        return self.stages[name]
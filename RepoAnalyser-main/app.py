@@ -1,7 +1,5 @@
 import os
 import json
-import queue
-import threading
 import re
 import time
 import random
@@ -37,14 +35,18 @@ except Exception:
 from flask import Flask, request, jsonify, Response, render_template, stream_with_context
 from flask_cors import CORS
 
-from repo_utils import clone_repo, get_files, format_files_for_prompt, get_repo_structure
+from repo_utils import ingest_repo, extract_file_summaries, get_repo_structure
+from repo_cache import get_blob_store
+from static_analysis import analyze_files, format_facts, metrics_report, repo_metrics, resolve_imports
+from analysis_planner import StageTimer, pack_batches, rank_files, reduce_input, summarize_batches
 from agents import build_crew
+from job_queue import JobQueue
 
 app = Flask(__name__)
 CORS(app)
 
 REPO_CLONE_PATH = "repo"
-progress_queues: dict[str, queue.Queue] = {}
+MAX_JOBS_LIMIT = 500
 
 
 try:
@@ -53,7 +55,7 @@ except Exception:
     LitellmRateLimitError = None
 
 
-def _send(q: queue.Queue, event: str, data: dict):
+def _send(q, event: str, data: dict):
     q.put({"event": event, "data": data})
 
 
@@ -105,17 +107,9 @@ def _parse_repo_url(repo_url: str) -> tuple[str, str, str, str]:
     return owner, name, display, source
 
 
-def _infer_primary_stack(files: list[dict], repo_path: str) -> str:
+def _infer_primary_stack(files: list[dict], manifests: dict[str, str]) -> str:
     extensions = {os.path.splitext(f["file"])[1].lower() for f in files}
-    content = ""
-    for candidate in ["requirements.txt", "pyproject.toml", "Pipfile"]:
-        candidate_path = os.path.join(repo_path, candidate)
-        if os.path.exists(candidate_path):
-            try:
-                with open(candidate_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content += f.read().lower()
-            except Exception:
-                pass
+    content = "".join(manifests.get(candidate, "").lower() for candidate in ["requirements.txt", "pyproject.toml", "Pipfile"])
     if ".py" in extensions:
         if "flask" in content:
             return "Python · Flask"
@@ -167,10 +161,11 @@ def _markdown_to_html(text: str) -> str:
     return "\n".join(html_parts)
 
 
-def _kickoff_with_retry(crew_factory, q, retries: int = 3) -> object:
-    """Attempt to kickoff a crew (built via crew_factory) with retries and model fallbacks.
+def _with_model_fallbacks(call, q, retries: int = 3, step: int = 6, announce: bool = True):
+    """Run call(model, temperature) with rate-limit retries and model fallbacks.
 
-    crew_factory: callable(model: str|None, temperature: float|None) -> Crew
+    call: callable(model: str, temperature: float) -> result
+    announce: send a progress event for every attempt (off for the many small map-stage calls)
     """
     # Build list of candidate models to try (initial + fallbacks)
     initial = os.environ.get("GROQ_MODEL", "groq/llama-3.3-70b-versatile")
@@ -183,15 +178,15 @@ def _kickoff_with_retry(crew_factory, q, retries: int = 3) -> object:
 
     temp_override = float(os.environ.get("GROQ_TEMPERATURE", "0.3"))
     for model in candidates:
-        crew = crew_factory(model, temp_override)
         for attempt in range(1, env_max_attempts + 1):
             try:
-                _send(q, "progress", {"step": 6, "message": f"Using model {model} (attempt {attempt}/{env_max_attempts})"})
-                return crew.kickoff(), crew
+                if announce:
+                    _send(q, "progress", {"step": step, "message": f"Using model {model} (attempt {attempt}/{env_max_attempts})"})
+                return call(model, temp_override)
             except Exception as exc:
                 # If the model is not available on the account, skip immediately to next candidate
                 if _is_model_not_found_error(exc):
-                    _send(q, "progress", {"step": 6, "message": f"⚠️ Model {model} not available or inaccessible. Switching to next fallback."})
+                    _send(q, "progress", {"step": step, "message": f"⚠️ Model {model} not available or inaccessible. Switching to next fallback."})
                     break
 
                 # If we detected a server-suggested retry time, prefer it (plus small buffer)
@@ -207,7 +202,7 @@ def _kickoff_with_retry(crew_factory, q, retries: int = 3) -> object:
 
                     wait = max(0.5, min(wait, max_delay))
                     _send(q, "progress", {
-                        "step": 6,
+                        "step": step,
                         "message": f"⏳ Rate limit on model {model}, retrying in {int(wait)}s (attempt {attempt}/{env_max_attempts})...",
                     })
                     time.sleep(wait)
@@ -215,70 +210,94 @@ def _kickoff_with_retry(crew_factory, q, retries: int = 3) -> object:
 
                 # If it's a rate limit and we've exhausted attempts for this model, break to try next model
                 if _is_rate_limit_error(exc):
-                    _send(q, "progress", {"step": 6, "message": f"⚠️ Switching to fallback model after rate limits on {model}."})
+                    _send(q, "progress", {"step": step, "message": f"⚠️ Switching to fallback model after rate limits on {model}."})
                     break
                 raise
     # If all candidates exhausted, raise final error
     raise RuntimeError("All model candidates exhausted due to rate limits or errors.")
 
 
-def _local_fallback_summary(formatted_files: str, structure: dict) -> str:
-    """Produce a minimal text summary from the collected files when LLMs are unavailable.
+def _kickoff_with_retry(crew_factory, q, retries: int = 3) -> object:
+    """Attempt to kickoff a crew (built via crew_factory) with retries and model fallbacks.
 
-    This returns a markdown-like string suitable for saving as report.md and basic parsing.
+    crew_factory: callable(model: str|None, temperature: float|None) -> Crew
     """
-    lines = []
-    total_files = 0
-    for block in re.split(r"\n\n#+ File:", formatted_files):
-        if not block.strip():
-            continue
-        total_files += 1
-        # try to extract filename
-        m = re.search(r"^\s*([^\n]+)\n```\n([\s\S]{0,600})```", block, re.MULTILINE)
-        if m:
-            fname = m.group(1).strip()
-            snippet = m.group(2).strip().split('\n')[:6]
-            snippet = ' '.join([s.strip() for s in snippet])[:300]
-        else:
-            # fallback: first line as name
-            parts = block.strip().split('\n')
-            fname = parts[0][:160]
-            snippet = ' '.join(parts[1:4])[:300]
-        lines.append(f"### File: {fname}\n\n{snippet}\n")
-
-    header = (
-        "## 📌 What the Project Does\n\n"
-        "This is a local fallback summary generated because remote LLMs were unavailable. "
-        f"The analysis read approximately {total_files} file(s) and produced concise snippets.\n\n"
-    )
-    modules = "## ⚙️ Key Modules Breakdown\n\n" + "\n".join(lines[:50])
-    recommendations = (
-        "## 🚀 Recommendations\n\n"
-        "- Add an API key for an LLM provider or increase quota to enable full analysis.\n"
-        "- Add unit tests for critical modules.\n"
-        "- Add basic README and runbook if missing.\n"
-    )
-    return header + modules + "\n" + recommendations
+    def kickoff(model: str, temperature: float):
+        crew = crew_factory(model, temperature)
+        return crew.kickoff(), crew
+
+    return _with_model_fallbacks(kickoff, q, retries)
+
+
+def _summarize_batch(prompt: str, q) -> tuple[str, dict]:
+    """One map-stage completion; returns (text, token usage)."""
+    import litellm
+
+    def complete(model: str, temperature: float):
+        response = litellm.completion(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            api_key=os.environ.get("GROQ_API_KEY"),
+        )
+        usage = getattr(response, "usage", None)
+        return response.choices[0].message.content or "", {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+    return _with_model_fallbacks(complete, q, step=4, announce=False)
+
+
+def _crew_usage(crew) -> dict:
+    metrics = getattr(crew, "usage_metrics", None)
+    if metrics is None:
+        return {}
+    if not isinstance(metrics, dict):
+        metrics = metrics.model_dump() if hasattr(metrics, "model_dump") else vars(metrics)
+    return {
+        "prompt_tokens": metrics.get("prompt_tokens", 0),
+        "completion_tokens": metrics.get("completion_tokens", 0),
+        "requests": metrics.get("successful_requests", 0),
+    }
 
 
-def run_analysis(job_id: str, repo_url: str):
-    q = progress_queues[job_id]
+def _format_stages(stages: dict) -> str:
+    parts = []
+    for name, info in stages.items():
+        tokens = info.get("prompt_tokens", 0) + info.get("completion_tokens", 0)
+        parts.append(f"{name} {info['seconds']}s" + (f" ({tokens:,} tok)" if tokens else ""))
+    return " · ".join(parts)
+
+
+def run_analysis(job_id: str, repo_url: str, q):
+    timer = StageTimer()
 
     try:
         _send(q, "progress", {"step": 1, "message": "📥 Cloning repository..."})
         clone_path = os.path.join("jobs", job_id, "repo")
-        repo_path, method = clone_repo(repo_url, clone_path)
-        _send(q, "progress", {"step": 1, "message": f"✅ Repository fetched via {method}"})
+        timer.start("ingest")
+        snapshot = ingest_repo(repo_url, clone_path)
+        stats = snapshot["stats"]
+        timer.stop("ingest", files=stats["files"], cached_files=stats["cached"])
+        revision = (snapshot["revision"] or "")[:12]
+        _send(q, "progress", {
+            "step": 1,
+            "message": f"✅ Repository fetched via {snapshot['method']}"
+                       + (f" @ {revision}" if revision else "")
+                       + ("" if stats["fetched"] else " (no new commits)"),
+        })
 
         _send(q, "progress", {"step": 2, "message": "📂 Reading and parsing code files..."})
-        files = get_files(repo_path)
+        files = snapshot["files"]
         if not files:
             _send(q, "error", {"message": "No supported code files found in the repository."})
             return
         structure = get_repo_structure(files)
         _send(q, "progress", {
             "step": 2,
-            "message": f"✅ Found {len(files)} file(s) across {len(structure)} folder(s)",
+            "message": f"✅ Found {len(files)} file(s) across {len(structure)} folder(s)"
+                       f" ({stats['cached']} unchanged and served from cache)",
             "file_count": len(files),
             "structure": structure,
         })
@@ -289,7 +308,8 @@ def run_analysis(job_id: str, repo_url: str):
             "repo_display": repo_display,
             "repo_source": repo_source,
             "repo_url": repo_url,
-            "primary_stack": _infer_primary_stack(files, repo_path),
+            "revision": snapshot["revision"],
+            "primary_stack": _infer_primary_stack(files, snapshot["manifests"]),
             "file_count": len(files),
             "structure": structure,
             "folder_count": len(structure),
@@ -298,12 +318,22 @@ def run_analysis(job_id: str, repo_url: str):
             "badges": ["Repository analysis", "Architecture", "Metrics"],
         }
 
-        formatted = format_files_for_prompt(files)
+        # Exact structure facts from local parsing; cached per blob like the file text
+        timer.start("static")
+        static_stats = analyze_files(files, snapshot.pop("sources", None))
+        graph, external = resolve_imports(files)
+        metrics = repo_metrics(files, graph, external)
+        ranked = rank_files(files, graph)
+        repo_facts = format_facts(ranked, graph, metrics)
+        timer.stop("static", parsed_files=static_stats["parsed"], cached_files=static_stats["cached"])
+        meta["static_metrics"] = metrics
+        _send(q, "progress", {
+            "step": 2,
+            "message": f"🔬 Static analysis: {metrics['loc']:,} LOC, {metrics['functions']} functions, "
+                       f"{metrics['internal_import_edges']} internal imports ({static_stats['parsed']} parsed, {static_stats['cached']} cached)",
+        })
 
         _send(q, "progress", {"step": 3, "message": "🎯 Repo Manager: triaging files..."})
-        _send(q, "progress", {"step": 4, "message": "📖 Code Analyst: reading codebase..."})
-        _send(q, "progress", {"step": 5, "message": "🏗️ Architecture Agent: mapping system design..."})
-        _send(q, "progress", {"step": 6, "message": "🧾 Documentation Agent: writing docs..."})
 
         # Debug: report detection of env flag and file flag
         try:
@@ -316,12 +346,13 @@ def run_analysis(job_id: str, repo_url: str):
         # If FORCE_LOCAL_FALLBACK is set, skip remote LLMs and produce a local summary
         if str(os.environ.get("FORCE_LOCAL_FALLBACK", "")).lower() in ("1", "true", "yes") or os.path.exists(os.path.join(os.path.dirname(__file__), "FORCE_LOCAL_FALLBACK")):
             _send(q, "progress", {"step": 6, "message": "⚠️ FORCE_LOCAL_FALLBACK enabled — generating local fallback summary."})
-            raw = _local_fallback_summary(formatted, structure)
+            raw = metrics_report(ranked, graph, metrics, structure, meta["primary_stack"])
             debug_path = os.path.join("jobs", job_id, "debug_raw.txt")
             with open(debug_path, "w", encoding="utf-8") as f:
                 f.write(raw)
             sections = parse_sections(raw, [])
             meta["note"] = "Fallback summary generated locally (FORCE_LOCAL_FALLBACK)"
+            meta["stages"] = timer.stages
             report_path = os.path.join("jobs", job_id, "report.md")
             with open(report_path, "w", encoding="utf-8") as f:
                 f.write(raw)
@@ -342,16 +373,48 @@ def run_analysis(job_id: str, repo_url: str):
             })
             return
 
-        # create a crew factory so _kickoff_with_retry can rebuild with fallback models
-        def crew_factory(model_override: str | None = None, temp_override: float | None = None):
-            return build_crew(formatted, structure, model=model_override, temperature=temp_override)
-
         try:
+            # Map: summarise the most important files in token-budgeted batches
+            timer.start("plan")
+            batches, skipped = pack_batches([f for f in ranked if not f.get("summary")])
+            timer.stop("plan", batches=len(batches), skipped_files=len(skipped))
+            _send(q, "progress", {
+                "step": 4,
+                "message": f"📖 Code Analyst: summarising {sum(len(b) for b in batches)} file(s) in {len(batches)} batch(es)"
+                           f" ({len(files) - sum(len(b) for b in batches) - len(skipped)} cached, {len(skipped)} over budget)...",
+            })
+            timer.start("map")
+            batch_outputs, map_usage = summarize_batches(
+                batches,
+                lambda prompt: _summarize_batch(prompt, q),
+                on_batch=lambda done, total: _send(q, "progress", {"step": 4, "message": f"📖 Code Analyst: batch {done}/{total} summarised"}),
+            )
+            timer.stop("map", **map_usage)
+            # Keep per-file summaries so unchanged files skip the map stage next time
+            try:
+                get_blob_store().put_summaries(extract_file_summaries("\n\n".join(batch_outputs), files))
+            except Exception:
+                pass
+            summaries = reduce_input(ranked, batches, batch_outputs, skipped)
+
+            # Reduce: the crew works from the summaries, not the source
+            _send(q, "progress", {"step": 5, "message": "🏗️ Architecture Agent: mapping system design..."})
+            _send(q, "progress", {"step": 6, "message": "🧾 Documentation Agent: writing docs..."})
+
+            # create a crew factory so _kickoff_with_retry can rebuild with fallback models
+            def crew_factory(model_override: str | None = None, temp_override: float | None = None):
+                return build_crew(
+                    summaries, structure, model=model_override, temperature=temp_override,
+                    repo_facts=repo_facts,
+                )
+
+            timer.start("reduce")
             result, used_crew = _kickoff_with_retry(crew_factory, q)
+            timer.stop("reduce", **_crew_usage(used_crew))
         except RuntimeError as rexc:
             # All remote models exhausted — produce graceful local fallback
             _send(q, "progress", {"step": 6, "message": "⚠️ Remote models unavailable — generating local fallback summary."})
-            raw = _local_fallback_summary(formatted, structure)
+            raw = metrics_report(ranked, graph, metrics, structure, meta["primary_stack"])
             # write debug and continue
             debug_path = os.path.join("jobs", job_id, "debug_raw.txt")
             with open(debug_path, "w", encoding="utf-8") as f:
@@ -363,7 +426,8 @@ def run_analysis(job_id: str, repo_url: str):
                 "repo_display": repo_display,
                 "repo_source": repo_source,
                 "repo_url": repo_url,
-                "primary_stack": _infer_primary_stack(files, repo_path),
+                "revision": snapshot["revision"],
+                "primary_stack": _infer_primary_stack(files, snapshot["manifests"]),
                 "file_count": len(files),
                 "structure": structure,
                 "folder_count": len(structure),
@@ -371,6 +435,8 @@ def run_analysis(job_id: str, repo_url: str):
                 "source_tooling": "CrewAI · Groq LLaMA 3.3",
                 "badges": ["Repository analysis", "Architecture", "Metrics"],
                 "note": "Fallback summary generated locally due to remote model errors",
+                "static_metrics": metrics,
+                "stages": timer.stages,
             }
             report_path = os.path.join("jobs", job_id, "report.md")
             with open(report_path, "w", encoding="utf-8") as f:
@@ -423,7 +489,11 @@ def run_analysis(job_id: str, repo_url: str):
         with open(report_path, "w", encoding="utf-8") as f:
             f.write(raw)
 
+        _send(q, "progress", {"step": 6, "message": f"⏱️ {_format_stages(timer.stages)}"})
+
         # Save lightweight metadata for export templates
+        meta_path = os.path.join("jobs", job_id, "meta.json")
+        meta["stages"] = timer.stages
         meta["file_count"] = len(files)
         meta["structure"] = structure
         meta["folder_count"] = len(structure)
@@ -450,6 +520,7 @@ def run_analysis(job_id: str, repo_url: str):
             "raw": raw,
             "file_count": len(files),
             "structure": structure,
+            "stages": timer.stages,
         })
 
     except Exception as e:
@@ -459,7 +530,9 @@ def run_analysis(job_id: str, repo_url: str):
         job_repo = os.path.join("jobs", job_id, "repo")
         if os.path.exists(job_repo):
             shutil.rmtree(job_repo, ignore_errors=True)
-        q.put(None)  # sentinel
+
+
+jobs = JobQueue(run_analysis)
 
 
 def parse_sections(raw: str, task_outputs: list = None) -> dict:
@@ -558,30 +631,43 @@ def analyze():
     if not os.environ.get("GROQ_API_KEY"):
         return jsonify({"error": "GROQ_API_KEY not set in .env file on the server"}), 500
 
-    import uuid
-    job_id = str(uuid.uuid4())
-    os.makedirs(os.path.join("jobs", job_id), exist_ok=True)
-    progress_queues[job_id] = queue.Queue()
+    job, created = jobs.submit(repo_url)
+    return jsonify({"job_id": job["id"], "status": job["status"], "deduplicated": not created})
+
 
-    thread = threading.Thread(target=run_analysis, args=(job_id, repo_url), daemon=True)
-    thread.start()
+@app.route("/jobs")
+def list_jobs():
+    try:
+        limit = int(request.args.get("limit", 50))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = min(max(limit, 1), MAX_JOBS_LIMIT)
+    return jsonify({"jobs": jobs.store.recent(limit)})
 
-    return jsonify({"job_id": job_id})
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id: str):
+    job = jobs.store.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
 
 
 @app.route("/stream/<job_id>")
 def stream(job_id: str):
-    if job_id not in progress_queues:
+    if jobs.store.get(job_id) is None:
         return jsonify({"error": "Job not found"}), 404
+    # EventSource sends the last id it saw when it reconnects; ?after= does the same for other clients.
+    after = request.headers.get("Last-Event-ID") or request.args.get("after") or "0"
+    after = int(after) if after.isdigit() else 0
 
     def generate():
-        q = progress_queues[job_id]
-        while True:
-            item = q.get()
-            if item is None:
-                break
-            yield f"data: {json.dumps(item)}\n\n"
-        progress_queues.pop(job_id, None)
+        for entry in jobs.follow(job_id, after):
+            if entry is None:
+                yield ": keep-alive\n\n"
+                continue
+            seq, item = entry
+            yield f"id: {seq}\ndata: {json.dumps(item)}\n\n"
 
     return Response(
         stream_with_context(generate()),
@@ -667,4 +753,5 @@ def debug_report(job_id: str):
 
 if __name__ == "__main__":
     os.makedirs("jobs", exist_ok=True)
+    jobs.recover()
     app.run(debug=True, port=5000, threaded=True, use_reloader=False)
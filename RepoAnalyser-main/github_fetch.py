@@ -0,0 +1,168 @@
+"""GitHub API downloader used when `git clone` is not possible.
+
+One keep-alive session is shared by all jobs. Small change sets are pulled
+from raw.githubusercontent.com by a bounded thread pool; anything larger
+streams the commit tarball in a single request and is unpacked in memory.
+API calls honour `X-RateLimit-*` / `Retry-After`: when the quota runs out the
+caller waits for the reset (up to GITHUB_RATE_LIMIT_MAX_WAIT) instead of
+failing file by file.
+"""
+import os
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_ROOT = "https://api.github.com"
+RAW_ROOT = "https://raw.githubusercontent.com"
+
+GITHUB_FETCH_WORKERS = int(os.environ.get("GITHUB_FETCH_WORKERS", "16"))
+GITHUB_FETCH_TIMEOUT = float(os.environ.get("GITHUB_FETCH_TIMEOUT", "30"))
+GITHUB_TARBALL_MIN_FILES = int(os.environ.get("GITHUB_TARBALL_MIN_FILES", "40"))
+GITHUB_RATE_LIMIT_MAX_WAIT = float(os.environ.get("GITHUB_RATE_LIMIT_MAX_WAIT", "60"))
+GITHUB_MAX_RETRIES = 3
+
+
+class RateLimitExceeded(RuntimeError):
+    pass
+
+
+class _RateLimit:
+    """Last quota seen on api.github.com, shared by every thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.remaining: int | None = None
+        self.reset_at: float = 0.0
+
+    def update(self, headers) -> None:
+        remaining, reset = headers.get("X-RateLimit-Remaining"), headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            self.remaining, self.reset_at = int(remaining), float(reset)
+
+    def wait(self) -> None:
+        with self._lock:
+            exhausted = self.remaining == 0
+            delay = self.reset_at - time.time() + 1
+        if not exhausted or delay <= 0:
+            return
+        if delay > GITHUB_RATE_LIMIT_MAX_WAIT:
+            raise RateLimitExceeded(f"GitHub API rate limit exhausted; resets in {int(delay)}s")
+        time.sleep(delay)
+
+
+_rate_limit = _RateLimit()
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=max(GITHUB_FETCH_WORKERS, 10)))
+
+
+def _headers() -> dict:
+    token = os.environ.get("GITHUB_TOKEN", "")
+    return {"Authorization": f"token {token}"} if token else {}
+
+
+def _retry_delay(resp: requests.Response) -> float | None:
+    """Seconds to wait before retrying a throttled response, or None if it was not throttled."""
+    if resp.status_code not in (403, 429):
+        return None
+    if "Retry-After" in resp.headers:
+        return float(resp.headers["Retry-After"])
+    if resp.headers.get("X-RateLimit-Remaining") == "0":
+        return max(0.0, float(resp.headers.get("X-RateLimit-Reset", time.time())) - time.time()) + 1
+    return None
+
+
+def _get(url: str, headers: dict | None = None, stream: bool = False) -> requests.Response:
+    is_api = url.startswith(API_ROOT)
+    for attempt in range(1, GITHUB_MAX_RETRIES + 1):
+        if is_api:
+            _rate_limit.wait()
+        resp = _session.get(url, headers={**_headers(), **(headers or {})}, timeout=GITHUB_FETCH_TIMEOUT, stream=stream)
+        if is_api:
+            _rate_limit.update(resp.headers)
+        delay = _retry_delay(resp)
+        if delay is None:
+            resp.raise_for_status()
+            return resp
+        resp.close()
+        if delay > GITHUB_RATE_LIMIT_MAX_WAIT or attempt == GITHUB_MAX_RETRIES:
+            raise RateLimitExceeded(f"GitHub rate limit on {url}; retry in {int(delay)}s")
+        time.sleep(delay)
+    raise RateLimitExceeded(f"GitHub rate limit on {url}")
+
+
+def parse_repo_url(repo_url: str) -> tuple[str, str]:
+    parts = repo_url.rstrip("/").replace(".git", "").split("/")
+    return parts[-2], parts[-1]
+
+
+def resolve_commit(owner: str, repo: str) -> str:
+    """Commit sha at the tip of the default branch, so every later request sees the same tree."""
+    branch = _get(f"{API_ROOT}/repos/{owner}/{repo}").json().get("default_branch", "main")
+    resp = _get(f"{API_ROOT}/repos/{owner}/{repo}/commits/{branch}", headers={"Accept": "application/vnd.github.sha"})
+    return resp.text.strip()
+
+
+def list_tree(owner: str, repo: str, commit: str) -> tuple[list[tuple[str, str, int]], bool]:
+    """((path, blob hash, size) for every file, truncated) for `commit`."""
+    data = _get(f"{API_ROOT}/repos/{owner}/{repo}/git/trees/{commit}?recursive=1").json()
+    entries = [
+        (item["path"], item["sha"], item.get("size", 0))
+        for item in data.get("tree", []) if item.get("type") == "blob"
+    ]
+    return entries, bool(data.get("truncated"))
+
+
+def iter_tarball(owner: str, repo: str, commit: str, want: Callable[[str], bool]) -> Iterator[tuple[str, bytes]]:
+    """Stream the commit tarball and yield (path, data) for members accepted by `want`."""
+    with _get(f"{API_ROOT}/repos/{owner}/{repo}/tarball/{commit}", stream=True) as resp:
+        resp.raw.decode_content = True
+        with tarfile.open(fileobj=resp.raw, mode="r|gz") as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                # Members live under a "<owner>-<repo>-<sha>/" prefix.
+                path = member.name.split("/", 1)[-1]
+                if want(path):
+                    handle = archive.extractfile(member)
+                    if handle is not None:
+                        yield path, handle.read()
+
+
+def iter_raw(owner: str, repo: str, commit: str, paths: list[str]) -> Iterator[tuple[str, bytes]]:
+    """Download `paths` concurrently; yields (path, data) as each one completes."""
+
+    def download(path: str) -> bytes:
+        return _get(f"{RAW_ROOT}/{owner}/{repo}/{commit}/{path}").content
+
+    with ThreadPoolExecutor(max_workers=GITHUB_FETCH_WORKERS, thread_name_prefix="github-raw") as pool:
+        futures = {pool.submit(download, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except RateLimitExceeded:
+                for pending in futures:
+                    pending.cancel()
+                raise
+            except requests.RequestException:
+                continue
+
+
+def fetch_files(
+    owner: str, repo: str, commit: str, paths: list[str], want: Callable[[str], bool] | None = None
+) -> Iterator[tuple[str, bytes]]:
+    """Yield (path, data) for `paths`, choosing the cheaper transport.
+
+    `want` is for truncated tree listings: tarball members it accepts are
+    yielded too, since `paths` cannot name them.
+    """
+    if want is None and len(paths) < GITHUB_TARBALL_MIN_FILES:
+        return iter_raw(owner, repo, commit, paths)
+    needed = set(paths)
+    return iter_tarball(owner, repo, commit, lambda path: path in needed or (want is not None and want(path)))
@@ -0,0 +1,252 @@
+"""Durable analysis jobs: a SQLite job table, a bounded worker pool and replayable progress.
+
+- jobs.sqlite        one row per job (status, timings, artifact paths) and every
+  progress event it emitted, numbered per job. `/stream/<id>` replays events
+  after the client's `Last-Event-ID`, so a dropped connection resumes where it
+  stopped instead of losing the run.
+- At most JOB_WORKERS analyses run at once; later submissions wait as `queued`.
+- Submitting a repo URL that already has a queued or running job returns that
+  job instead of cloning the repo and running the crew a second time.
+- Jobs left `queued` or `running` by a restart are queued again on start-up, up
+  to JOB_MAX_ATTEMPTS attempts.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from repo_cache import normalize_repo_url
+
+JOBS_DIR = "jobs"
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", os.path.join(JOBS_DIR, "jobs.sqlite"))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "2"))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "15"))
+
+FINISHED = ("done", "failed")
+ARTIFACTS = {"report_path": "report.md", "meta_path": "meta.json", "debug_path": "debug_raw.txt"}
+
+
+class JobStore:
+    """SQLite table of jobs and their progress events."""
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, repo_url TEXT NOT NULL, repo_key TEXT NOT NULL, status TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0, error TEXT,"
+                " created_at REAL NOT NULL, started_at REAL, finished_at REAL,"
+                " report_path TEXT, meta_path TEXT, debug_path TEXT)"
+            )
+            # One active job per repo: a second submission is answered with the first job.
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_repo ON jobs (repo_key)"
+                " WHERE status IN ('queued', 'running')"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                " job_id TEXT NOT NULL, seq INTEGER NOT NULL, event TEXT NOT NULL, data TEXT NOT NULL,"
+                " created_at REAL NOT NULL, PRIMARY KEY (job_id, seq))"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create_or_get(self, repo_url: str) -> tuple[dict, bool]:
+        """(job, created): the active job for this repo if there is one, else a new queued job."""
+        key = normalize_repo_url(repo_url)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE repo_key = ? AND status IN ('queued', 'running')", (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("COMMIT")
+                return dict(row), False
+            job_id = str(uuid.uuid4())
+            conn.execute(
+                "INSERT INTO jobs (id, repo_url, repo_key, status, created_at) VALUES (?, ?, ?, 'queued', ?)",
+                (job_id, repo_url, key, time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(job_id), True
+
+    def get(self, job_id: str) -> dict | None:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        rows = self._conn().execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [dict(row) for row in rows]
+
+    def unfinished(self) -> list[dict]:
+        rows = self._conn().execute(
+            "SELECT * FROM jobs WHERE status IN ('queued', 'running') ORDER BY created_at"
+        )
+        return [dict(row) for row in rows]
+
+    def queue_position(self, job_id: str) -> int:
+        """Number of queued jobs submitted before `job_id`."""
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            " AND created_at < (SELECT created_at FROM jobs WHERE id = ?)",
+            (job_id,),
+        ).fetchone()
+        return row[0]
+
+    def update(self, job_id: str, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._conn().execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def mark_running(self, job_id: str):
+        self._conn().execute(
+            "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 WHERE id = ?",
+            (time.time(), job_id),
+        )
+
+    def append_event(self, job_id: str, event: str, data: dict) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO job_events (job_id, seq, event, data, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, seq, event, json.dumps(data), time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return seq
+
+    def events_after(self, job_id: str, after: int) -> list[tuple[int, dict]]:
+        rows = self._conn().execute(
+            "SELECT seq, event, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq", (job_id, after)
+        )
+        return [(seq, {"event": event, "data": json.loads(data)}) for seq, event, data in rows]
+
+    def last_event(self, job_id: str) -> dict | None:
+        row = self._conn().execute(
+            "SELECT event, data FROM job_events WHERE job_id = ? ORDER BY seq DESC LIMIT 1", (job_id,)
+        ).fetchone()
+        return {"event": row[0], "data": json.loads(row[1])} if row else None
+
+
+class JobChannel:
+    """Queue-like sink handed to the analysis: `put({"event", "data"})` persists the event."""
+
+    def __init__(self, jobs: "JobQueue", job_id: str):
+        self._jobs = jobs
+        self.job_id = job_id
+
+    def put(self, item: dict | None):
+        if item is not None:
+            self._jobs.publish(self.job_id, item["event"], item["data"])
+
+
+class JobQueue:
+    """Runs `handler(job_id, repo_url, channel)` for submitted jobs on a bounded pool."""
+
+    def __init__(self, handler: Callable[[str, str, JobChannel], None], store: JobStore | None = None,
+                 workers: int = JOB_WORKERS):
+        self.handler = handler
+        self.store = store or JobStore()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+        self._changed = threading.Condition()
+
+    def submit(self, repo_url: str) -> tuple[dict, bool]:
+        """(job, created). `created` is False when an active job for the same repo was reused."""
+        job, created = self.store.create_or_get(repo_url)
+        if created:
+            self._enqueue(job)
+        return job, created
+
+    def _enqueue(self, job: dict):
+        os.makedirs(os.path.join(JOBS_DIR, job["id"]), exist_ok=True)
+        position = self.store.queue_position(job["id"])
+        message = f"⏳ Queued behind {position} job(s)..." if position else "⏳ Queued..."
+        self.publish(job["id"], "progress", {"step": 1, "message": message})
+        self._pool.submit(self._run, job["id"], job["repo_url"])
+
+    def recover(self):
+        """Queue again the jobs a previous process left unfinished."""
+        for job in self.store.unfinished():
+            if job["attempts"] >= JOB_MAX_ATTEMPTS:
+                self.publish(job["id"], "error", {"message": "Job was interrupted too many times by a server restart."})
+                self._finish(job["id"], "failed", "interrupted")
+                continue
+            if job["status"] == "running":
+                self.store.update(job["id"], status="queued")
+                self.publish(job["id"], "progress", {"step": 1, "message": "🔁 Server restarted — re-running analysis..."})
+            self._enqueue(job)
+
+    def _run(self, job_id: str, repo_url: str):
+        self.store.mark_running(job_id)
+        error = None
+        try:
+            self.handler(job_id, repo_url, JobChannel(self, job_id))
+        except Exception as exc:
+            error = str(exc)
+            self.publish(job_id, "error", {"message": error})
+        last = self.store.last_event(job_id)
+        if error is None and last and last["event"] == "error":
+            error = last["data"].get("message") or "failed"
+        self._finish(job_id, "failed" if error else "done", error)
+
+    def _finish(self, job_id: str, status: str, error: str | None):
+        job_dir = os.path.join(JOBS_DIR, job_id)
+        artifacts = {
+            column: path if os.path.exists(path) else None
+            for column, path in ((column, os.path.join(job_dir, name)) for column, name in ARTIFACTS.items())
+        }
+        self.store.update(job_id, status=status, error=error, finished_at=time.time(), **artifacts)
+        with self._changed:
+            self._changed.notify_all()
+
+    def publish(self, job_id: str, event: str, data: dict) -> int:
+        seq = self.store.append_event(job_id, event, data)
+        with self._changed:
+            self._changed.notify_all()
+        return seq
+
+    def follow(self, job_id: str, after: int = 0) -> Iterator[tuple[int, dict] | None]:
+        """Yield (seq, event) after `after` until the job finishes.
+
+        Yields None when JOB_POLL_SECONDS pass without news, so callers can
+        send a keep-alive.
+        """
+        while True:
+            # Check and wait under the lock so an event published in between is not missed.
+            with self._changed:
+                events = self.store.events_after(job_id, after)
+                if not events:
+                    job = self.store.get(job_id)
+                    if job is None or job["status"] in FINISHED:
+                        return
+                    notified = self._changed.wait(timeout=JOB_POLL_SECONDS)
+            for seq, item in events:
+                after = seq
+                yield seq, item
+            if not events and not notified:
+                yield None
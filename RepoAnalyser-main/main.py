@@ -2,11 +2,15 @@
 CLI entry point — runs the Flask web dashboard.
 Open http://localhost:5000 in your browser after starting.
 """
-from app import app
 import os
 
 if __name__ == "__main__":
+    # Imported here, not at module level: static-analysis pool workers are spawned and
+    # re-run this file's top level, and must not load Flask, crewai or a JobQueue.
+    from app import app, jobs
+
     os.makedirs("jobs", exist_ok=True)
+    jobs.recover()
     print("\n🚀 GitHub Repo Analyzer is running!")
     print("   Open http://localhost:5000 in your browser\n")
     app.run(debug=False, port=5000, threaded=True)
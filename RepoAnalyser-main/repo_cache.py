@@ -0,0 +1,225 @@
+"""Shared, incremental repository cache.
+
+Two layers live under REPO_CACHE_DIR:
+
+- mirrors/<hash>.git  one bare clone per repo URL. Re-analysing a repo only
+  fetches the commits that arrived since the last run; files are read
+  straight from git objects, so no working tree is ever checked out.
+- blobs.sqlite        extracted file content, per-file analysis summaries and
+  static-analysis facts, keyed by git blob hash. A file that did not change between runs (or that
+  is identical across repos/branches) is neither re-read nor re-analysed.
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+from urllib.parse import urlparse
+
+CACHE_DIR = os.environ.get("REPO_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".repo_cache"))
+GIT_TIMEOUT = int(os.environ.get("REPO_CACHE_GIT_TIMEOUT", "300"))
+
+_GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+_mirror_locks: dict[str, threading.Lock] = {}
+_mirror_locks_guard = threading.Lock()
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """Canonical form used as the cache key: `https://GitHub.com/a/b.git/` == `https://github.com/a/b`."""
+    url = repo_url.strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[:-4]
+    parsed = urlparse(url)
+    if parsed.scheme and parsed.netloc:
+        url = f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{parsed.path}"
+    return url
+
+
+def git_blob_hash(data: bytes) -> str:
+    """Same id `git hash-object` assigns, so API-fetched files share cache entries with clones."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _git(*args: str, git_dir: str | None = None, input: bytes | None = None) -> bytes:
+    cmd = ["git"] + (["--git-dir", git_dir] if git_dir else []) + list(args)
+    result = subprocess.run(cmd, input=input, capture_output=True, timeout=GIT_TIMEOUT, env=_GIT_ENV)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.decode(errors='ignore').strip()}")
+    return result.stdout
+
+
+def _mirror_lock(key: str) -> threading.Lock:
+    with _mirror_locks_guard:
+        return _mirror_locks.setdefault(key, threading.Lock())
+
+
+def mirror_path(repo_url: str) -> str:
+    key = hashlib.sha1(normalize_repo_url(repo_url).encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, "mirrors", f"{key}.git")
+
+
+def sync_mirror(repo_url: str) -> tuple[str, str, bool]:
+    """Create or update the bare mirror for `repo_url`.
+
+    Returns (git_dir, commit, fetched) where `commit` is the remote HEAD and
+    `fetched` is False when the mirror was already at that commit.
+    """
+    git_dir = mirror_path(repo_url)
+    with _mirror_lock(git_dir):
+        if not os.path.isdir(git_dir):
+            os.makedirs(os.path.dirname(git_dir), exist_ok=True)
+            tmp_dir = f"{git_dir}.tmp-{os.getpid()}-{threading.get_ident()}"
+            try:
+                _git("clone", "--bare", "--depth=1", "--single-branch", repo_url, tmp_dir)
+                os.replace(tmp_dir, git_dir)
+            finally:
+                if os.path.isdir(tmp_dir):
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+            commit = _git("rev-parse", "HEAD", git_dir=git_dir).decode().strip()
+            _git("update-ref", "refs/analysed/head", commit, git_dir=git_dir)
+            return git_dir, commit, True
+
+        try:
+            previous = _git("rev-parse", "--verify", "-q", "refs/analysed/head", git_dir=git_dir).decode().strip()
+        except RuntimeError:
+            previous = ""
+        # The previous head is sent as a "have", so only new objects cross the wire.
+        _git("fetch", "--depth=1", "--no-tags", repo_url, "HEAD", git_dir=git_dir)
+        commit = _git("rev-parse", "FETCH_HEAD", git_dir=git_dir).decode().strip()
+        _git("update-ref", "refs/analysed/head", commit, git_dir=git_dir)
+        return git_dir, commit, commit != previous
+
+
+def list_tree(git_dir: str, commit: str) -> list[tuple[str, str, int]]:
+    """(path, blob hash, size) for every file in `commit`."""
+    entries = []
+    out = _git("ls-tree", "-r", "-l", "-z", commit, git_dir=git_dir)
+    for record in out.split(b"\0"):
+        if not record:
+            continue
+        meta, _, path = record.partition(b"\t")
+        _mode, obj_type, blob, size = meta.split()
+        if obj_type != b"blob":
+            continue
+        entries.append((path.decode("utf-8", errors="ignore"), blob.decode(), int(size) if size != b"-" else 0))
+    return entries
+
+
+def read_blobs(git_dir: str, blobs: list[str]) -> dict[str, bytes]:
+    """Read many blobs with a single `git cat-file --batch` process."""
+    if not blobs:
+        return {}
+    out = _git("cat-file", "--batch", git_dir=git_dir, input="".join(f"{b}\n" for b in blobs).encode())
+    contents, pos = {}, 0
+    for blob in blobs:
+        header_end = out.index(b"\n", pos)
+        header = out[pos:header_end].split()
+        pos = header_end + 1
+        if len(header) < 3 or header[1] == b"missing":
+            continue
+        size = int(header[2])
+        contents[blob] = out[pos:pos + size]
+        pos += size + 1
+    return contents
+
+
+class BlobStore:
+    """SQLite table of per-blob extracted content and analysis summaries."""
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.path.join(CACHE_DIR, "blobs.sqlite")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blobs ("
+                " blob TEXT PRIMARY KEY, max_chars INTEGER NOT NULL, content TEXT NOT NULL,"
+                " summary TEXT, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blob_facts (blob TEXT PRIMARY KEY, facts TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, blobs: list[str], max_chars: int) -> dict[str, dict]:
+        """Cached entries for `blobs` extracted with the same `max_chars` limit."""
+        found = {}
+        conn = self._conn()
+        for start in range(0, len(blobs), 500):
+            chunk = blobs[start:start + 500]
+            rows = conn.execute(
+                f"SELECT blob, content, summary FROM blobs WHERE max_chars = ? AND blob IN ({','.join('?' * len(chunk))})",
+                [max_chars, *chunk],
+            )
+            for blob, content, summary in rows:
+                found[blob] = {"content": content, "summary": summary}
+        return found
+
+    def put_contents(self, items: dict[str, str], max_chars: int):
+        if not items:
+            return
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT INTO blobs (blob, max_chars, content, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(blob) DO UPDATE SET content = excluded.content, max_chars = excluded.max_chars,"
+                " updated_at = excluded.updated_at,"
+                " summary = CASE WHEN blobs.max_chars = excluded.max_chars THEN blobs.summary END",
+                [(blob, max_chars, content, now) for blob, content in items.items()],
+            )
+
+    def put_summaries(self, items: dict[str, str]):
+        if not items:
+            return
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                "UPDATE blobs SET summary = ?, updated_at = ? WHERE blob = ?",
+                [(summary, now, blob) for blob, summary in items.items()],
+            )
+
+    def get_facts(self, blobs: list[str]) -> dict[str, dict]:
+        """Static-analysis facts by blob (computed from the full file, independent of max_chars)."""
+        found = {}
+        conn = self._conn()
+        for start in range(0, len(blobs), 500):
+            chunk = blobs[start:start + 500]
+            rows = conn.execute(
+                f"SELECT blob, facts FROM blob_facts WHERE blob IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for blob, facts in rows:
+                found[blob] = json.loads(facts)
+        return found
+
+    def put_facts(self, items: dict[str, dict]):
+        if not items:
+            return
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO blob_facts (blob, facts, updated_at) VALUES (?, ?, ?)",
+                [(blob, json.dumps(facts), now) for blob, facts in items.items()],
+            )
+
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BlobStore()
+        return _store
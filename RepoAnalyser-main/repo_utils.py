@@ -1,10 +1,16 @@
 import os
+import re
 import shutil
-import requests
+import subprocess
+
+import github_fetch
+from repo_cache import get_blob_store, git_blob_hash, list_tree, read_blobs, sync_mirror
+from static_analysis import FACTS_VERSION
 
 SUPPORTED_EXTENSIONS = (".py", ".js", ".ts", ".java", ".cpp", ".go", ".rb", ".md", ".json", ".yml", ".yaml")
 IGNORE_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv", "dist", "build"}
 MAX_FILE_CHARS = 3000
+MANIFEST_FILES = ("requirements.txt", "pyproject.toml", "Pipfile")
 
 
 def clone_repo(repo_url: str, path: str = "repo") -> tuple[str, str]:
@@ -18,46 +24,124 @@ def clone_repo(repo_url: str, path: str = "repo") -> tuple[str, str]:
     return _fetch_via_github_api(repo_url, path), "api"
 
 
-def _fetch_via_github_api(repo_url: str, path: str) -> str:
-    """Download repo tree via GitHub API and save files locally."""
-    # Parse owner/repo from URL
-    parts = repo_url.rstrip("/").replace(".git", "").split("/")
-    owner, repo = parts[-2], parts[-1]
-
-    token = os.environ.get("GITHUB_TOKEN", "")
-    headers = {"Authorization": f"token {token}"} if token else {}
+def _is_supported(file_path: str) -> bool:
+    return file_path.endswith(SUPPORTED_EXTENSIONS) and not any(seg in IGNORE_DIRS for seg in file_path.split("/"))
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+
+
+def _extract(text: str) -> str:
+    return text.strip()[:MAX_FILE_CHARS]
+
+
+def ingest_repo(repo_url: str, path: str = "repo") -> dict:
+    """Collect analysable files for `repo_url`, reusing everything cached from earlier runs.
+
+    The shared bare mirror is fetched incrementally and files are read from git
+    objects; only blobs missing from the blob store are read at all. Falls back
+    to the GitHub API when the repo cannot be cloned; files are then streamed
+    straight into memory, and `path` is unused (kept for `clone_repo` parity).
+
+    Returns a dict with `files` (as `get_files`, plus `blob` and cached `summary`),
+    `method`, `revision`, `manifests` (dependency files by name), `sources` (full
+    text of the blobs read this run, for static analysis) and `stats`.
+    """
+    try:
+        git_dir, commit, fetched = sync_mirror(repo_url)
+    except (RuntimeError, OSError, subprocess.TimeoutExpired):
+        return _ingest_via_github_api(repo_url)
+
+    entries = list_tree(git_dir, commit)
+    blobs = {file_path: blob for file_path, blob, _size in entries if _is_supported(file_path)}
+    manifest_blobs = {file_path: blob for file_path, blob, _size in entries if file_path in MANIFEST_FILES}
+
+    store = get_blob_store()
+    cached = store.get_many(list(set(blobs.values())), MAX_FILE_CHARS)
+    missing = list({blob for blob in blobs.values() if blob not in cached})
+    sources = {blob: _decode(data) for blob, data in read_blobs(git_dir, missing).items()}
+    extracted = {blob: _extract(text) for blob, text in sources.items()}
+    store.put_contents(extracted, MAX_FILE_CHARS)
+    # Cached content is capped, so static analysis needs the full text of any cached blob without facts.
+    known = store.get_facts(list(cached))
+    unparsed = [blob for blob in cached if known.get(blob, {}).get("v") != FACTS_VERSION]
+    sources.update((blob, _decode(data)) for blob, data in read_blobs(git_dir, unparsed).items())
+
+    manifest_data = read_blobs(git_dir, list(manifest_blobs.values()))
+    manifests = {
+        name: manifest_data[blob].decode("utf-8", errors="ignore")
+        for name, blob in manifest_blobs.items() if blob in manifest_data
+    }
+    return _snapshot(blobs, cached, extracted, sources, manifests, "git-cache", commit, fetched)
+
+
+def _ingest_via_github_api(repo_url: str) -> dict:
+    owner, repo = github_fetch.parse_repo_url(repo_url)
+    commit = github_fetch.resolve_commit(owner, repo)
+    entries, truncated = github_fetch.list_tree(owner, repo, commit)
+    blobs = {file_path: blob for file_path, blob, _size in entries if _is_supported(file_path)}
+
+    store = get_blob_store()
+    cached = store.get_many(list(set(blobs.values())), MAX_FILE_CHARS)
+    needed = [file_path for file_path, blob in blobs.items() if blob not in cached]
+    needed += [file_path for file_path, _blob, _size in entries if file_path in MANIFEST_FILES]
+    # A truncated listing does not name every file, so take whatever the tarball holds.
+    want = (lambda file_path: _is_supported(file_path) or file_path in MANIFEST_FILES) if truncated else None
+
+    extracted, sources, manifests = {}, {}, {}
+    for file_path, data in github_fetch.fetch_files(owner, repo, commit, needed, want):
+        if file_path in MANIFEST_FILES:
+            manifests[file_path] = data.decode("utf-8", errors="ignore")
+        if _is_supported(file_path):
+            blob = git_blob_hash(data)
+            blobs[file_path] = blob
+            sources[blob] = _decode(data)
+            extracted[blob] = _extract(sources[blob])
+    store.put_contents(extracted, MAX_FILE_CHARS)
+    return _snapshot(blobs, cached, extracted, sources, manifests, "api", commit, True)
+
+
+def _snapshot(
+    blobs: dict[str, str], cached: dict[str, dict], extracted: dict[str, str], sources: dict[str, str],
+    manifests: dict[str, str], method: str, revision: str, fetched: bool,
+) -> dict:
+    files = []
+    from_cache = 0
+    for file_path, blob in sorted(blobs.items()):
+        entry = None if blob in extracted else cached.get(blob)
+        content = entry["content"] if entry else extracted.get(blob, "")
+        if content:
+            from_cache += entry is not None
+            files.append({
+                "file": file_path,
+                "content": content,
+                "blob": blob,
+                "summary": entry["summary"] if entry else None,
+            })
+    return {
+        "files": files,
+        "method": method,
+        "revision": revision,
+        "manifests": manifests,
+        "sources": sources,
+        "stats": {"files": len(files), "cached": from_cache, "read": len(extracted), "fetched": fetched},
+    }
 
-    # Get default branch
-    meta = requests.get(f"https://api.github.com/repos/{owner}/{repo}", headers=headers, timeout=15)
-    meta.raise_for_status()
-    branch = meta.json().get("default_branch", "main")
 
-    # Get full tree
-    tree_url = f"https://api.github.com/repos/{owner}/{repo}/git/trees/{branch}?recursive=1"
-    tree_resp = requests.get(tree_url, headers=headers, timeout=15)
-    tree_resp.raise_for_status()
-    tree = tree_resp.json().get("tree", [])
+def _fetch_via_github_api(repo_url: str, path: str) -> str:
+    """Download supported files via the GitHub API and save them locally."""
+    owner, repo = github_fetch.parse_repo_url(repo_url)
+    commit = github_fetch.resolve_commit(owner, repo)
+    entries, truncated = github_fetch.list_tree(owner, repo, commit)
+    paths = [file_path for file_path, _blob, _size in entries if _is_supported(file_path)]
 
     os.makedirs(path, exist_ok=True)
-    for item in tree:
-        if item["type"] != "blob":
-            continue
-        file_path = item["path"]
-        if not any(file_path.endswith(ext) for ext in SUPPORTED_EXTENSIONS):
-            continue
-        if any(seg in IGNORE_DIRS for seg in file_path.split("/")):
-            continue
-
-        raw_url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{file_path}"
-        try:
-            content = requests.get(raw_url, headers=headers, timeout=10).text
-        except Exception:
-            continue
-
+    for file_path, data in github_fetch.fetch_files(owner, repo, commit, paths, _is_supported if truncated else None):
         full_path = os.path.join(path, file_path)
         os.makedirs(os.path.dirname(full_path), exist_ok=True)
-        with open(full_path, "w", encoding="utf-8", errors="ignore") as f:
-            f.write(content)
+        with open(full_path, "wb") as f:
+            f.write(data)
 
     return path
 
@@ -69,11 +153,12 @@ def get_files(repo_path: str) -> list[dict]:
         for file in files:
             if file.endswith(SUPPORTED_EXTENSIONS):
                 full_path = os.path.join(root, file)
-                with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read().strip()
+                with open(full_path, "rb") as f:
+                    data = f.read()
+                content = _extract(_decode(data))
                 if content:
                     relative_path = os.path.relpath(full_path, repo_path)
-                    code_files.append({"file": relative_path, "content": content[:MAX_FILE_CHARS]})
+                    code_files.append({"file": relative_path, "content": content, "blob": git_blob_hash(data)})
     return code_files
 
 
@@ -82,6 +167,20 @@ def format_files_for_prompt(files: list[dict]) -> str:
     return "\n\n".join(parts)
 
 
+def extract_file_summaries(analysis: str, files: list[dict]) -> dict[str, str]:
+    """Split the Code Analyst's per-file breakdown into {blob: summary} for the blob store."""
+    by_path = {f["file"].replace("\\", "/"): f["blob"] for f in files if f.get("blob")}
+    summaries = {}
+    headings = list(re.finditer(r"(?m)^#{2,4}\s*File:\s*`?([^`\n]+?)`?\s*$", analysis))
+    for i, match in enumerate(headings):
+        blob = by_path.get(match.group(1).strip().lstrip("./"))
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(analysis)
+        summary = analysis[match.end():end].strip()
+        if blob and summary:
+            summaries[blob] = summary
+    return summaries
+
+
 def get_repo_structure(files: list[dict]) -> dict:
     """Build a folder → files mapping for display."""
     structure = {}
@@ -232,9 +232,18 @@ async function startAnalysis() {
     }
   };
 
+  // EventSource reconnects on its own and resumes after the last event id it saw;
+  // only give up once it stops retrying or the server stays unreachable.
+  let reconnects = 0;
+  evtSource.onopen = () => { reconnects = 0; };
   evtSource.onerror = () => {
-    evtSource.close();
-    showError("Connection to server lost. Please try again.");
+    reconnects += 1;
+    if (evtSource.readyState === EventSource.CLOSED || reconnects > 5) {
+      evtSource.close();
+      showError("Connection to server lost. Please try again.");
+    } else {
+      document.getElementById("progressMsg").textContent = "Connection lost — reconnecting...";
+    }
   };
 }
 
@@ -0,0 +1,627 @@
+"""Local static analysis: per-file facts and repository metrics without LLM calls.
+
+Python is parsed with `ast`; JavaScript/TypeScript, Java, C++, Go and Ruby use
+tree-sitter when `tree_sitter_language_pack` is installed and a keyword scan
+otherwise. Each file yields a small `facts` dict (language, LOC, functions,
+classes, cyclomatic complexity, top-level symbols, imports) that is cached in
+the blob store by blob hash, so only new or changed files are ever parsed.
+Parsing runs in a process pool once there is enough work to amortise it.
+"""
+import ast
+import multiprocessing
+import os
+import posixpath
+import re
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from repo_cache import get_blob_store
+
+FACTS_VERSION = 1
+STATIC_ANALYSIS_WORKERS = int(os.environ.get("STATIC_ANALYSIS_WORKERS", str(min(8, os.cpu_count() or 1))))
+STATIC_ANALYSIS_MIN_PARALLEL = 32
+MAX_SYMBOLS = 25
+MAX_IMPORTS = 100
+
+LANGUAGES = {
+    ".py": "python", ".js": "javascript", ".ts": "typescript", ".java": "java",
+    ".cpp": "cpp", ".go": "go", ".rb": "ruby", ".md": "markdown", ".json": "json",
+    ".yml": "yaml", ".yaml": "yaml",
+}
+CODE_LANGUAGES = {"python", "javascript", "typescript", "java", "cpp", "go", "ruby"}
+LINE_COMMENTS = {"python": "#", "ruby": "#", "yaml": "#"}
+
+_JS_IMPORT = re.compile(r"""(?:import\s[^'"]*?from\s*|import\s*\(?\s*|require\s*\(\s*|export\s[^'"]*?from\s*)['"]([^'"]+)['"]""")
+_PY_IMPORT = re.compile(r"^\s*(?:from\s+(\.*[\w.]*)\s+import\s+([\w*, ]+)|import\s+([\w., ]+))", re.MULTILINE)
+_JAVA_IMPORT = re.compile(r"^\s*import\s+(?:static\s+)?([\w.]+)\s*;", re.MULTILINE)
+_RUBY_IMPORT = re.compile(r"""^\s*require(_relative)?\s+['"]([^'"]+)['"]""", re.MULTILINE)
+_GO_IMPORT_BLOCK = re.compile(r"^import\s*\(([^)]*)\)", re.MULTILINE)
+_GO_IMPORT = re.compile(r"""^import\s+(?:\w+\s+)?"([^"]+)\"""", re.MULTILINE)
+_CPP_INCLUDE = re.compile(r"""^\s*#\s*include\s*([<"])([^>"]+)[>"]""", re.MULTILINE)
+
+# Keyword-scan fallback when tree-sitter is unavailable.
+_FUNCTION_PATTERNS = {
+    "python": re.compile(r"^\s*(?:async\s+)?def\b", re.MULTILINE),
+    "javascript": re.compile(r"\bfunction\b|=>|^\s*(?:async\s+)?\w+\s*\([^)]*\)\s*\{", re.MULTILINE),
+    "typescript": re.compile(r"\bfunction\b|=>|^\s*(?:public|private|protected|static|async|\s)*\w+\s*\([^)]*\)\s*(?::[^{]+)?\{", re.MULTILINE),
+    "java": re.compile(r"^\s*(?:public|private|protected|static|final|synchronized|\s)+[\w<>\[\],\s]+\s+\w+\s*\([^)]*\)\s*(?:throws[^{]+)?\{", re.MULTILINE),
+    "cpp": re.compile(r"^[\w:<>\*&\s]+\s+[\w:~]+\s*\([^;]*\)\s*(?:const)?\s*\{", re.MULTILINE),
+    "go": re.compile(r"^func\b", re.MULTILINE),
+    "ruby": re.compile(r"^\s*def\b", re.MULTILINE),
+}
+_CLASS_PATTERN = re.compile(r"^\s*(?:export\s+)?(?:public\s+|abstract\s+|final\s+)*(?:class|interface|struct|module|enum)\s+(\w+)", re.MULTILINE)
+_DECISION_PATTERN = re.compile(r"\b(?:if|elif|elsif|for|foreach|while|until|case|when|catch|rescue|unless)\b|&&|\|\||\?(?=[^.?:])")
+
+# tree-sitter node types
+_TS_FUNCTIONS = {
+    "function_declaration", "function_definition", "method_definition", "method_declaration",
+    "arrow_function", "function_expression", "generator_function_declaration", "func_literal",
+    "constructor_declaration", "method", "singleton_method", "lambda_expression",
+}
+_TS_CLASSES = {
+    "class_declaration", "class_specifier", "struct_specifier", "interface_declaration",
+    "enum_declaration", "type_spec", "class", "module", "abstract_class_declaration",
+}
+_TS_DECISIONS = {
+    "if_statement", "for_statement", "for_in_statement", "enhanced_for_statement", "for_range_loop",
+    "while_statement", "do_statement", "switch_case", "switch_label", "case_statement", "expression_case",
+    "type_case", "communication_case", "catch_clause", "conditional_expression", "ternary_expression",
+    "if", "elsif", "unless", "while", "until", "for", "when", "rescue", "conditional",
+    "if_modifier", "unless_modifier", "while_modifier", "until_modifier",
+}
+_TS_BOOLEAN_OPERATORS = {"&&", "||", "and", "or"}
+
+_parsers: dict[str, object] = {}
+
+
+def language_of(path: str) -> str:
+    return LANGUAGES.get(posixpath.splitext(path)[1].lower(), "other")
+
+
+# ── Imports ──────────────────────────────────────────────────────────────────
+
+def _python_imports_from_tree(path: str, tree: ast.AST) -> list[str]:
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            module = _absolute_module(path, node.level, node.module or "")
+            names += [f"{module}.{alias.name}" if module else alias.name for alias in node.names]
+            names.append(module)
+    return names
+
+
+def _absolute_module(path: str, level: int, module: str) -> str:
+    if not level:
+        return module
+    parts = path.replace("\\", "/").split("/")[:-1]
+    parts = parts[: len(parts) - (level - 1)] if level > 1 else parts
+    return ".".join([p for p in parts + [module] if p])
+
+
+def extract_imports(path: str, source: str) -> list[str]:
+    """Import specifiers as written (Python: absolute dotted names, relative imports resolved)."""
+    language = language_of(path)
+    if language == "python":
+        try:
+            return _python_imports_from_tree(path, ast.parse(source))
+        except (SyntaxError, ValueError):
+            names = []
+            for match in _PY_IMPORT.finditer(source):
+                if match.group(3):
+                    names += [n.strip().split(" ")[0] for n in match.group(3).split(",")]
+                else:
+                    dots = len(match.group(1)) - len(match.group(1).lstrip("."))
+                    module = _absolute_module(path, dots, match.group(1).lstrip("."))
+                    names += [f"{module}.{n.strip()}" for n in match.group(2).split(",") if n.strip() != "*"]
+                    names.append(module)
+            return names
+    if language in ("javascript", "typescript"):
+        return _JS_IMPORT.findall(source)
+    if language == "java":
+        return _JAVA_IMPORT.findall(source)
+    if language == "ruby":
+        return [("./" + spec if relative and not spec.startswith(".") else spec) for relative, spec in _RUBY_IMPORT.findall(source)]
+    if language == "go":
+        specs = _GO_IMPORT.findall(source)
+        for block in _GO_IMPORT_BLOCK.findall(source):
+            specs += re.findall(r'"([^"]+)"', block)
+        return specs
+    if language == "cpp":
+        return [("./" + spec if kind == '"' else spec) for kind, spec in _CPP_INCLUDE.findall(source)]
+    return []
+
+
+def _imports_of(f: dict) -> list[str]:
+    facts = f.get("facts")
+    if facts is not None:
+        return facts.get("imports", [])
+    return extract_imports(f["file"].replace("\\", "/"), f["content"])
+
+
+def resolve_imports(files: list[dict]) -> tuple[dict[str, set[str]], Counter]:
+    """({path: paths it imports inside the repo}, Counter of files importing each external package)."""
+    paths = [f["file"].replace("\\", "/") for f in files]
+    path_set = set(paths)
+    modules: dict[str, str] = {}
+    classes: dict[str, str] = {}
+    go_dirs: dict[str, list[str]] = {}
+    for path in paths:
+        if path.endswith(".py"):
+            parts = path[:-3].split("/")
+            if parts[-1] == "__init__":
+                parts = parts[:-1]
+            # Register every suffix so src/ layouts and sys.path tweaks still resolve.
+            for i in range(len(parts)):
+                modules.setdefault(".".join(parts[i:]), path)
+        elif path.endswith(".java"):
+            parts = path[:-5].split("/")
+            for i in range(len(parts)):
+                classes.setdefault(".".join(parts[i:]), path)
+        elif path.endswith(".go"):
+            parts = posixpath.dirname(path).split("/")
+            for i in range(len(parts)):
+                go_dirs.setdefault("/".join(parts[i:]), []).append(path)
+
+    def resolve_relative(source: str, target: str, suffixes: tuple[str, ...]) -> str | None:
+        base = posixpath.normpath(posixpath.join(posixpath.dirname(source), target))
+        for suffix in suffixes:
+            if base + suffix in path_set:
+                return base + suffix
+        return None
+
+    stdlib = getattr(sys, "stdlib_module_names", frozenset())
+    local_packages = {name.split(".")[0] for name in modules}
+    graph: dict[str, set[str]] = {}
+    external: Counter = Counter()
+    for f, path in zip(files, paths):
+        language = language_of(path)
+        edges, packages = set(), set()
+        for spec in _imports_of(f):
+            target = None
+            if language == "python":
+                target = modules.get(spec)
+                top = spec.split(".")[0]
+                if not target and top and top not in stdlib and top not in local_packages:
+                    packages.add(top)
+            elif language in ("javascript", "typescript"):
+                if spec.startswith("."):
+                    target = resolve_relative(path, spec, ("", ".ts", ".js", "/index.ts", "/index.js"))
+                elif not spec.startswith(("/", "@/", "~/")):
+                    packages.add("/".join(spec.split("/")[:2]) if spec.startswith("@") else spec.split("/")[0])
+            elif language == "java":
+                target = classes.get(spec)
+                if not target and not spec.startswith(("java.", "javax.")):
+                    packages.add(".".join(spec.split(".")[:2]))
+            elif language == "ruby":
+                if spec.startswith("."):
+                    target = resolve_relative(path, spec, (".rb", ""))
+                else:
+                    packages.add(spec.split("/")[0])
+            elif language == "go":
+                for i in range(spec.count("/") + 1):
+                    members = go_dirs.get("/".join(spec.split("/")[i:]))
+                    if members:
+                        edges.update(members)
+                        break
+                else:
+                    if "." in spec.split("/")[0]:
+                        packages.add("/".join(spec.split("/")[:3]))
+            elif language == "cpp" and spec.startswith("./"):
+                target = resolve_relative(path, spec, ("",))
+            if target:
+                edges.add(target)
+        edges.discard(path)
+        graph[path] = edges
+        external.update(packages)
+    return graph, external
+
+
+def import_graph(files: list[dict]) -> dict[str, set[str]]:
+    """{path: paths it imports}, restricted to files inside the repository."""
+    return resolve_imports(files)[0]
+
+
+# ── Per-file facts ───────────────────────────────────────────────────────────
+
+class _PythonComplexity(ast.NodeVisitor):
+    """McCabe complexity per function; nested functions are counted on their own."""
+
+    def __init__(self):
+        self.functions: list[tuple[str, int]] = []
+        self.module_decisions = 0
+        self._stack: list[list] = []
+
+    def _decide(self, amount: int = 1):
+        if self._stack:
+            self._stack[-1][1] += amount
+        else:
+            self.module_decisions += amount
+
+    def _function(self, node):
+        self._stack.append([node.name, 1])
+        self.generic_visit(node)
+        name, score = self._stack.pop()
+        self.functions.append((name, score))
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _function
+
+    def visit_Lambda(self, node):
+        self.generic_visit(node)
+
+    def generic_visit(self, node):
+        if isinstance(node, (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While, ast.ExceptHandler, ast.Assert)):
+            self._decide()
+        elif isinstance(node, ast.BoolOp):
+            self._decide(len(node.values) - 1)
+        elif isinstance(node, ast.comprehension):
+            self._decide(1 + len(node.ifs))
+        elif sys.version_info >= (3, 10) and isinstance(node, ast.match_case):
+            self._decide()
+        super().generic_visit(node)
+
+
+def _python_facts(path: str, source: str) -> dict | None:
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    visitor = _PythonComplexity()
+    visitor.visit(tree)
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            symbols.append(node.name)
+        elif isinstance(node, ast.Assign):
+            symbols += [t.id for t in node.targets if isinstance(t, ast.Name) and t.id.isupper()]
+    max_name, max_score = max(visitor.functions, key=lambda item: item[1], default=(None, 0))
+    return {
+        "functions": len(visitor.functions),
+        "classes": sum(isinstance(n, ast.ClassDef) for n in ast.walk(tree)),
+        "complexity": 1 + visitor.module_decisions + sum(score - 1 for _, score in visitor.functions),
+        "max_complexity": max_score,
+        "max_function": max_name,
+        "symbols": symbols,
+        "imports": _python_imports_from_tree(path, tree),
+        "parser": "ast",
+    }
+
+
+def _tree_sitter_parser(language: str):
+    if language not in _parsers:
+        try:
+            from tree_sitter_language_pack import get_parser
+            _parsers[language] = get_parser(language)
+        except Exception:
+            _parsers[language] = None
+    return _parsers[language]
+
+
+def _node_name(node, source: bytes) -> str | None:
+    name = node.child_by_field_name("name")
+    if name is not None:
+        return source[name.start_byte:name.end_byte].decode("utf-8", errors="ignore")
+    if node.type in ("export_statement", "type_declaration"):
+        for child in node.named_children:
+            found = _node_name(child, source)
+            if found:
+                return found
+    if node.type in ("lexical_declaration", "variable_declaration"):
+        for child in node.named_children:
+            if child.type == "variable_declarator":
+                return _node_name(child, source)
+    if node.type == "function_definition":
+        declarator = node.child_by_field_name("declarator")
+        if declarator is not None:
+            text = source[declarator.start_byte:declarator.end_byte].decode("utf-8", errors="ignore")
+            return text.split("(")[0].strip() or None
+    return None
+
+
+def _tree_sitter_facts(language: str, source: str) -> dict | None:
+    parser = _tree_sitter_parser(language)
+    if parser is None:
+        return None
+    data = source.encode("utf-8")
+    root = parser.parse(data).root_node
+    functions, classes, decisions = [], 0, 0
+    stack = [(root, None)]
+    # Iterative walk: (node, index of the enclosing function in `functions`)
+    while stack:
+        node, owner = stack.pop()
+        if not node.is_named:
+            continue
+        kind = node.type
+        if kind in _TS_FUNCTIONS:
+            functions.append([_node_name(node, data) or "<anonymous>", 1])
+            owner = len(functions) - 1
+        elif kind in _TS_CLASSES:
+            classes += 1
+        elif kind in _TS_DECISIONS or (
+            kind in ("binary_expression", "binary") and any(c.type in _TS_BOOLEAN_OPERATORS for c in node.children)
+        ):
+            decisions += 1
+            if owner is not None:
+                functions[owner][1] += 1
+        stack.extend((child, owner) for child in node.children)
+
+    symbols = [name for name in (_node_name(child, data) for child in root.named_children) if name]
+    max_name, max_score = max(functions, key=lambda item: item[1], default=(None, 0))
+    return {
+        "functions": len(functions),
+        "classes": classes,
+        "complexity": 1 + decisions,
+        "max_complexity": max_score,
+        "max_function": max_name,
+        "symbols": symbols,
+        "parser": "tree-sitter",
+    }
+
+
+def _regex_facts(language: str, source: str) -> dict:
+    pattern = _FUNCTION_PATTERNS.get(language)
+    return {
+        "functions": len(pattern.findall(source)) if pattern else 0,
+        "classes": len(_CLASS_PATTERN.findall(source)),
+        "complexity": 1 + len(_DECISION_PATTERN.findall(source)),
+        "max_complexity": 0,
+        "max_function": None,
+        "symbols": _CLASS_PATTERN.findall(source),
+        "parser": "regex",
+    }
+
+
+def analyze_source(path: str, source: str) -> dict:
+    """Facts for one file."""
+    path = path.replace("\\", "/")
+    language = language_of(path)
+    lines = source.splitlines()
+    comment = LINE_COMMENTS.get(language, "//")
+    facts = {
+        "v": FACTS_VERSION,
+        "language": language,
+        "loc": len(lines),
+        "sloc": sum(1 for line in lines if line.strip() and not line.strip().startswith(comment)),
+        "functions": 0, "classes": 0, "complexity": 0, "max_complexity": 0, "max_function": None,
+        "symbols": [], "imports": [], "parser": None,
+    }
+    if language not in CODE_LANGUAGES:
+        return facts
+    detail = None
+    if language == "python":
+        detail = _python_facts(path, source)
+    else:
+        try:
+            detail = _tree_sitter_facts(language, source)
+        except Exception:
+            detail = None
+    if detail is None:
+        detail = _regex_facts(language, source)
+    detail.setdefault("imports", extract_imports(path, source))
+    detail["symbols"] = detail["symbols"][:MAX_SYMBOLS]
+    detail["imports"] = list(dict.fromkeys(detail["imports"]))[:MAX_IMPORTS]
+    facts.update(detail)
+    return facts
+
+
+def _analyze_item(item: tuple[str, str]) -> dict:
+    return analyze_source(*item)
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool() -> ProcessPoolExecutor:
+    """One pool for the life of the server; spawn avoids forking Flask's threads.
+
+    Workers import only this module (and repo_cache); entry scripts keep the app
+    import under their `__main__` guard so spawn does not load it again.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=STATIC_ANALYSIS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def analyze_files(files: list[dict], sources: dict[str, str] | None = None) -> dict:
+    """Attach `facts` to every file, parsing only blobs with no cached facts.
+
+    `sources` maps blob hash to full text for freshly read files; otherwise the
+    (possibly truncated) `content` is analysed and the facts are marked
+    `truncated` and not cached. Returns {"parsed": n, "cached": n}.
+    """
+    sources = sources or {}
+    store = get_blob_store()
+    pending = [f for f in files if f.get("facts", {}).get("v") != FACTS_VERSION]
+    known = store.get_facts([f["blob"] for f in pending if f.get("blob")])
+    todo: dict[str, tuple[str, str]] = {}
+    untracked = []
+    for f in pending:
+        blob = f.get("blob")
+        facts = known.get(blob)
+        if facts and facts.get("v") == FACTS_VERSION:
+            f["facts"] = facts
+        elif blob:
+            todo.setdefault(blob, (f["file"], sources.get(blob, f["content"])))
+        else:
+            untracked.append(f)
+
+    items = list(todo.values()) + [(f["file"], f["content"]) for f in untracked]
+    if len(items) >= STATIC_ANALYSIS_MIN_PARALLEL and STATIC_ANALYSIS_WORKERS > 1:
+        results = list(_process_pool().map(_analyze_item, items, chunksize=16))
+    else:
+        results = [_analyze_item(item) for item in items]
+
+    computed = dict(zip(todo, results))
+    # Facts from the capped `content` are approximate: flag them and keep them out
+    # of the blob store so a later run with the full text computes exact ones.
+    for blob, facts in computed.items():
+        if blob not in sources:
+            facts["truncated"] = True
+    for facts in results[len(todo):]:
+        facts["truncated"] = True
+    store.put_facts({blob: facts for blob, facts in computed.items() if not facts.get("truncated")})
+    for f in pending:
+        if f.get("blob") in computed:
+            f["facts"] = computed[f["blob"]]
+    for f, facts in zip(untracked, results[len(todo):]):
+        f["facts"] = facts
+    return {"parsed": len(items), "cached": len(files) - len(items)}
+
+
+# ── Repository metrics and reports ───────────────────────────────────────────
+
+def _is_test(path: str) -> bool:
+    return bool(re.search(r"(^|/)(tests?|spec|__tests__)/|(^|/)test_|_test\.|\.spec\.|\.test\.", path))
+
+
+def repo_metrics(files: list[dict], graph: dict[str, set[str]], external: Counter) -> dict:
+    """Aggregate facts into the numbers shown in the metrics report and stored in meta.json."""
+    languages: dict[str, dict] = {}
+    for f in files:
+        facts = f["facts"]
+        entry = languages.setdefault(facts["language"], {"files": 0, "loc": 0, "sloc": 0})
+        entry["files"] += 1
+        entry["loc"] += facts["loc"]
+        entry["sloc"] += facts["sloc"]
+    code = [f for f in files if f["facts"]["language"] in CODE_LANGUAGES]
+    inbound = Counter(target for targets in graph.values() for target in targets)
+    functions = sum(f["facts"]["functions"] for f in code)
+    return {
+        "files": len(files),
+        "code_files": len(code),
+        "loc": sum(f["facts"]["loc"] for f in files),
+        "sloc": sum(f["facts"]["sloc"] for f in code),
+        "functions": functions,
+        "classes": sum(f["facts"]["classes"] for f in code),
+        "complexity_total": sum(f["facts"]["complexity"] for f in code),
+        "complexity_per_function": round(sum(f["facts"]["complexity"] for f in code) / functions, 2) if functions else 0,
+        "test_files": sum(1 for f in code if _is_test(f["file"].replace("\\", "/"))),
+        "truncated_files": sum(1 for f in files if f["facts"].get("truncated")),
+        "internal_import_edges": sum(len(targets) for targets in graph.values()),
+        "languages": dict(sorted(languages.items(), key=lambda item: -item[1]["loc"])),
+        "most_imported": [[path, count] for path, count in inbound.most_common(10)],
+        "most_complex": [
+            [f["file"], f["facts"]["complexity"], f["facts"]["max_function"], f["facts"]["max_complexity"]]
+            for f in sorted(code, key=lambda f: -f["facts"]["complexity"])[:10]
+        ],
+        "external_dependencies": [[name, count] for name, count in external.most_common(30)],
+    }
+
+
+def _complexity_band(score: int) -> str:
+    return "low" if score <= 10 else "medium" if score <= 20 else "high"
+
+
+def format_facts(ranked: list[dict], graph: dict[str, set[str]], metrics: dict, max_files: int = 120) -> str:
+    """Compact, exact facts for the agents, most important files first."""
+    lines = [
+        f"Totals: {metrics['files']} files ({metrics['code_files']} code), {metrics['loc']:,} LOC "
+        f"({metrics['sloc']:,} source), {metrics['functions']} functions, {metrics['classes']} classes, "
+        f"{metrics['test_files']} test files, {metrics['complexity_per_function']} avg cyclomatic complexity per function.",
+        "Languages: " + ", ".join(f"{lang} {v['files']} files/{v['loc']:,} LOC" for lang, v in metrics["languages"].items()),
+        "Most imported: " + (", ".join(f"{p} ({n})" for p, n in metrics["most_imported"]) or "none"),
+        "External packages: " + (", ".join(name for name, _ in metrics["external_dependencies"]) or "none detected"),
+    ]
+    if metrics["truncated_files"]:
+        lines.append(f"Approximate: {metrics['truncated_files']} file(s) were only partly available; their counts are lower bounds.")
+    lines += [
+        "",
+        "path | lang | LOC | fns | classes | CC (max fn) | imports (in repo) | top-level symbols",
+    ]
+    for f in ranked[:max_files]:
+        facts = f["facts"]
+        path = f["file"].replace("\\", "/")
+        worst = f" ({facts['max_function']}={facts['max_complexity']})" if facts["max_function"] else ""
+        lines.append(
+            f"{path} | {facts['language']} | {facts['loc']} | {facts['functions']} | {facts['classes']} | "
+            f"{facts['complexity']}{worst} | {', '.join(sorted(graph.get(path, ()))[:6]) or '-'} | "
+            f"{', '.join(facts['symbols'][:8]) or '-'}"
+        )
+    if len(ranked) > max_files:
+        lines.append(f"... {len(ranked) - max_files} more file(s)")
+    return "\n".join(lines)
+
+
+def metrics_report(ranked: list[dict], graph: dict[str, set[str]], metrics: dict, structure: dict, primary_stack: str) -> str:
+    """Markdown report built purely from static analysis (the local fallback)."""
+    entry_points = [f["file"] for f in ranked if posixpath.splitext(posixpath.basename(f["file"]))[0].lower()
+                    in ("main", "app", "__main__", "manage", "server", "index", "cli", "wsgi", "asgi")]
+    most_imported = metrics["most_imported"]
+
+    what = (
+        "## 📌 What the Project Does\n\n"
+        "This is a local fallback summary generated from static analysis because remote LLMs were unavailable "
+        "or disabled. "
+        + (
+            f"The numbers below are exact except for {metrics['truncated_files']} file(s) that were only partly "
+            "available, whose counts are lower bounds; "
+            if metrics["truncated_files"] else "The numbers below are exact; "
+        )
+        + "no prose was generated by a model.\n\n"
+        f"- Primary stack: **{primary_stack}**\n"
+        f"- {metrics['files']} files analysed ({metrics['code_files']} source files) across {len(structure)} folder(s)\n"
+        f"- Entry points: {', '.join(f'`{p}`' for p in entry_points[:8]) or 'none detected'}\n"
+    )
+    architecture = (
+        "## 🧱 System Architecture Overview\n\n"
+        f"The internal import graph has {metrics['internal_import_edges']} edge(s).\n\n"
+        "Core modules (most imported):\n"
+        + ("".join(f"- `{path}` — imported by {count} file(s)\n" for path, count in most_imported) or "- none detected\n")
+    )
+    folders = "## 📂 Folder-by-Folder Explanation\n\n" + "".join(
+        f"- `{folder}` — {len(names)} file(s): {', '.join(sorted(names)[:10])}{' …' if len(names) > 10 else ''}\n"
+        for folder, names in sorted(structure.items())
+    )
+    modules = ["## ⚙️ Key Modules Breakdown\n"]
+    for f in [f for f in ranked if f["facts"]["language"] in CODE_LANGUAGES][:25]:
+        facts = f["facts"]
+        path = f["file"].replace("\\", "/")
+        modules.append(
+            f"### `{path}`\n\n"
+            f"- {facts['language']}, {facts['loc']} LOC, {facts['functions']} function(s), {facts['classes']} class(es)\n"
+            f"- Cyclomatic complexity {facts['complexity']} ({_complexity_band(facts['max_complexity'])}"
+            + (f"; most complex: `{facts['max_function']}` = {facts['max_complexity']}" if facts["max_function"] else "")
+            + ")\n"
+            f"- Top-level symbols: {', '.join(f'`{s}`' for s in facts['symbols'][:12]) or 'none'}\n"
+            f"- Depends on: {', '.join(f'`{p}`' for p in sorted(graph.get(path, ()))) or 'no internal modules'}\n"
+        )
+    dependencies = "## 🔗 Dependencies\n\n" + (
+        "".join(f"- `{name}` — imported by {count} file(s)\n" for name, count in metrics["external_dependencies"])
+        or "- No external packages detected.\n"
+    )
+
+    recommendations = ["## 🚀 Recommendations\n"]
+    hotspots = [row for row in metrics["most_complex"] if row[3] > 10]
+    if hotspots:
+        recommendations.append(
+            "- **Code Quality**: split the most complex functions: "
+            + ", ".join(f"`{fn}` in `{path}` (CC {cc})" for path, _total, fn, cc in hotspots[:5]) + ".\n"
+        )
+    if not metrics["test_files"]:
+        recommendations.append("- **Testing**: no test files were found; start with the most imported modules listed above.\n")
+    recommendations.append("- Add an API key for an LLM provider or increase quota to enable full analysis.\n")
+
+    languages = "".join(
+        f"| {lang} | {v['files']} | {v['loc']:,} | {v['sloc']:,} |\n" for lang, v in metrics["languages"].items()
+    )
+    complex_rows = "".join(
+        f"| `{path}` | {total} | {fn or '-'} | {cc} |\n" for path, total, fn, cc in metrics["most_complex"]
+    )
+    technical = (
+        "## 📊 Technical Metrics\n\n"
+        f"- Lines of code: {metrics['loc']:,} ({metrics['sloc']:,} source lines in code files)\n"
+        f"- Functions: {metrics['functions']} · Classes: {metrics['classes']}\n"
+        f"- Average cyclomatic complexity per function: {metrics['complexity_per_function']}\n"
+        f"- Test files: {metrics['test_files']}\n\n"
+        "| Language | Files | LOC | Source LOC |\n|---|---|---|---|\n" + languages + "\n"
+        "| Most complex file | Total CC | Worst function | Function CC |\n|---|---|---|---|\n" + complex_rows
+    )
+    return "\n".join([what, architecture, folders, "\n".join(modules), dependencies, "".join(recommendations), technical])
@@ -1,8 +1,14 @@
 # Personalized News Digest Generator — Streamlit + Groq + feedparser
 # Save as app.py, add GROQ_API_KEY to .streamlit/secrets.toml, then: streamlit run app.py
 
+import hashlib
+import json
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Iterator, Optional
 
 import feedparser
 import httpx
@@ -11,6 +17,10 @@ import truststore
 
 MAX_ARTICLES = 8
 MAX_ARTICLE_CHARS = 1200
+MAX_STORIES = 5  # slider maximum; feeds are cached at this depth and sliced per run
+FEED_TTL_SECONDS = 600
+DIGEST_TTL_SECONDS = 3600
+SECTION_WORKERS = 4  # parallel Groq calls in per-topic mode
 
 st.set_page_config(page_title="Personalized News Digest", layout="centered")
 st.title("Personalized News Digest")
@@ -32,6 +42,17 @@ def _groq_client():
     )
 
 
+@st.cache_resource
+def _http_client():
+    # One pooled client for every feed request, reused across reruns and sessions
+    return httpx.Client(
+        verify=_ssl_ctx,
+        timeout=15,
+        follow_redirects=True,
+        headers={"User-Agent": "Mozilla/5.0 (compatible; NewsDigest/1.0)"},
+    )
+
+
 _MODEL = "llama-3.3-70b-versatile"
 
 RSS_FEEDS = {
@@ -52,6 +73,113 @@ TONES = {
     "Casual": "Write in a conversational, engaging tone like you're explaining to a friend.",
 }
 
+
+# ── Cached data ────────────────────────────────────────────────────────────────
+@st.cache_data(ttl=FEED_TTL_SECONDS, show_spinner=False)
+def fetch_feed(feed_url: str) -> list[dict]:
+    """Top MAX_STORIES entries of a feed. Errors are raised, so they are not cached."""
+    resp = _http_client().get(feed_url)
+    resp.raise_for_status()
+    feed = feedparser.parse(resp.content)
+    items = []
+    for entry in feed.entries[:MAX_STORIES]:
+        title = entry.get("title", "No title")
+        summary = entry.get("summary", entry.get("description", ""))[:MAX_ARTICLE_CHARS]
+        link = entry.get("link", "")
+        items.append({"title": title, "summary": summary, "link": link})
+    return items
+
+
+def fetch_topics(topics: list[str], num_stories: int) -> dict[str, list[dict]]:
+    """Fetch the topics' feeds concurrently; cached feeds return without a request."""
+
+    def fetch(topic: str) -> list[dict]:
+        try:
+            return fetch_feed(RSS_FEEDS[topic])[:num_stories]
+        except Exception:
+            return []
+
+    if not topics:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(topics)) as pool:
+        results = list(pool.map(fetch, topics))
+    return {topic: items for topic, items in zip(topics, results)}
+
+
+def articles_hash(articles_by_topic: dict[str, list[dict]]) -> str:
+    payload = json.dumps(articles_by_topic, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@st.cache_resource
+def _digest_cache() -> dict:
+    # Finished LLM outputs, shared across reruns and sessions: key -> (created, text).
+    # st.cache_data cannot cache a stream, so outputs are stored once fully received.
+    return {"lock": threading.Lock(), "entries": {}}
+
+
+def cached_output(key: tuple) -> Optional[str]:
+    cache = _digest_cache()
+    with cache["lock"]:
+        hit = cache["entries"].get(key)
+    if hit and time.time() - hit[0] < DIGEST_TTL_SECONDS:
+        return hit[1]
+    return None
+
+
+def remember_output(key: tuple, text: str) -> None:
+    cache = _digest_cache()
+    now = time.time()
+    with cache["lock"]:
+        entries = cache["entries"]
+        for old in [k for k, (created, _) in entries.items() if now - created >= DIGEST_TTL_SECONDS]:
+            del entries[old]
+        entries[key] = (now, text)
+
+
+def complete(system_msg: str, user_msg: str) -> str:
+    resp = _groq_client().chat.completions.create(
+        model=_MODEL,
+        messages=[
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_msg},
+        ],
+    )
+    return resp.choices[0].message.content
+
+
+def stream_completion(system_msg: str, user_msg: str) -> Iterator[str]:
+    stream = _groq_client().chat.completions.create(
+        model=_MODEL,
+        messages=[
+            {"role": "system", "content": system_msg},
+            {"role": "user", "content": user_msg},
+        ],
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def write_cached_stream(key: tuple, system_msg: str, user_msg: str) -> str:
+    """Render from cache, or stream the Groq response token by token and cache it."""
+    text = cached_output(key)
+    if text is not None:
+        st.markdown(text)
+        return text
+    text = st.write_stream(stream_completion(system_msg, user_msg))
+    remember_output(key, text)
+    return text
+
+
+def format_articles(topic: str, items: list[dict]) -> str:
+    text = f"\n## {topic}\n"
+    for i, item in enumerate(items, 1):
+        text += f"{i}. {item['title']}\n{item['summary']}\n\n"
+    return text
+
+
 # ── Settings ───────────────────────────────────────────────────────────────────
 with st.sidebar:
     st.header("Preferences")
@@ -61,11 +189,17 @@ with st.sidebar:
         default=["Technology", "AI & Machine Learning"],
     )
     tone = st.selectbox("Reading style", list(TONES.keys()))
-    num_stories = st.slider("Stories per topic", 1, 5, 3)
+    num_stories = st.slider("Stories per topic", 1, MAX_STORIES, 3)
     custom_topics = st.text_input(
         "Custom topic (optional)",
         placeholder="e.g. climate change, crypto",
     )
+    mode = st.radio(
+        "Generation",
+        ["Single digest", "Per topic (parallel)"],
+        help="Single digest streams one response. Per topic summarizes each topic "
+        "in parallel and shows each section as soon as it is ready.",
+    )
 
 generate_btn = st.button("Generate My Digest", type="primary", use_container_width=True)
 
@@ -75,38 +209,19 @@ if generate_btn:
         st.stop()
 
     # ── Fetch RSS articles ─────────────────────────────────────────────────────
-    articles_by_topic: dict[str, list[dict]] = {}
-
-    http_client = httpx.Client(verify=_ssl_ctx, timeout=15, follow_redirects=True,
-                               headers={"User-Agent": "Mozilla/5.0 (compatible; NewsDigest/1.0)"})
-
     with st.spinner("Fetching latest news…"):
-        for topic in selected_topics:
-            feed_url = RSS_FEEDS[topic]
-            try:
-                resp = http_client.get(feed_url)
-                feed = feedparser.parse(resp.content)
-                entries = feed.entries[:num_stories]
-                items = []
-                for entry in entries:
-                    title = entry.get("title", "No title")
-                    summary = entry.get("summary", entry.get("description", ""))[:MAX_ARTICLE_CHARS]
-                    link = entry.get("link", "")
-                    items.append({"title": title, "summary": summary, "link": link})
-                if items:
-                    articles_by_topic[topic] = items
-            except Exception:
-                articles_by_topic[topic] = []
+        articles_by_topic = {
+            topic: items
+            for topic, items in fetch_topics(selected_topics, num_stories).items()
+            if items
+        }
 
     # ── Build prompt ───────────────────────────────────────────────────────────
-    articles_text = ""
-    for topic, items in articles_by_topic.items():
-        articles_text += f"\n## {topic}\n"
-        for i, item in enumerate(items, 1):
-            articles_text += f"{i}. {item['title']}\n{item['summary']}\n\n"
+    articles_text = "".join(format_articles(topic, items) for topic, items in articles_by_topic.items())
 
     tone_instruction = TONES[tone]
     today = datetime.now().strftime("%B %d, %Y")
+    custom = custom_topics.strip()
 
     system_msg = (
         f"You are a professional news curator creating a personalized digest for {today}. "
@@ -119,35 +234,124 @@ if generate_btn:
     )
     user_msg = f"Here are today's articles:\n{articles_text[:10000]}"
 
-    if custom_topics.strip():
+    if custom:
         user_msg += f"\n\nAlso include a brief section on: {custom_topics} (based on your training data, clearly labeled as 'General Knowledge')."
 
-    with st.spinner("Generating your digest…"):
-        try:
-            resp = _groq_client().chat.completions.create(
-                model=_MODEL,
-                messages=[
-                    {"role": "system", "content": system_msg},
-                    {"role": "user", "content": user_msg},
-                ],
+    try:
+        st.markdown(f"## Your News Digest — {today}")
+
+        if mode == "Single digest":
+            # ── One streamed response ──────────────────────────────────────────
+            digest = write_cached_stream(
+                ("digest", articles_hash(articles_by_topic), tone, tuple(selected_topics), custom, today),
+                system_msg,
+                user_msg,
             )
-            digest = resp.choices[0].message.content
-
-            st.markdown(f"## Your News Digest — {today}")
-            st.markdown(digest)
-
-            st.divider()
-            st.caption("Sources")
-            for topic, items in articles_by_topic.items():
-                for item in items:
-                    if item["link"]:
-                        st.markdown(f"- [{item['title']}]({item['link']})")
-
-            st.download_button(
-                "Download Digest (.txt)",
-                data=digest,
-                file_name=f"digest_{datetime.now().strftime('%Y%m%d')}.txt",
-                mime="text/plain",
+        else:
+            # ── One call per topic, in parallel; sections appear as they finish ─
+            section_msg = (
+                f"You are a professional news curator writing one section of a personalized digest for {today}. "
+                f"Tone: {tone_instruction}\n\n"
+                "Start with the topic as a '## ' heading, then write:\n"
+                "1. A 1-sentence section intro\n"
+                "2. Each story as: **[Story title]** — [2-3 sentence summary focusing on why it matters]\n\n"
+                "Only use information from the provided articles. Do not invent facts."
             )
-        except Exception as exc:
-            st.error(f"Error generating digest: {exc}")
+            jobs = {
+                topic: (
+                    ("section", articles_hash({topic: items}), tone, topic, today),
+                    section_msg,
+                    f"Here are today's articles:\n{format_articles(topic, items)[:10000]}",
+                )
+                for topic, items in articles_by_topic.items()
+            }
+            if custom:
+                jobs[custom] = (
+                    ("section", "general-knowledge", tone, custom, today),
+                    (
+                        f"You are a professional news curator writing one section of a personalized digest for {today}. "
+                        f"Tone: {tone_instruction}\n\n"
+                        "Start with the topic as a '## ' heading, then write a short overview."
+                    ),
+                    f"Write a brief section on: {custom_topics} (based on your training data, "
+                    "clearly labeled as 'General Knowledge').",
+                )
+
+            def run_section(name: str) -> tuple[str, float, bool]:
+                started = time.perf_counter()
+                key, system, user = jobs[name]
+                text = cached_output(key)
+                if text is not None:
+                    return text, time.perf_counter() - started, True
+                text = complete(system, user)
+                remember_output(key, text)
+                return text, time.perf_counter() - started, False
+
+            placeholders = {name: st.empty() for name in jobs}
+            for name, placeholder in placeholders.items():
+                placeholder.info(f"Summarizing {name}…")
+
+            sections: dict[str, str] = {}
+            timings: list[dict] = []
+            started = time.perf_counter()
+            if jobs:
+                with ThreadPoolExecutor(max_workers=min(SECTION_WORKERS, len(jobs))) as pool:
+                    futures = {pool.submit(run_section, name): name for name in jobs}
+                    for future in as_completed(futures):
+                        name = futures[future]
+                        try:
+                            text, seconds, hit = future.result()
+                        except Exception as exc:
+                            text, seconds, hit = f"## {name}\n_Could not summarize this topic: {exc}_", 0.0, False
+                        sections[name] = text
+                        placeholders[name].markdown(text)
+                        timings.append({
+                            "section": name,
+                            "seconds": round(seconds, 2),
+                            "ready after": round(time.perf_counter() - started, 2),
+                            "cached": hit,
+                        })
+
+            # ── Cross-topic takeaway, streamed once the sections exist ─────────
+            ordered = [sections[name] for name in jobs]
+            takeaway_key = ("takeaway", hashlib.sha256("\n\n".join(ordered).encode("utf-8")).hexdigest(), tone, today)
+            takeaway_cached = cached_output(takeaway_key) is not None
+            takeaway_started = time.perf_counter()
+            takeaway = write_cached_stream(
+                takeaway_key,
+                f"You are a professional news curator. Tone: {tone_instruction}\n\n"
+                "Write a '## Key Takeaway' section with 2-3 cross-topic insights drawn only from "
+                "the digest sections provided.",
+                "\n\n".join(ordered)[:10000],
+            )
+            timings.append({
+                "section": "Key Takeaway",
+                "seconds": round(time.perf_counter() - takeaway_started, 2),
+                "ready after": round(time.perf_counter() - started, 2),
+                "cached": takeaway_cached,
+            })
+            digest = "\n\n".join(ordered + [takeaway])
+
+            with st.expander("Section timings"):
+                st.dataframe(timings, hide_index=True, width="stretch")
+                serial = sum(row["seconds"] for row in timings)
+                st.caption(
+                    f"Total {time.perf_counter() - started:.1f}s; "
+                    f"the same calls one after another: {serial:.1f}s"
+                )
+
+        st.divider()
+        st.caption("Sources")
+        for topic, items in articles_by_topic.items():
+            for item in items:
+                if item["link"]:
+                    st.markdown(f"- [{item['title']}]({item['link']})")
+
+        st.download_button(
+            "Download Digest (.txt)",
+            data=digest,
+            file_name=f"digest_{datetime.now().strftime('%Y%m%d')}.txt",
+            mime="text/plain",
+        )
+    except Exception as exc:
+        st.error(f"Error generating digest: {exc}")
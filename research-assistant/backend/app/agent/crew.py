@@ -1,6 +1,10 @@
+import asyncio
 import json
 import re
 import os
+import time
+from typing import AsyncIterator
+
 from crewai import Agent, Crew, Process, LLM
 
 from app.agent.config import (
@@ -185,6 +189,119 @@ class ResearchCrew:
 
         return {"answer": final_answer, "sources": sources[:10]}
 
+    async def stream(self, query: str) -> AsyncIterator[dict]:
+        """Streaming variant of run() for /query/stream.
+
+        Skips the CrewAI agents (whose output only exists once a kickoff finishes) and
+        drives the same tools directly, yielding an event after every stage and then
+        the synthesized answer token by token. Each event is a dict with an `event`
+        name and a JSON-serializable `data` payload.
+        """
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+
+        def _mark(stage: str, since: float) -> int:
+            elapsed = round((time.perf_counter() - since) * 1000)
+            timings[stage] = elapsed
+            logger.info(f"[STREAM] stage={stage} elapsed_ms={elapsed} query={query[:60]!r}")
+            return elapsed
+
+        # --- Step 1: Retrieval ---
+        t0 = time.perf_counter()
+        try:
+            retrieval = await asyncio.to_thread(self.retriever.retrieve, query)
+        except Exception as e:
+            logger.error(f"Streaming retrieval failed: {e}", exc_info=True)
+            retrieval = {"context": "", "documents": [], "has_relevant": False}
+        yield {
+            "event": "retrieval",
+            "data": {
+                "has_relevant": retrieval["has_relevant"],
+                "num_chunks": len(retrieval["documents"]),
+                "best_score": retrieval.get("best_score"),
+                "elapsed_ms": _mark("retrieval", t0),
+            },
+        }
+
+        # --- Step 2: Web Research ---
+        summaries: list[dict] = []
+        if not retrieval["has_relevant"]:
+            from app.web.scraper import scrape_urls_async
+
+            t0 = time.perf_counter()
+            results = await self.searcher.search_async(query)
+            results = results[:4]
+            yield {
+                "event": "sources",
+                "data": {
+                    "sources": [{"url": r["url"], "title": r.get("title", "")} for r in results],
+                    "elapsed_ms": _mark("search", t0),
+                },
+            }
+
+            t0 = time.perf_counter()
+            pages = dict(await scrape_urls_async([r["url"] for r in results]))
+            _mark("scrape", t0)
+
+            async def _summarize(item: dict) -> dict:
+                text = pages.get(item["url"]) or ""
+                if text:
+                    summary = await asyncio.to_thread(
+                        self.summarizer.summarize_web_content, text, query
+                    )
+                else:
+                    summary = item.get("snippet", "")
+                return {"url": item["url"], "title": item.get("title", ""), "summary": summary}
+
+            t0 = time.perf_counter()
+            for next_done in asyncio.as_completed([_summarize(r) for r in results]):
+                item = await next_done
+                if not item["summary"]:
+                    continue
+                summaries.append(item)
+                yield {
+                    "event": "summary",
+                    "data": {**item, "elapsed_ms": round((time.perf_counter() - t0) * 1000)},
+                }
+            _mark("summarize", t0)
+
+            if summaries:
+                await asyncio.to_thread(
+                    self.memory.add_documents,
+                    [s["summary"] for s in summaries],
+                    [{"source": s["url"]} for s in summaries],
+                )
+
+        # --- Step 3: Synthesis ---
+        t0 = time.perf_counter()
+        first_token_ms = None
+        answer_parts: list[str] = []
+        try:
+            async for token in self.summarizer.stream_answer(query, retrieval["context"], summaries):
+                if first_token_ms is None:
+                    first_token_ms = round((time.perf_counter() - started) * 1000)
+                    timings["time_to_first_token"] = first_token_ms
+                    logger.info(f"[STREAM] time_to_first_token_ms={first_token_ms}")
+                answer_parts.append(token)
+                yield {"event": "token", "data": {"text": token}}
+        except Exception as e:
+            logger.error(f"Streaming synthesis failed: {e}", exc_info=True)
+            yield {"event": "error", "data": {"detail": f"Synthesis error: {e}"}}
+        _mark("synthesis", t0)
+
+        answer = "".join(answer_parts)
+        combined_text = retrieval["context"] + " " + answer
+        sources = [s["url"] for s in summaries]
+        for url in self._extract_sources(combined_text):
+            if url not in sources:
+                sources.append(url)
+        _mark("total", started)
+
+        yield {
+            "event": "done",
+            "data": {"answer": answer, "sources": sources[:10], "timings_ms": timings},
+        }
+
     def _fallback_web_search(self, query: str) -> str:
         print("[CREW] Running fallback direct web search...")
         try:
@@ -1,4 +1,5 @@
 import os
+import json
 import asyncio
 from contextlib import asynccontextmanager
 
@@ -8,6 +9,7 @@ load_dotenv()
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.agent.crew import ResearchCrew
@@ -98,6 +100,40 @@ async def query(request: QueryRequest):
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
 
 
+def _sse(event: str, data: dict) -> str:
+    # allow_nan=False: a stray NaN/Infinity would be invalid JSON for the browser's JSON.parse
+    return f"event: {event}\ndata: {json.dumps(data, allow_nan=False)}\n\n"
+
+
+@app.post("/query/stream")
+async def query_stream(request: QueryRequest):
+    """Server-sent events: retrieval / sources / summary stages, then answer tokens, then done."""
+    if crew is None:
+        raise HTTPException(status_code=503, detail="Research crew not initialized")
+
+    question = request.question.strip()
+    if not question:
+        raise HTTPException(status_code=400, detail="Question cannot be empty")
+
+    print(f"\n{'='*50}")
+    print(f"[QUERY/STREAM] {question}")
+    print(f"{'='*50}")
+
+    async def event_source():
+        try:
+            async for item in crew.stream(question):
+                yield _sse(item["event"], item["data"])
+        except Exception as e:
+            logger.error(f"Streaming query failed: {e}", exc_info=True)
+            yield _sse("error", {"detail": f"Processing error: {str(e)}"})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/test-groq")
 async def test_groq():
     """Quick smoke-test: calls Groq directly and returns the response."""
@@ -123,4 +159,5 @@ async def root():
         "docs": "/docs",
         "health": "/health",
         "query_endpoint": "POST /query",
+        "stream_endpoint": "POST /query/stream",
     }
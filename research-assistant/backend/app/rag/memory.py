@@ -1,13 +1,16 @@
 import os
 import json
+import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.rag.embeddings import get_embeddings
+from app.rag.hybrid import BM25Index, CrossEncoderReranker, LRUCache, reciprocal_rank_fusion
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -15,14 +18,26 @@ logger = get_logger(__name__)
 VECTOR_STORE_PATH = os.getenv("VECTOR_STORE_PATH", "./data/vector_store")
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "800"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "100"))
+HYBRID_VECTOR_WEIGHT = float(os.getenv("HYBRID_VECTOR_WEIGHT", "1.0"))
+HYBRID_KEYWORD_WEIGHT = float(os.getenv("HYBRID_KEYWORD_WEIGHT", "1.0"))
+HYBRID_FETCH_K = int(os.getenv("HYBRID_FETCH_K", "20"))
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "256"))
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "")
 
 
 class KnowledgeMemory:
-    def __init__(self):
-        self.embeddings = get_embeddings()
-        self.store_path = Path(VECTOR_STORE_PATH)
+    def __init__(self, embeddings=None, store_path: str | None = None):
+        self.embeddings = embeddings or get_embeddings()
+        self.store_path = Path(store_path or VECTOR_STORE_PATH)
         self.store_path.mkdir(parents=True, exist_ok=True)
         self.vectorstore: FAISS | None = None
+        self.keyword_index = BM25Index()
+        self._id_to_position: dict[str, int] = {}
+        # Query embeddings do not depend on the corpus, so they survive inserts;
+        # fused results do not and are dropped on every add_documents().
+        self.embedding_cache = LRUCache(QUERY_CACHE_SIZE)
+        self.result_cache = LRUCache(QUERY_CACHE_SIZE)
+        self.reranker = CrossEncoderReranker(RERANKER_MODEL) if RERANKER_MODEL else None
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=CHUNK_SIZE,
             chunk_overlap=CHUNK_OVERLAP,
@@ -46,6 +61,21 @@ class KnowledgeMemory:
         else:
             logger.info("No existing vector store found. Will create on first insert.")
 
+        if self.vectorstore is not None:
+            self._index_new_chunks()
+
+    def _index_new_chunks(self):
+        """Mirror any FAISS chunks not yet in the keyword index (BM25 is rebuilt, not persisted)."""
+        docstore = self.vectorstore.docstore
+        for position, doc_id in self.vectorstore.index_to_docstore_id.items():
+            if doc_id in self._id_to_position:
+                continue
+            self._id_to_position[doc_id] = position
+            doc = docstore.search(doc_id)
+            if isinstance(doc, Document):
+                self.keyword_index.add(doc_id, doc.page_content)
+        logger.debug(f"Keyword index holds {len(self.keyword_index)} chunks")
+
     def add_documents(self, texts: list[str], metadatas: list[dict] | None = None) -> int:
         if not texts:
             return 0
@@ -65,11 +95,14 @@ class KnowledgeMemory:
         if not docs:
             return 0
 
+        ids = [str(uuid.uuid4()) for _ in docs]
         if self.vectorstore is None:
-            self.vectorstore = FAISS.from_documents(docs, self.embeddings)
+            self.vectorstore = FAISS.from_documents(docs, self.embeddings, ids=ids)
         else:
-            self.vectorstore.add_documents(docs)
+            self.vectorstore.add_documents(docs, ids=ids)
 
+        self._index_new_chunks()
+        self.result_cache.clear()
         self._save()
         logger.info(f"Stored {len(docs)} chunks from {len(texts)} documents")
         return len(docs)
@@ -91,6 +124,99 @@ class KnowledgeMemory:
             logger.error(f"Similarity search failed: {e}")
             return []
 
+    def embed_query(self, query: str) -> list[float]:
+        cached = self.embedding_cache.get(query)
+        if cached is None:
+            cached = self.embeddings.embed_query(query)
+            self.embedding_cache.put(query, cached)
+        return cached
+
+    def hybrid_search(self, query: str, k: int = 4, fetch_k: int | None = None) -> list[dict]:
+        """Fuse FAISS and BM25 rankings (reciprocal rank fusion), optionally rerank, return top k.
+
+        Each hit is a dict with the `document`, its L2 `distance` to the query embedding
+        (None if unknown), `bm25` score, keyword `coverage` (fraction of query terms present)
+        and `fused` score.
+        """
+        if self.vectorstore is None:
+            logger.info("Vector store empty — no results")
+            return []
+
+        cache_key = (query, k, fetch_k)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        fetch_k = max(fetch_k or HYBRID_FETCH_K, k)
+        try:
+            query_vector = np.asarray([self.embed_query(query)], dtype=np.float32)
+            distances, positions = self.vectorstore.index.search(query_vector, fetch_k)
+        except Exception as e:
+            logger.error(f"Vector search failed: {e}")
+            return []
+
+        index_to_id = self.vectorstore.index_to_docstore_id
+        vector_hits = {
+            index_to_id[int(pos)]: float(dist)
+            for dist, pos in zip(distances[0], positions[0])
+            if pos != -1 and int(pos) in index_to_id
+        }
+        keyword_hits = {
+            doc_id: (score, coverage)
+            for doc_id, score, coverage in self.keyword_index.search(query, fetch_k)
+        }
+
+        fused = reciprocal_rank_fusion(
+            [list(vector_hits), list(keyword_hits)],
+            weights=[HYBRID_VECTOR_WEIGHT, HYBRID_KEYWORD_WEIGHT],
+        )
+        candidates = sorted(fused, key=fused.get, reverse=True)[:fetch_k]
+
+        hits = []
+        for doc_id in candidates:
+            doc = self.vectorstore.docstore.search(doc_id)
+            if not isinstance(doc, Document):
+                continue
+            distance = vector_hits.get(doc_id)
+            if distance is None:
+                distance = self._distance_to(query_vector[0], doc_id)
+            bm25, coverage = keyword_hits.get(doc_id, (0.0, 0.0))
+            hits.append({
+                "document": doc,
+                "distance": distance,
+                "bm25": bm25,
+                "coverage": coverage,
+                "fused": fused[doc_id],
+            })
+
+        if self.reranker is not None and hits:
+            try:
+                scores = self.reranker.score(query, [h["document"].page_content for h in hits])
+                for hit, score in zip(hits, scores):
+                    hit["rerank"] = score
+                hits.sort(key=lambda h: h["rerank"], reverse=True)
+            except Exception as e:
+                logger.warning(f"Reranking failed, keeping fused order: {e}")
+
+        hits = hits[:k]
+        self.result_cache.put(cache_key, hits)
+        logger.debug(
+            f"Hybrid search: {len(vector_hits)} vector + {len(keyword_hits)} keyword "
+            f"candidates -> {len(hits)} for query: {query[:60]}..."
+        )
+        return hits
+
+    def _distance_to(self, query_vector: np.ndarray, doc_id: str) -> float | None:
+        """L2 distance for a keyword-only hit, matching what FAISS would have reported.
+
+        None when the vector cannot be reconstructed (the hit then only counts on keywords).
+        """
+        try:
+            stored = self.vectorstore.index.reconstruct(self._id_to_position[doc_id])
+            return float(np.sum((query_vector - stored) ** 2))
+        except Exception:
+            return None
+
     def _save(self):
         try:
             self.vectorstore.save_local(str(self.store_path))
@@ -1,6 +1,6 @@
 import os
-from langchain_core.documents import Document
 
+from app.rag.hybrid import tokenize
 from app.rag.memory import KnowledgeMemory
 from app.utils.logger import get_logger
 
@@ -10,6 +10,22 @@ MIN_SIMILARITY_SCORE = float(os.getenv("MIN_SIMILARITY_SCORE", "0.3"))
 
 # FAISS L2 distance: lower = more similar. Score > threshold = weak match.
 FAISS_DISTANCE_THRESHOLD = 1.0
+STRONG_DISTANCE_THRESHOLD = 0.6
+
+# Share of query terms a chunk must contain to count as a keyword match even when
+# its embedding is far away (error codes, product names, acronyms...).
+KEYWORD_COVERAGE_THRESHOLD = float(os.getenv("KEYWORD_COVERAGE_THRESHOLD", "0.75"))
+# Single-term queries are left to the vector score: one shared word proves little.
+MIN_KEYWORD_TERMS = 2
+
+
+def _best_distance(hits: list[dict]) -> float | None:
+    distances = [hit["distance"] for hit in hits if hit["distance"] is not None]
+    return min(distances) if distances else None
+
+
+def _fmt(score: float | None) -> str:
+    return "n/a" if score is None else f"{score:.3f}"
 
 
 class RAGRetriever:
@@ -21,33 +37,51 @@ class RAGRetriever:
             logger.info("Knowledge base is empty")
             return {"context": "", "documents": [], "has_relevant": False}
 
-        results = self.memory.similarity_search(query, k=k)
+        hits = self.memory.hybrid_search(query, k=k)
 
-        if not results:
+        if not hits:
             return {"context": "", "documents": [], "has_relevant": False}
 
-        strong_results = [
-            (doc, score) for doc, score in results if score <= FAISS_DISTANCE_THRESHOLD
+        coverage_threshold = (
+            KEYWORD_COVERAGE_THRESHOLD
+            if len(set(tokenize(query))) >= MIN_KEYWORD_TERMS
+            else float("inf")
+        )
+        strong_hits = [
+            hit for hit in hits
+            if (hit["distance"] is not None and hit["distance"] <= FAISS_DISTANCE_THRESHOLD)
+            or hit["coverage"] >= coverage_threshold
         ]
 
-        if not strong_results:
-            logger.info(f"No results above similarity threshold (best score: {results[0][1]:.3f})")
+        if not strong_hits:
+            logger.info(f"No results above similarity threshold (best score: {_fmt(_best_distance(hits))})")
             return {"context": "", "documents": [], "has_relevant": False}
 
         context_parts = []
         documents = []
-        for doc, score in strong_results:
+        for hit in strong_hits:
+            doc = hit["document"]
             source = doc.metadata.get("source", "unknown")
             context_parts.append(f"[Source: {source}]\n{doc.page_content}")
-            documents.append({"content": doc.page_content, "source": source, "score": score})
+            documents.append({
+                "content": doc.page_content,
+                "source": source,
+                "score": hit["distance"],
+                "bm25": hit["bm25"],
+                "fused": hit["fused"],
+            })
 
         context = "\n\n---\n\n".join(context_parts)
-        best_score = strong_results[0][1]
-        has_relevant = best_score <= 0.6
+        best_score = _best_distance(strong_hits)
+        best_coverage = max(hit["coverage"] for hit in strong_hits)
+        has_relevant = (
+            (best_score is not None and best_score <= STRONG_DISTANCE_THRESHOLD)
+            or best_coverage >= coverage_threshold
+        )
 
         logger.info(
-            f"Retrieved {len(strong_results)} chunks. Best score: {best_score:.3f}. "
-            f"Has relevant: {has_relevant}"
+            f"Retrieved {len(strong_hits)} chunks. Best score: {_fmt(best_score)}. "
+            f"Best keyword coverage: {best_coverage:.2f}. Has relevant: {has_relevant}"
         )
 
         return {
@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from app.utils.logger import get_logger
@@ -47,12 +49,12 @@ class Summarizer:
             logger.error(f"Summarization failed: {e}")
             return truncated[:max_length]
 
-    def synthesize_answer(
+    def _synthesis_messages(
         self,
         query: str,
         rag_context: str,
         web_summaries: list[dict],
-    ) -> dict:
+    ) -> tuple[list, list[str]]:
         sources = []
         web_context_parts = []
 
@@ -89,6 +91,15 @@ class Summarizer:
                 content=f"Question: {query}\n\nContext:\n{context_block}"
             ),
         ]
+        return messages, sources
+
+    def synthesize_answer(
+        self,
+        query: str,
+        rag_context: str,
+        web_summaries: list[dict],
+    ) -> dict:
+        messages, sources = self._synthesis_messages(query, rag_context, web_summaries)
 
         try:
             response = self.llm.invoke(messages)
@@ -102,3 +113,15 @@ class Summarizer:
                 "answer": "I encountered an error generating the answer. Please try again.",
                 "sources": sources,
             }
+
+    async def stream_answer(
+        self,
+        query: str,
+        rag_context: str,
+        web_summaries: list[dict],
+    ) -> AsyncIterator[str]:
+        """Same prompt as synthesize_answer, yielded token-by-token from the Groq stream."""
+        messages, _ = self._synthesis_messages(query, rag_context, web_summaries)
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                yield chunk.content
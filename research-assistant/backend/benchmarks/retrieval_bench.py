@@ -0,0 +1,167 @@
+"""
+Offline retrieval eval + latency benchmark over a synthetic corpus.
+
+Compares plain FAISS search (KnowledgeMemory.similarity_search) with the hybrid
+BM25 + vector engine (KnowledgeMemory.hybrid_search) on two query sets:
+
+  semantic  — paraphrased questions about a topic
+  keyword   — questions built around rare identifiers (error codes, part numbers)
+
+Run from backend/:
+
+    python -m benchmarks.retrieval_bench                 # HuggingFace embeddings
+    python -m benchmarks.retrieval_bench --hashing       # no model download
+    python -m benchmarks.retrieval_bench --docs 5000 --k 4
+"""
+import argparse
+import hashlib
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.rag.hybrid import tokenize
+from app.rag.memory import KnowledgeMemory
+
+SUBJECTS = [
+    "solar panels", "battery storage", "vaccine trials", "coral reefs", "quantum computing",
+    "supply chains", "river erosion", "neural networks", "urban transit", "soil bacteria",
+    "jet engines", "crop rotation", "ocean currents", "password hashing", "glacier melt",
+    "volcanic ash", "wind turbines", "sleep cycles", "bridge design", "satellite orbits",
+]
+ASPECTS = [
+    ("efficiency", "how efficient are", "performance and output of"),
+    ("cost", "how expensive are", "the price and economics of"),
+    ("risks", "what are the dangers of", "safety problems caused by"),
+    ("history", "how did people first develop", "the origins and early history of"),
+    ("future", "what is next for", "upcoming research directions in"),
+]
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic bag-of-words embeddings so the benchmark runs without a model download."""
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list[float]:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for tok in tokenize(text):
+            h = int.from_bytes(hashlib.md5(tok.encode()).digest()[:4], "little")
+            vec[h % self.dim] += 1.0 if h & 1 else -1.0
+        norm = np.linalg.norm(vec)
+        return (vec / norm if norm else vec).tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+def build_corpus(n_docs: int, seed: int) -> tuple[list[str], list[dict], list[tuple[str, str, int]]]:
+    rng = random.Random(seed)
+    texts, metas, queries = [], [], []
+    for i in range(n_docs):
+        subject = SUBJECTS[i % len(SUBJECTS)]
+        aspect, question, phrase = ASPECTS[(i // len(SUBJECTS)) % len(ASPECTS)]
+        code = f"{rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}{rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}-{rng.randint(1000, 9999)}-{i}"
+        texts.append(
+            f"This note covers {phrase} {subject}. "
+            f"Reference record {code} documents field measurements and the {aspect} analysis. "
+            f"Engineers reviewing {subject} should consult record {code} before drawing conclusions."
+        )
+        metas.append({"source": f"synthetic://{i}", "doc_key": i})
+        if i < len(SUBJECTS) * len(ASPECTS):
+            queries.append(("semantic", f"{question} {subject}?", i))
+        queries.append(("keyword", f"what does record {code} say", i))
+    return texts, metas, queries
+
+
+def _rank_of(doc_keys: list[int], target: int) -> int | None:
+    try:
+        return doc_keys.index(target) + 1
+    except ValueError:
+        return None
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def run(args):
+    texts, metas, queries = build_corpus(args.docs, args.seed)
+    rng = random.Random(args.seed)
+    keyword_queries = [q for q in queries if q[0] == "keyword"]
+    sampled = [q for q in queries if q[0] == "semantic"] + rng.sample(
+        keyword_queries, min(args.queries, len(keyword_queries))
+    )
+
+    embeddings = HashingEmbeddings() if args.hashing else None
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = KnowledgeMemory(embeddings=embeddings, store_path=tmp)
+        start = time.perf_counter()
+        memory.add_documents(texts, metas)
+        print(f"Indexed {len(texts)} docs in {time.perf_counter() - start:.2f}s")
+
+        stats = {}
+        for mode in ("vector", "hybrid"):
+            for kind in ("semantic", "keyword"):
+                stats[(mode, kind)] = {"hits": 0, "rr": 0.0, "n": 0}
+        latency = {"vector": [], "hybrid_cold": [], "hybrid_warm": []}
+
+        for kind, query, target in sampled:
+            t0 = time.perf_counter()
+            vector = memory.similarity_search(query, k=args.k)
+            latency["vector"].append(time.perf_counter() - t0)
+
+            memory.result_cache.clear()
+            memory.embedding_cache.clear()
+            t0 = time.perf_counter()
+            hybrid = memory.hybrid_search(query, k=args.k)
+            latency["hybrid_cold"].append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            memory.hybrid_search(query, k=args.k)
+            latency["hybrid_warm"].append(time.perf_counter() - t0)
+
+            for mode, keys in (
+                ("vector", [doc.metadata["doc_key"] for doc, _ in vector]),
+                ("hybrid", [hit["document"].metadata["doc_key"] for hit in hybrid]),
+            ):
+                bucket = stats[(mode, kind)]
+                bucket["n"] += 1
+                rank = _rank_of(keys, target)
+                if rank:
+                    bucket["hits"] += 1
+                    bucket["rr"] += 1 / rank
+
+    print(f"\nQuality (k={args.k})")
+    print(f"{'mode':<8} {'queries':<9} {'n':>5} {'recall@k':>9} {'MRR':>7}")
+    for (mode, kind), bucket in stats.items():
+        n = bucket["n"] or 1
+        print(f"{mode:<8} {kind:<9} {bucket['n']:>5} {bucket['hits'] / n:>9.3f} {bucket['rr'] / n:>7.3f}")
+
+    print("\nLatency (ms)")
+    print(f"{'path':<12} {'p50':>8} {'p95':>8} {'mean':>8}")
+    for path, samples in latency.items():
+        ms = [s * 1000 for s in samples]
+        print(f"{path:<12} {_percentile(ms, 0.5):>8.2f} {_percentile(ms, 0.95):>8.2f} {statistics.mean(ms):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000, help="synthetic documents to index")
+    parser.add_argument("--queries", type=int, default=200, help="keyword queries to sample")
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--hashing", action="store_true", help="use hashing embeddings instead of HuggingFace")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 import { useState, useRef, useEffect } from 'react'
 import Message from './Message'
 import InputBox from './InputBox'
-import { sendQuery } from '../api'
+import { streamQuery } from '../api'
 
-function LoadingIndicator() {
+function LoadingIndicator({ stage }) {
   return (
     <div className="flex gap-3 justify-start message-enter">
       <div className="w-8 h-8 rounded-full bg-blue-600 flex items-center justify-center flex-shrink-0 text-sm font-bold">
@@ -11,7 +11,7 @@ function LoadingIndicator() {
       </div>
       <div className="bg-gray-800 border border-gray-700 rounded-2xl rounded-bl-sm px-4 py-3">
         <div className="flex items-center gap-1">
-          <span className="text-xs text-gray-400 mr-2">Researching</span>
+          <span className="text-xs text-gray-400 mr-2">{stage || 'Researching'}</span>
           <span className="w-1.5 h-1.5 bg-blue-400 rounded-full animate-bounce" style={{ animationDelay: '0ms' }} />
           <span className="w-1.5 h-1.5 bg-blue-400 rounded-full animate-bounce" style={{ animationDelay: '150ms' }} />
           <span className="w-1.5 h-1.5 bg-blue-400 rounded-full animate-bounce" style={{ animationDelay: '300ms' }} />
@@ -59,6 +59,7 @@ export default function Chat() {
   const [messages, setMessages] = useState([])
   const [input, setInput] = useState('')
   const [isLoading, setIsLoading] = useState(false)
+  const [stage, setStage] = useState(null)
   const [error, setError] = useState(null)
   const bottomRef = useRef(null)
 
@@ -83,25 +84,49 @@ export default function Chat() {
     setMessages((prev) => [...prev, { role: 'user', content: question }])
     setIsLoading(true)
 
+    // The assistant bubble is appended on the first answer token and then grown in place.
+    let answerStarted = false
+    function updateAnswer(patch) {
+      if (!answerStarted) {
+        answerStarted = true
+        setStage('Writing answer')
+        setMessages((prev) => [...prev, { role: 'assistant', content: '', sources: [], ...patch }])
+      } else {
+        setMessages((prev) => [...prev.slice(0, -1), { ...prev[prev.length - 1], ...patch }])
+      }
+    }
+
     try {
-      const data = await sendQuery(question)
-      setMessages((prev) => [
-        ...prev,
-        { role: 'assistant', content: data.answer, sources: data.sources },
-      ])
+      let answer = ''
+      await streamQuery(question, (event, data) => {
+        if (event === 'retrieval') {
+          setStage(data.has_relevant ? 'Found it in memory' : 'Searching the web')
+        } else if (event === 'sources') {
+          setStage(`Reading ${data.sources.length} sources`)
+        } else if (event === 'summary') {
+          setStage(`Summarized ${data.title || data.url}`)
+        } else if (event === 'token') {
+          answer += data.text
+          updateAnswer({ content: answer })
+        } else if (event === 'done') {
+          updateAnswer({ content: data.answer, sources: data.sources })
+        } else if (event === 'error') {
+          throw new Error(data.detail)
+        }
+      })
     } catch (err) {
       const msg = err.response?.data?.detail || err.message || 'Unknown error'
       setError(`Error: ${msg}`)
-      setMessages((prev) => [
-        ...prev,
-        {
-          role: 'assistant',
-          content: `Sorry, I encountered an error: ${msg}`,
-          sources: [],
-        },
-      ])
+      // A half-written answer bubble is replaced by the error, not left above it.
+      const errorMessage = {
+        role: 'assistant',
+        content: `Sorry, I encountered an error: ${msg}`,
+        sources: [],
+      }
+      setMessages((prev) => (answerStarted ? [...prev.slice(0, -1), errorMessage] : [...prev, errorMessage]))
     } finally {
       setIsLoading(false)
+      setStage(null)
     }
   }
 
@@ -115,7 +140,7 @@ export default function Chat() {
             {messages.map((msg, i) => (
               <Message key={i} message={msg} />
             ))}
-            {isLoading && <LoadingIndicator />}
+            {isLoading && <LoadingIndicator stage={stage} />}
           </div>
         )}
         <div ref={bottomRef} />
@@ -10,11 +10,18 @@ from __future__ import annotations
 
 import argparse
 import hashlib
+import json
 import logging
 import os
 import re
+import sqlite3
 import sys
+import threading
 import time
+import zlib
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
@@ -69,6 +76,25 @@ from yt_dlp import YoutubeDL
 
 LOG = logging.getLogger("channel_transcripts")
 
+# AIMD tuning for --workers > 1 (requests per second, shared by all workers)
+RATE_INCREASE = 0.05
+RATE_DECREASE = 0.5
+RATE_MIN = 0.05
+BLOCK_COOLDOWN = 30.0
+
+# --sync: per-video state kept in the output directory
+MANIFEST_NAME = "_manifest.jsonl"
+# Skip reasons that will not change on a later run; any other skip is retried.
+FINAL_SKIP_REASONS = frozenset({"transcripts disabled", "video unavailable"})
+
+# --format sqlite: one database under -o shared by every channel
+STORE_NAME = "transcripts.sqlite"
+# FTS rowid = (video row << SEGMENT_BITS) | segment index
+SEGMENT_BITS = 20
+
+# (start seconds, duration seconds, text)
+Segment = tuple[float, float, str]
+
 
 def build_transcript_client(proxy_url: str | None) -> YouTubeTranscriptApi:
     """youtube-transcript-api 1.x client; optional HTTP(S) proxy for transcript fetches."""
@@ -176,21 +202,447 @@ def list_channel_videos(
     return out
 
 
-def fetch_transcript_text(
+def list_new_channel_videos(
+    channel_url: str,
+    max_videos: int | None,
+    *,
+    insecure_ssl: bool,
+    is_known: Callable[[str], bool],
+    stop_after_known: int,
+) -> list[dict[str, str]]:
+    """
+    Like list_channel_videos, but reads the listing page by page (newest first on
+    a channel's Videos tab) and stops after `stop_after_known` consecutive videos
+    for which `is_known(id)` is true. Known videos are left out of the result.
+    stop_after_known=0 reads the whole listing.
+    """
+    opts: dict[str, Any] = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "ignoreerrors": True,
+        "skip_download": True,
+    }
+    if insecure_ssl:
+        opts["nocheckcertificate"] = True
+    out: list[dict[str, str]] = []
+    seen = 0
+    known_streak = 0
+    with YoutubeDL(opts) as ydl:
+        for e in _iter_flat_entries(ydl, channel_url):
+            vid = e.get("id")
+            if not vid:
+                continue
+            seen += 1
+            if is_known(vid):
+                known_streak += 1
+                if stop_after_known and known_streak >= stop_after_known:
+                    LOG.info("Reached %d already-synced videos in a row; stopping listing", known_streak)
+                    break
+            else:
+                known_streak = 0
+                out.append({"id": vid, "title": str(e.get("title") or vid)})
+            if max_videos and seen >= max_videos:
+                break
+    return out
+
+
+def _iter_flat_entries(ydl: YoutubeDL, url: str) -> Iterator[dict[str, Any]]:
+    """
+    Yield flat playlist entries without resolving the whole playlist first;
+    yt-dlp only requests the next listing page when the generator reaches it.
+    """
+    info = ydl.extract_info(url, download=False, process=False)
+    # Channel home / tab URLs may come back as a redirect to the uploads list.
+    for _ in range(3):
+        if not info or info.get("_type") not in ("url", "url_transparent"):
+            break
+        info = ydl.extract_info(info["url"], download=False, process=False)
+    if not info:
+        return
+    for e in info.get("entries") or []:
+        if e and isinstance(e, dict):
+            yield e
+
+
+class SyncManifest:
+    """
+    Per-video sync state for --sync, stored as JSON lines in the output directory.
+
+    Each line is one video's latest record (id, title, file, outputs, language,
+    fetched_at, status, reason, sha256); on load the last line per id wins.
+    `outputs` lists what was written ("txt", "sqlite"), so a later run with a
+    different --format fetches the videos it is missing. Lines are appended
+    as videos finish, so an interrupted run keeps its progress, and compact()
+    rewrites the file with one line per video at the end.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave a half-written last line
+                    continue
+                if isinstance(entry, dict) and entry.get("id"):
+                    self.entries[entry["id"]] = entry
+
+    def adopt_existing_files(self, output_dir: Path) -> int:
+        """Record transcripts written before the manifest existed (or by a non-sync run)."""
+        adopted = 0
+        for f in output_dir.glob("*__*.txt"):
+            vid = f.stem.rsplit("__", 1)[1]
+            entry = self.entries.get(vid)
+            if entry is not None and entry.get("status") == "ok":
+                if entry.get("file") == f.name:
+                    continue
+                # Saved to the store only so far: note the .txt as well
+                fields = {k: v for k, v in entry.items() if k != "id"}
+                self.record(
+                    vid, **{**fields, "file": f.name, "outputs": sorted(self.outputs_of(entry) | {"txt"})}
+                )
+                adopted += 1
+                continue
+            text = f.read_text(encoding="utf-8")
+            self.record(
+                vid,
+                title=f.stem.rsplit("__", 1)[0],
+                file=f.name,
+                outputs=["txt"],
+                language=None,
+                status="ok",
+                reason=None,
+                sha256=content_hash(text),
+                fetched_at=datetime.fromtimestamp(f.stat().st_mtime, timezone.utc).isoformat(
+                    timespec="seconds"
+                ),
+            )
+            adopted += 1
+        return adopted
+
+    @staticmethod
+    def outputs_of(entry: dict[str, Any]) -> set[str]:
+        # Lines written before `outputs` existed: a file means txt, no file means sqlite
+        if "outputs" in entry:
+            return set(entry["outputs"])
+        return {"txt"} if entry.get("file") else {"sqlite"}
+
+    def is_synced(self, vid: str, output_dir: Path, fmt: str, stored: set[str]) -> bool:
+        """
+        True when nothing is to be gained from fetching this video again.
+
+        Every output --format `fmt` asks for must exist: the .txt file on disk,
+        and for sqlite/both the video's row in the store (ids in `stored`).
+        """
+        entry = self.entries.get(vid)
+        if entry is None:
+            return False
+        if entry.get("status") == "ok":
+            if fmt in ("txt", "both"):
+                if not entry.get("file") or not (output_dir / entry["file"]).exists():
+                    return False
+            if fmt in ("sqlite", "both") and vid not in stored:
+                return False
+            return True
+        return entry.get("reason") in FINAL_SKIP_REASONS
+
+    def retryable(self, output_dir: Path, fmt: str, stored: set[str]) -> list[dict[str, str]]:
+        """Videos recorded earlier that should be fetched again (blocked, errors, missing outputs)."""
+        return [
+            {"id": vid, "title": str(entry.get("title") or vid)}
+            for vid, entry in self.entries.items()
+            if not self.is_synced(vid, output_dir, fmt, stored)
+        ]
+
+    def skipped(self) -> list[tuple[str, str, str]]:
+        return [
+            (vid, str(entry.get("title") or vid), str(entry.get("reason")))
+            for vid, entry in self.entries.items()
+            if entry.get("status") != "ok"
+        ]
+
+    def record(self, vid: str, **fields: Any) -> None:
+        with self._lock:
+            entry = {"id": vid, **fields}
+            self.entries[vid] = entry
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def compact(self) -> None:
+        with self._lock:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(
+                "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in self.entries.values()),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+
+
+class TranscriptStore:
+    """
+    Single-file SQLite store for --format sqlite / both.
+
+    `videos` keeps one row per video with its timed segments as zlib-compressed
+    JSON. `segments_fts` is a contentless FTS5 index over segment text: it holds
+    only the index, and search results are read back from the compressed rows.
+    `channel` labels the videos this run writes, so one store can hold many channels.
+    """
+
+    def __init__(self, path: Path, channel: str = "") -> None:
+        self.path = path
+        self.channel = channel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS videos ("
+                " pk INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, channel TEXT NOT NULL,"
+                " title TEXT NOT NULL, language TEXT, fetched_at TEXT NOT NULL,"
+                " sha256 TEXT NOT NULL, segments BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5("
+                " text, content='', tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def put(
+        self,
+        vid: str,
+        *,
+        title: str,
+        language: str | None,
+        segments: list[Segment],
+        sha256: str,
+    ) -> None:
+        blob = zlib.compress(json.dumps(segments, ensure_ascii=False).encode("utf-8"), 9)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT pk, sha256, segments FROM videos WHERE id = ?", (vid,)
+            ).fetchone()
+            if row is not None:
+                pk, old_hash, old_blob = row
+                if old_hash != sha256:
+                    # Contentless FTS5 rows are removed by passing back their old text
+                    self._conn.executemany(
+                        "INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', ?, ?)",
+                        (
+                            ((pk << SEGMENT_BITS) | n, text)
+                            for n, (_, _, text) in enumerate(_load_segments(old_blob))
+                        ),
+                    )
+                self._conn.execute(
+                    "UPDATE videos SET channel = ?, title = ?, language = ?, fetched_at = ?,"
+                    " sha256 = ?, segments = ? WHERE pk = ?",
+                    (self.channel, title, language, utc_now(), sha256, blob, pk),
+                )
+                if old_hash == sha256:
+                    return
+            else:
+                pk = self._conn.execute(
+                    "INSERT INTO videos (id, channel, title, language, fetched_at, sha256, segments)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (vid, self.channel, title, language, utc_now(), sha256, blob),
+                ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO segments_fts (rowid, text) VALUES (?, ?)",
+                (((pk << SEGMENT_BITS) | n, text) for n, (_, _, text) in enumerate(segments)),
+            )
+
+    def ids(self) -> set[str]:
+        with self._lock:
+            return {vid for (vid,) in self._conn.execute("SELECT id FROM videos")}
+
+    def search(self, query: str, limit: int = 20) -> list[dict[str, Any]]:
+        """Best-matching segments: video id, channel, title, start seconds and a snippet."""
+        with self._lock:
+            try:
+                hits = self._conn.execute(
+                    "SELECT rowid FROM segments_fts WHERE segments_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (query, limit),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax (stray quotes, colons, ...): search the words literally
+                quoted = " ".join('"' + w.replace('"', '""') + '"' for w in query.split())
+                hits = self._conn.execute(
+                    "SELECT rowid FROM segments_fts WHERE segments_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (quoted, limit),
+                ).fetchall()
+            videos: dict[int, tuple[str, str, str, list[Segment]]] = {}
+            out: list[dict[str, Any]] = []
+            for (rowid,) in hits:
+                pk, n = rowid >> SEGMENT_BITS, rowid & ((1 << SEGMENT_BITS) - 1)
+                if pk not in videos:
+                    vid, channel, title, blob = self._conn.execute(
+                        "SELECT id, channel, title, segments FROM videos WHERE pk = ?", (pk,)
+                    ).fetchone()
+                    videos[pk] = (vid, channel, title, _load_segments(blob))
+                vid, channel, title, segments = videos[pk]
+                start = segments[n][0]
+                # The hit plus one caption line either side reads as a sentence
+                snippet = " ".join(text for _, _, text in segments[max(0, n - 1) : n + 2])
+                out.append(
+                    {"id": vid, "channel": channel, "title": title, "start": start, "snippet": snippet}
+                )
+        return out
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _load_segments(blob: bytes) -> list[Segment]:
+    return [tuple(s) for s in json.loads(zlib.decompress(blob))]
+
+
+def format_timestamp(seconds: float) -> str:
+    s = int(seconds)
+    return f"{s // 3600:d}:{s % 3600 // 60:02d}:{s % 60:02d}"
+
+
+def run_search(store_path: Path, query: str, limit: int) -> int:
+    if not store_path.exists():
+        LOG.error("No transcript store at %s (export with --format sqlite first)", store_path)
+        return 1
+    store = TranscriptStore(store_path)
+    started = time.perf_counter()
+    try:
+        hits = store.search(query, limit)
+    except sqlite3.OperationalError as e:
+        LOG.error("Search failed for %r: %s", query, e)
+        return 1
+    finally:
+        store.close()
+    elapsed = time.perf_counter() - started
+    for h in hits:
+        print(
+            f"{h['id']}\t{format_timestamp(h['start'])}\t{h['channel']} / {h['title']}\n"
+            f"    https://youtu.be/{h['id']}?t={int(h['start'])}\n"
+            f"    {h['snippet']}"
+        )
+    LOG.info("%d hit(s) in %.1f ms", len(hits), elapsed * 1000)
+    return 0
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class AimdRateController:
+    """
+    Request rate shared by all workers (additive increase, multiplicative decrease).
+
+    acquire() spaces requests 1/rate seconds apart across threads. Each success
+    adds RATE_INCREASE req/s up to max_rate; a RequestBlocked multiplies the rate
+    by RATE_DECREASE and pauses everyone for BLOCK_COOLDOWN seconds. Blocks that
+    arrive during a cooldown were caused by the old rate and do not cut it again.
+    """
+
+    def __init__(self, initial_rate: float, max_rate: float) -> None:
+        self.max_rate = max(max_rate, RATE_MIN)
+        self.rate = min(max(initial_rate, RATE_MIN), self.max_rate)
+        self.blocks = 0
+        self._next_at = time.monotonic()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + 1.0 / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+    def on_blocked(self) -> None:
+        with self._lock:
+            self.blocks += 1
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                return
+            self.rate = max(RATE_MIN, self.rate * RATE_DECREASE)
+            self._cooldown_until = now + BLOCK_COOLDOWN
+            self._next_at = max(self._next_at, self._cooldown_until)
+            LOG.warning(
+                "Blocked by YouTube: pausing %.0fs, rate now %.2f req/s",
+                BLOCK_COOLDOWN,
+                self.rate,
+            )
+
+
+class WorkerClients:
+    """
+    One transcript client per worker thread. With a proxy pool, worker k starts on
+    proxy k (mod pool size) and moves to the next proxy after a blocked video.
+    """
+
+    def __init__(self, proxies: list[str | None], workers: int) -> None:
+        self.proxies = proxies or [None]
+        self.workers = workers
+        self._slots = iter(range(sys.maxsize))
+        self._slots_lock = threading.Lock()
+        self._local = threading.local()
+
+    def get(self) -> YouTubeTranscriptApi:
+        local = self._local
+        if not hasattr(local, "slot"):
+            with self._slots_lock:
+                local.slot = next(self._slots)
+            local.api = build_transcript_client(self.proxies[local.slot % len(self.proxies)])
+        return local.api
+
+    def rotate(self) -> None:
+        """Switch this worker to a proxy no other worker started on, when there is one."""
+        if len(self.proxies) < 2:
+            return
+        local = self._local
+        local.slot += max(1, self.workers) if len(self.proxies) > self.workers else 1
+        proxy = self.proxies[local.slot % len(self.proxies)]
+        local.api = build_transcript_client(proxy)
+        LOG.debug("Worker switched proxy: %s", proxy)
+
+
+def read_proxy_list(path: Path) -> list[str]:
+    """One proxy URL per line; blank lines and # comments are ignored."""
+    out: list[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            out.append(line)
+    return out
+
+
+def fetch_transcript(
     api: YouTubeTranscriptApi, video_id: str, languages: list[str] | None
-) -> str:
+) -> tuple[list[Segment], str]:
     """
-    Return plain transcript text using YouTube-hosted captions only.
+    Return (timed caption segments, language code) using YouTube-hosted captions only.
     Prefers manual captions, then auto-generated, in the given language order;
     if none match, uses any available track on the video.
     """
     langs = languages or ["en"]
     tlist = api.list(video_id)
 
-    def try_fetch(tr: Any) -> str:
+    def try_fetch(tr: Any) -> tuple[list[Segment], str]:
         fetched = tr.fetch()
-        lines = [s.text.strip() for s in fetched if getattr(s, "text", "").strip()]
-        return "\n".join(lines)
+        segments = [
+            (float(s.start), float(s.duration), s.text.strip())
+            for s in fetched
+            if getattr(s, "text", "").strip()
+        ]
+        return segments, tr.language_code
 
     try:
         return try_fetch(tlist.find_transcript(langs))
@@ -207,24 +659,43 @@ def fetch_transcript_text(
     raise NoTranscriptFound(video_id, langs, tlist)
 
 
+def segments_to_text(segments: list[Segment]) -> str:
+    """Plain transcript as written to .txt files: one caption line per row."""
+    return "\n".join(text for _, _, text in segments)
+
+
 def extract_with_retries(
     api: YouTubeTranscriptApi,
     video_id: str,
     languages: list[str] | None,
     retries: int,
     backoff: float,
-) -> str:
+    limiter: AimdRateController | None = None,
+) -> tuple[list[Segment], str]:
+    """
+    Returns (segments, language code). With a limiter, every attempt waits for a slot from it and a block slows down
+    all workers; without one, a block only lengthens this video's own backoff.
+    """
     last: Exception | None = None
     for attempt in range(retries + 1):
+        if limiter:
+            limiter.acquire()
         try:
-            return fetch_transcript_text(api, video_id, languages)
+            result = fetch_transcript(api, video_id, languages)
+            if limiter:
+                limiter.on_success()
+            return result
         except YouTubeRequestFailed as e:
             last = e
             if attempt < retries:
                 time.sleep(backoff * (2**attempt))
         except RequestBlocked as e:
             last = e
-            if attempt < retries:
+            if limiter:
+                limiter.on_blocked()
+                if attempt < retries:
+                    time.sleep(backoff * (2**attempt))
+            elif attempt < retries:
                 # YouTube often rate-limits or blocks datacenter IPs; wait longer before retry.
                 time.sleep(backoff * (2**attempt) + 8.0)
         except Exception as e:
@@ -241,13 +712,141 @@ def skip_reason_for_exception(e: BaseException) -> str:
     return type(e).__name__
 
 
+def process_video(
+    api: YouTubeTranscriptApi,
+    v: dict[str, str],
+    i: int,
+    total: int,
+    output_dir: Path,
+    languages: list[str],
+    args: argparse.Namespace,
+    limiter: AimdRateController | None = None,
+    manifest: SyncManifest | None = None,
+    store: TranscriptStore | None = None,
+) -> tuple[str, str, str] | None:
+    """Fetch and write one transcript. Returns None when saved, else (id, title, reason)."""
+    skip = _process_video(api, v, i, total, output_dir, languages, args, limiter, manifest, store)
+    if manifest is not None and skip is not None:
+        vid, title, reason = skip
+        manifest.record(
+            vid,
+            title=title,
+            file=None,
+            language=None,
+            status="blocked" if reason == "youtube_request_blocked" else "skipped",
+            reason=reason,
+            sha256=None,
+            fetched_at=utc_now(),
+        )
+    return skip
+
+
+def _process_video(
+    api: YouTubeTranscriptApi,
+    v: dict[str, str],
+    i: int,
+    total: int,
+    output_dir: Path,
+    languages: list[str],
+    args: argparse.Namespace,
+    limiter: AimdRateController | None,
+    manifest: SyncManifest | None,
+    store: TranscriptStore | None,
+) -> tuple[str, str, str] | None:
+    vid = v["id"]
+    title = v["title"]
+    stem = sanitize_filename(title)
+    path = output_dir / f"{stem}__{vid}.txt"
+
+    try:
+        segments, language = extract_with_retries(
+            api,
+            vid,
+            languages,
+            retries=args.retries,
+            backoff=args.retry_backoff,
+            limiter=limiter,
+        )
+        text = segments_to_text(segments)
+        if not text.strip():
+            LOG.warning("[%d/%d] SKIP empty: %s (%s)", i, total, title, vid)
+            return (vid, title, "empty transcript")
+        digest = content_hash(text)
+        if args.format in ("txt", "both"):
+            path.write_text(text, encoding="utf-8")
+        if store is not None:
+            store.put(vid, title=title, language=language, segments=segments, sha256=digest)
+        if manifest is not None:
+            # Outputs from earlier runs in another --format are kept in the record
+            previous = manifest.entries.get(vid, {})
+            written = {"txt", "sqlite"} if args.format == "both" else {args.format}
+            if previous.get("status") == "ok":
+                written |= SyncManifest.outputs_of(previous)
+            manifest.record(
+                vid,
+                title=title,
+                file=path.name if args.format in ("txt", "both") else previous.get("file"),
+                outputs=sorted(written),
+                language=language,
+                status="ok",
+                reason=None,
+                sha256=digest,
+                fetched_at=utc_now(),
+            )
+        LOG.info("[%d/%d] OK: %s", i, total, path.name if args.format != "sqlite" else vid)
+        return None
+    except TranscriptsDisabled:
+        LOG.warning("[%d/%d] SKIP (no captions): %s (%s)", i, total, title, vid)
+        return (vid, title, "transcripts disabled")
+    except VideoUnavailable:
+        LOG.warning("[%d/%d] SKIP (unavailable): %s (%s)", i, total, title, vid)
+        return (vid, title, "video unavailable")
+    except NoTranscriptFound:
+        LOG.warning("[%d/%d] SKIP (no transcript): %s (%s)", i, total, title, vid)
+        return (vid, title, "no transcript found")
+    except RequestBlocked as e:
+        if args.verbose:
+            LOG.warning(
+                "[%d/%d] SKIP (YouTube blocked / rate-limited): %s (%s)\n%s",
+                i,
+                total,
+                title,
+                vid,
+                e,
+            )
+        else:
+            LOG.warning(
+                "[%d/%d] SKIP (YouTube blocked or rate-limited this IP — "
+                "try --proxy, higher --delay, or retry later): %s (%s)",
+                i,
+                total,
+                title,
+                vid,
+            )
+        return (vid, title, skip_reason_for_exception(e))
+    except Exception as e:
+        if args.verbose:
+            LOG.warning("[%d/%d] SKIP: %s (%s)", i, total, title, vid, exc_info=True)
+        else:
+            LOG.warning(
+                "[%d/%d] SKIP (%s): %s (%s)",
+                i,
+                total,
+                type(e).__name__,
+                title,
+                vid,
+            )
+        return (vid, title, skip_reason_for_exception(e))
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Download YouTube captions for every public video on a channel."
     )
     parser.add_argument(
         "channel_url",
-        help="Channel URL (e.g. https://www.youtube.com/@Handle/videos)",
+        nargs="?",
+        help="Channel URL (e.g. https://www.youtube.com/@Handle/videos); not needed with --search",
     )
     parser.add_argument(
         "-o",
@@ -286,7 +885,31 @@ def main() -> int:
         "--delay",
         type=float,
         default=1.0,
-        help="Seconds to sleep between transcript requests (default: 1.0; increase if blocked)",
+        help="Seconds to sleep between transcript requests (default: 1.0; increase if blocked). "
+        "With --workers, sets the starting request rate instead.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Fetch transcripts with N threads sharing one adaptive request rate (default: 1)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=2.0,
+        metavar="RPS",
+        help="Upper bound for the shared request rate with --workers, in requests/second "
+        "(default: 2.0)",
+    )
+    parser.add_argument(
+        "--proxies",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="File with one proxy URL per line. Workers start on different proxies and "
+        "move to the next one after a blocked video. Overrides --proxy.",
     )
     parser.add_argument(
         "--retries",
@@ -313,6 +936,49 @@ def main() -> int:
         metavar="N",
         help="Only process the first N videos after listing (optional dry run / partial export)",
     )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help=f"Incremental mode: keep per-video state in {MANIFEST_NAME} in the output folder, "
+        "skip videos already fetched, retry blocked or failed ones, and stop listing once "
+        "already-synced videos are reached.",
+    )
+    parser.add_argument(
+        "--stop-after-known",
+        type=int,
+        default=10,
+        metavar="N",
+        help="With --sync, stop listing after N already-synced videos in a row "
+        "(default: 10; 0 lists the whole channel, e.g. for playlists not sorted newest first)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("txt", "sqlite", "both"),
+        default="txt",
+        help="txt: one .txt per video (default). sqlite: timed segments in one compressed, "
+        f"full-text indexed database ({STORE_NAME} under -o, shared by all channels). "
+        "both: write both.",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=f"SQLite store location for --format sqlite/both and --search (default: -o/{STORE_NAME})",
+    )
+    parser.add_argument(
+        "--search",
+        default=None,
+        metavar="QUERY",
+        help="Search the SQLite store instead of downloading; prints video id, timestamp and "
+        "snippet per hit. Accepts SQLite FTS5 syntax (\"exact phrase\", OR, prefix*).",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Maximum --search hits (default: 20)",
+    )
     parser.add_argument(
         "--insecure",
         action="store_true",
@@ -327,6 +993,14 @@ def main() -> int:
         format="%(levelname)s: %(message)s",
     )
 
+    store_path = args.db or args.output_dir / STORE_NAME
+    if args.search is not None:
+        if not args.search.strip():
+            parser.error("--search needs a non-empty query")
+        return run_search(store_path, args.search, args.limit)
+    if not args.channel_url:
+        parser.error("channel_url is required unless --search is given")
+
     channel_url = normalize_channel_url(args.channel_url)
     languages = [x.strip() for x in args.languages.split(",") if x.strip()]
 
@@ -339,9 +1013,16 @@ def main() -> int:
     output_dir.mkdir(parents=True, exist_ok=True)
     LOG.info("Output directory: %s", output_dir.resolve())
 
-    ytt = build_transcript_client(args.proxy)
-    if args.proxy:
+    proxies: list[str | None] = [args.proxy]
+    if args.proxies:
+        proxies = list(read_proxy_list(args.proxies))
+        if not proxies:
+            LOG.error("No proxy URLs in %s", args.proxies)
+            return 1
+        LOG.info("Transcript requests use %d proxies from --proxies", len(proxies))
+    elif args.proxy:
         LOG.info("Transcript requests use --proxy")
+    ytt = build_transcript_client(proxies[0])
 
     if args.insecure:
         LOG.warning(
@@ -349,94 +1030,124 @@ def main() -> int:
             "Not recommended on untrusted networks."
         )
 
+    manifest: SyncManifest | None = None
+    already_synced = 0
     LOG.info("Listing videos (yt-dlp): %s", channel_url)
-    videos = list_channel_videos(
-        channel_url, args.max_videos, insecure_ssl=args.insecure
-    )
-    if not videos:
-        LOG.error("No videos found. Try adding /videos to the channel URL.")
-        return 1
+    if args.sync:
+        manifest = SyncManifest(output_dir / MANIFEST_NAME)
+        adopted = manifest.adopt_existing_files(output_dir)
+        if adopted:
+            LOG.info("Recorded %d existing transcript file(s) in %s", adopted, MANIFEST_NAME)
+        known_before = len(manifest.entries)
+        new_videos = list_new_channel_videos(
+            channel_url,
+            args.max_videos,
+            insecure_ssl=args.insecure,
+            is_known=lambda vid: vid in manifest.entries,
+            stop_after_known=args.stop_after_known,
+        )
+        new_ids = {v["id"] for v in new_videos}
+        stored: set[str] = set()
+        if args.format in ("sqlite", "both") and store_path.exists():
+            existing = TranscriptStore(store_path)
+            stored = existing.ids()
+            existing.close()
+        retry = [v for v in manifest.retryable(output_dir, args.format, stored) if v["id"] not in new_ids]
+        videos = new_videos + retry
+        already_synced = known_before - len(retry)
+        LOG.info(
+            "Sync: %d new video(s), %d to retry, %d already synced",
+            len(new_videos),
+            len(retry),
+            already_synced,
+        )
+        if not videos and not manifest.entries:
+            LOG.error("No videos found. Try adding /videos to the channel URL.")
+            return 1
+        if not videos:
+            manifest.compact()
+            LOG.info("Nothing to fetch; %s is up to date", output_dir)
+            return 0
+    else:
+        videos = list_channel_videos(
+            channel_url, args.max_videos, insecure_ssl=args.insecure
+        )
+        if not videos:
+            LOG.error("No videos found. Try adding /videos to the channel URL.")
+            return 1
 
     LOG.info("Found %d video(s). Saving transcripts to %s", len(videos), output_dir.resolve())
 
-    ok = 0
-    skipped: list[tuple[str, str, str]] = []
+    store: TranscriptStore | None = None
+    if args.format in ("sqlite", "both"):
+        store = TranscriptStore(
+            store_path,
+            channel=output_dir.name if args.channel_subdir else output_subdir_for_channel_url(channel_url),
+        )
+        LOG.info("Writing segments to %s", store_path.resolve())
 
-    for i, v in enumerate(videos, start=1):
-        vid = v["id"]
-        title = v["title"]
-        stem = sanitize_filename(title)
-        path = output_dir / f"{stem}__{vid}.txt"
+    if args.workers > 1:
+        initial_rate = 1.0 / args.delay if args.delay > 0 else args.max_rate
+        limiter = AimdRateController(initial_rate, args.max_rate)
+        clients = WorkerClients(proxies, args.workers)
+        LOG.info(
+            "Fetching with %d workers, starting at %.2f req/s (max %.2f)",
+            args.workers,
+            limiter.rate,
+            limiter.max_rate,
+        )
 
-        try:
-            text = extract_with_retries(
-                ytt,
-                vid,
-                languages,
-                retries=args.retries,
-                backoff=args.retry_backoff,
+        def work(item: tuple[int, dict[str, str]]) -> tuple[str, str, str] | None:
+            i, v = item
+            result = process_video(
+                clients.get(), v, i, len(videos), output_dir, languages, args, limiter, manifest, store
             )
-            if not text.strip():
-                skipped.append((vid, title, "empty transcript"))
-                LOG.warning("[%d/%d] SKIP empty: %s (%s)", i, len(videos), title, vid)
-            else:
-                path.write_text(text, encoding="utf-8")
-                ok += 1
-                LOG.info("[%d/%d] OK: %s", i, len(videos), path.name)
-        except TranscriptsDisabled:
-            skipped.append((vid, title, "transcripts disabled"))
-            LOG.warning("[%d/%d] SKIP (no captions): %s (%s)", i, len(videos), title, vid)
-        except VideoUnavailable:
-            skipped.append((vid, title, "video unavailable"))
-            LOG.warning("[%d/%d] SKIP (unavailable): %s (%s)", i, len(videos), title, vid)
-        except NoTranscriptFound:
-            skipped.append((vid, title, "no transcript found"))
-            LOG.warning("[%d/%d] SKIP (no transcript): %s (%s)", i, len(videos), title, vid)
-        except RequestBlocked as e:
-            skipped.append((vid, title, skip_reason_for_exception(e)))
-            if args.verbose:
-                LOG.warning(
-                    "[%d/%d] SKIP (YouTube blocked / rate-limited): %s (%s)\n%s",
-                    i,
-                    len(videos),
-                    title,
-                    vid,
-                    e,
-                )
-            else:
-                LOG.warning(
-                    "[%d/%d] SKIP (YouTube blocked or rate-limited this IP — "
-                    "try --proxy, higher --delay, or retry later): %s (%s)",
-                    i,
-                    len(videos),
-                    title,
-                    vid,
-                )
-        except Exception as e:
-            skipped.append((vid, title, skip_reason_for_exception(e)))
-            if args.verbose:
-                LOG.warning("[%d/%d] SKIP: %s (%s)", i, len(videos), title, vid, exc_info=True)
-            else:
-                LOG.warning(
-                    "[%d/%d] SKIP (%s): %s (%s)",
-                    i,
-                    len(videos),
-                    type(e).__name__,
-                    title,
-                    vid,
+            if result and result[2] == "youtube_request_blocked":
+                clients.rotate()
+            return result
+
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="transcript") as pool:
+            # map() yields in listing order, so _skipped.txt keeps the sequential layout.
+            results = list(pool.map(work, enumerate(videos, start=1)))
+    else:
+        results = []
+        for i, v in enumerate(videos, start=1):
+            results.append(
+                process_video(
+                    ytt, v, i, len(videos), output_dir, languages, args, manifest=manifest, store=store
                 )
+            )
+            if args.delay > 0 and i < len(videos):
+                time.sleep(args.delay)
+
+    skipped = [r for r in results if r is not None]
+    ok = len(results) - len(skipped)
+    if args.workers > 1:
+        LOG.info(
+            "Final request rate: %.2f req/s (%d blocked request(s))",
+            limiter.rate,
+            limiter.blocks,
+        )
 
-        if args.delay > 0 and i < len(videos):
-            time.sleep(args.delay)
+    if manifest is not None:
+        manifest.compact()
+    if store is not None:
+        store.close()
 
     skip_log = output_dir / "_skipped.txt"
-    if skipped:
-        lines = [f"{vid}\t{reason}\t{title}" for vid, title, reason in skipped]
+    # In sync mode the report covers the whole channel, not just this run's videos.
+    report = manifest.skipped() if manifest is not None else skipped
+    if report:
+        lines = [f"{vid}\t{reason}\t{title}" for vid, title, reason in report]
         skip_log.write_text("\n".join(lines) + "\n", encoding="utf-8")
         LOG.info("Wrote skip list: %s", skip_log)
+    elif manifest is not None and skip_log.exists():
+        skip_log.unlink()
 
     LOG.info("--- summary ---")
     LOG.info("Videos listed: %d", len(videos))
+    if manifest is not None:
+        LOG.info("Already synced (not fetched): %d", already_synced)
     LOG.info("Transcripts saved: %d", ok)
     LOG.info("Skipped: %d", len(skipped))
     return 0